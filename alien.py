@@ -1,10 +1,11 @@
-import pygame
 from pygame.sprite import Sprite
 
-from paths import resource_path
-
 class Alien(Sprite):
-    """class to represent a single alien in the fleet."""
+    """class to represent a single alien in the fleet.
+
+    While an alien belongs to a Fleet, its exact position lives in the
+    fleet's arrays and the fleet moves it; x and y read and write there.
+    """
 
     def __init__(self, ai_game):
         """initialize alien and set its starting position."""
@@ -12,26 +13,50 @@ class Alien(Sprite):
         self.screen = ai_game.screen
         self.settings = ai_game.settings
 
-        # load the alien image and set its rect attribute
-        self.image = pygame.image.load(
-            resource_path('images', 'spaceship_alien.png')).convert_alpha()
+        # share the game's single copy of the alien image.
+        self.image = ai_game.assets.image('spaceship_alien.png')
         self.rect = self.image.get_rect()
 
         # start each new alien near the top left of the screen
         self.rect.x = self.rect.width
         self.rect.y = self.rect.height
 
-        # store the alien's exact horizontal position.
-        self.x = float(self.rect.x)
-
-    def update(self):
-        """move alien right or left"""
-        self.x += self.settings.alien_speed * self.settings.fleet_direction
-        self.rect.x = self.x
-
-    def check_edges(self):
-        """return True if the alien is at an edge of the screen."""
-        screen_rect = self.screen.get_rect()
-        if self.rect.right >= screen_rect.right or self.rect.left <= 0:
-            return True
-        return False
+        # the fleet this alien belongs to, and its slot in the fleet.
+        self.fleet = None
+        self.index = None
+
+    @property
+    def x(self):
+        """the alien's exact horizontal position."""
+        if self.fleet is None:
+            return float(self.rect.x)
+        return float(self.fleet.x[self.index])
+
+    @x.setter
+    def x(self, value):
+        if self.fleet is None:
+            self.rect.x = value
+        else:
+            self.fleet.move_alien(self.index, x=value)
+
+    @property
+    def y(self):
+        """the alien's exact vertical position."""
+        if self.fleet is None:
+            return float(self.rect.y)
+        return float(self.fleet.y[self.index])
+
+    @y.setter
+    def y(self, value):
+        if self.fleet is None:
+            self.rect.y = value
+        else:
+            self.fleet.move_alien(self.index, y=value)
+
+    def detach(self):
+        """forget the fleet, keeping the last known position in the rect."""
+        if self.fleet is not None:
+            self.rect.topleft = (float(self.fleet.x[self.index]),
+                                 float(self.fleet.y[self.index]))
+        self.fleet = None
+        self.index = None
@@ -0,0 +1,113 @@
+"""Load each image and sound once and share it between sprites.
+
+Every alien, ship icon and bullet used to decode or build its own surface,
+so spawning a fleet meant dozens of identical PNG loads. The AssetManager
+keeps one display-converted copy of each asset and hands the same object
+to every sprite that asks for it.
+
+Converted surfaces belong to the display mode they were converted for, so
+the cache is dropped when the mode changes (see set_display) and when
+pygame shuts down (the display and mixer they depend on are gone).
+"""
+
+import time
+
+import pygame
+
+from paths import resource_path
+
+
+class AssetManager:
+    """Cache of display-converted images, generated surfaces and sounds."""
+
+    def __init__(self):
+        self._images = {}
+        self._sounds = {}
+        self._display_key = None
+        self._quit_hook_registered = False
+        self.reset_counters()
+
+    # --- cache lifetime --------------------------------------------------
+
+    def set_display(self, screen):
+        """Bind the cache to a display mode, dropping stale conversions."""
+        key = (screen.get_size(), screen.get_bitsize(), screen.get_masks(),
+               screen.get_flags())
+        if key != self._display_key:
+            self._images.clear()
+            self._display_key = key
+
+    def clear(self):
+        """Forget every cached asset (counters are kept)."""
+        self._images.clear()
+        self._sounds.clear()
+        self._display_key = None
+
+    def reset_counters(self):
+        """Zero the load/hit/miss counters."""
+        self.loads = 0
+        self.hits = 0
+        self.misses = 0
+        self.load_time = 0.0
+
+    def stats(self):
+        """Return the cache counters as a dict (load_time is in seconds)."""
+        return {
+            'loads': self.loads,
+            'hits': self.hits,
+            'misses': self.misses,
+            'load_time': self.load_time,
+            'images': len(self._images),
+            'sounds': len(self._sounds),
+        }
+
+    # --- lookups ---------------------------------------------------------
+
+    def image(self, name):
+        """Return the shared, alpha-converted surface for images/<name>."""
+        return self._get(self._images, ('image', name), lambda: pygame.image.load(
+            resource_path('images', name)).convert_alpha())
+
+    def surface(self, key, factory):
+        """Return a shared generated surface, building it with factory once.
+
+        Use this for surfaces drawn in code (glows, dots) rather than
+        loaded from disk; key must capture everything the drawing depends on.
+        """
+        return self._get(self._images, ('surface', key), factory)
+
+    def sound(self, name):
+        """Return the shared Sound for sounds/<name>.
+
+        Raises pygame.error or FileNotFoundError if it cannot be loaded;
+        failures are not cached, so a later call retries.
+        """
+        return self._get(self._sounds, name, lambda: pygame.mixer.Sound(
+            resource_path('sounds', name)))
+
+    def _get(self, cache, key, loader):
+        asset = cache.get(key)
+        if asset is not None:
+            self.hits += 1
+            return asset
+
+        self.misses += 1
+        start = time.perf_counter()
+        asset = loader()
+        self.load_time += time.perf_counter() - start
+        self.loads += 1
+        cache[key] = asset
+
+        # pygame forgets its quit hooks after each quit, so re-arm it.
+        if not self._quit_hook_registered:
+            pygame.register_quit(self._on_pygame_quit)
+            self._quit_hook_registered = True
+        return asset
+
+    def _on_pygame_quit(self):
+        self._quit_hook_registered = False
+        self.clear()
+
+
+# One manager per process, so every game instance shares loaded assets.
+shared_assets = AssetManager()
@@ -0,0 +1,296 @@
+"""Frame-time benchmark: run scripted game scenarios headlessly, report JSON.
+
+Usage:
+    python -m bench                          # every scenario at every size
+    python -m bench --scenarios idle full_fleet --sizes 1200x800
+    python -m bench --render dirty --output bench.json
+
+Each run builds a fresh game at one window size on the dummy SDL drivers,
+driven by a SteppedClock so frames never sleep and timers behave exactly
+as at 60 fps. A scenario sets the game up (and may script every frame);
+after a few warm-up frames, each call to AlienInvasion._run_one_frame is
+timed, along with the game's update and draw phases. The report holds
+mean/p50/p95/p99/max frame times in milliseconds per scenario and size,
+so runs from different releases can be compared.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+# Headless SDL must be configured before pygame initializes.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+import pygame
+
+from game import AlienInvasion
+from bullet_pool import BulletPool
+from cli import RENDER_MODES, window_size
+from explosion import Explosion
+from game_clock import SteppedClock
+from profiles import ProfileStore
+
+DEFAULT_SIZES = ("1200x800", "1920x1080", "3840x2160")
+DEFAULT_FRAMES = 300
+WARMUP_FRAMES = 30
+
+# Game methods timed on their own, by report name. "bullets" includes
+# "collisions", which it calls; everything else is disjoint.
+PHASES = {
+    'events': '_check_events',
+    'stars': '_update_stars',
+    'bullets': '_update_bullets',
+    'collisions': '_check_bullet_alien_collisions',
+    'aliens': '_update_aliens',
+    'autofire': '_auto_fire_bullets',
+    'respawn': '_check_ship_respawn',
+    'explosions': '_update_explosions',
+    'screen': '_update_screen',
+}
+
+
+# --- scenarios -----------------------------------------------------------
+#
+# A scenario prepares a game and returns a per-frame hook (or None) that is
+# called before every frame, warm-up included.
+
+def _start(ai):
+    """Start a game as the Play button does, with lives to spare."""
+    ai._check_play_button(ai.play_button.rect.center)
+    ai.stats.ships_left = 1000
+
+
+def idle(ai, rng):
+    """The start screen: starfield, HUD, Play button and player panel."""
+    return None
+
+
+def full_fleet(ai, rng):
+    """A fresh game: the whole fleet marching, no shooting."""
+    _start(ai)
+    return None
+
+
+def max_bullets(ai, rng):
+    """Autofire every frame with a bullet limit far above the default."""
+    _start(ai)
+    # the pool is sized from bullets_allowed, so build a bigger one.
+    ai.settings.bullets_allowed = 500
+    ai.bullets = BulletPool(ai)
+    ai.settings.autofire_cooldown = 0
+    ai.autofire_active = True
+
+    def sweep(frame):
+        # sweep the ship across the screen so bullets hit the whole fleet.
+        ai.ship.moving_right = (frame // 120) % 2 == 0
+        ai.ship.moving_left = not ai.ship.moving_right
+    return sweep
+
+
+def mass_explosions(ai, rng):
+    """Alien explosions every frame and a ship explosion every second."""
+    _start(ai)
+    width, height = ai.settings.screen_width, ai.settings.screen_height
+
+    def explode(frame):
+        for x, y in rng.integers(0, (width, height), (5, 2)).tolist():
+            ai.explosions.add(Explosion(ai, (x, y)))
+        if frame % 60 == 0:
+            ai.explosions.add(Explosion(ai, ai.ship.rect.center, 'ship'))
+    return explode
+
+
+def level_20(ai, rng):
+    """A game at level 20, with everything sped up as the game would."""
+    _start(ai)
+    for _ in range(19):
+        ai.settings.increase_speed()
+    ai.stats.level = 20
+    ai.sb.prep_level()
+    ai.autofire_active = True
+    return None
+
+
+SCENARIOS = {
+    'idle': idle,
+    'full_fleet': full_fleet,
+    'max_bullets': max_bullets,
+    'mass_explosions': mass_explosions,
+    'level_20': level_20,
+}
+
+
+# --- measuring -----------------------------------------------------------
+
+def _timed(samples, method):
+    """Wrap method so each call appends its duration (ns) to samples."""
+    perf_counter_ns = time.perf_counter_ns
+
+    def wrapper(*args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            samples.append(perf_counter_ns() - start)
+    return wrapper
+
+
+def summarize(samples_ns, frames):
+    """Frame-time statistics in milliseconds for a list of ns samples.
+
+    Phases that run more or less than once per frame also get their total
+    time per frame, so they add up against the frame time.
+    """
+    if not samples_ns:
+        return {'calls': 0, 'mean_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0,
+                'p99_ms': 0.0, 'max_ms': 0.0, 'per_frame_ms': 0.0}
+    ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    p50, p95, p99 = np.percentile(ms, (50, 95, 99)).tolist()
+    return {
+        'calls': len(ms),
+        'mean_ms': round(float(ms.mean()), 4),
+        'p50_ms': round(p50, 4),
+        'p95_ms': round(p95, 4),
+        'p99_ms': round(p99, 4),
+        'max_ms': round(float(ms.max()), 4),
+        'per_frame_ms': round(float(ms.sum()) / frames, 4),
+    }
+
+
+def run_scenario(name, size, frames=DEFAULT_FRAMES, render='full', seed=0,
+                 warmup=WARMUP_FRAMES):
+    """Run one scenario at one window size and return its report."""
+    options = argparse.Namespace(windowed=size, render=render)
+    with tempfile.TemporaryDirectory() as tmp:
+        # a throwaway player, so benchmarks never touch real profiles.
+        profiles = ProfileStore(os.path.join(tmp, "profiles.json"))
+        profiles.create("Bench")
+        ai = AlienInvasion(options, clock=SteppedClock(fps=60),
+                           profiles=profiles)
+        try:
+            return _measure(ai, name, size, frames, render, seed, warmup)
+        finally:
+            pygame.quit()
+
+
+def _measure(ai, name, size, frames, render, seed, warmup):
+    rng = np.random.default_rng(seed)
+    hook = SCENARIOS[name](ai, rng)
+
+    for frame in range(warmup):
+        if hook:
+            hook(frame)
+        ai._run_one_frame()
+
+    phases = {phase: [] for phase in PHASES}
+    for phase, method in PHASES.items():
+        setattr(ai, method, _timed(phases[phase], getattr(ai, method)))
+
+    frame_ns = []
+    bullets = aliens = particles = candidates = dirty = 0
+    perf_counter_ns = time.perf_counter_ns
+    for frame in range(warmup, warmup + frames):
+        if hook:
+            hook(frame)
+        start = perf_counter_ns()
+        ai._run_one_frame()
+        frame_ns.append(perf_counter_ns() - start)
+
+        bullets += len(ai.bullets)
+        aliens += len(ai.aliens)
+        particles += ai.particles.count
+        candidates += ai.collisions.candidate_pairs
+        dirty += ai.dirty_area
+
+    return {
+        'scenario': name,
+        'size': f"{size[0]}x{size[1]}",
+        'render': render,
+        'frames': frames,
+        'frame': summarize(frame_ns, frames),
+        'phases': {phase: summarize(samples, frames)
+                   for phase, samples in phases.items()},
+        # average per frame: what the frame was working on.
+        'load': {
+            'bullets': round(bullets / frames, 1),
+            'aliens': round(aliens / frames, 1),
+            'particles': round(particles / frames, 1),
+            'collision_candidates': round(candidates / frames, 1),
+            'dirty_pixels': round(dirty / frames),
+        },
+    }
+
+
+def run(scenarios=None, sizes=None, frames=DEFAULT_FRAMES, render='full',
+        seed=0, warmup=WARMUP_FRAMES):
+    """Run every scenario at every size; return the full JSON report."""
+    scenarios = list(scenarios or SCENARIOS)
+    sizes = [window_size(size) if isinstance(size, str) else size
+             for size in (sizes or DEFAULT_SIZES)]
+    results = [run_scenario(name, size, frames, render, seed, warmup)
+               for name in scenarios for size in sizes]
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': '.'.join(map(str, pygame.get_sdl_version())),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'video_driver': os.environ.get("SDL_VIDEODRIVER"),
+            'seed': seed,
+            'warmup_frames': warmup,
+        },
+        'results': results,
+    }
+
+
+def build_parser():
+    """Build the argument parser for the benchmark."""
+    parser = argparse.ArgumentParser(
+        prog="bench.py", description="Alien Invasion frame-time benchmark")
+    parser.add_argument(
+        '--scenarios', nargs='+', choices=list(SCENARIOS),
+        metavar='NAME', help=f"scenarios to run (default: all of "
+                             f"{', '.join(SCENARIOS)})")
+    parser.add_argument(
+        '--sizes', nargs='+', type=window_size, metavar='WxH',
+        help=f"window sizes (default: {' '.join(DEFAULT_SIZES)})")
+    parser.add_argument(
+        '--frames', type=int, default=DEFAULT_FRAMES,
+        help=f"timed frames per run (default {DEFAULT_FRAMES})")
+    parser.add_argument(
+        '--render', choices=RENDER_MODES, default='full',
+        help="renderer to measure (default: full)")
+    parser.add_argument(
+        '--seed', type=int, default=0, help="seed for scripted randomness")
+    parser.add_argument(
+        '--output', metavar='FILE', help="write the report to FILE")
+    return parser
+
+
+def main(argv=None):
+    """Run the benchmark and print (or save) the JSON report."""
+    options = build_parser().parse_args(argv)
+    # keep stdout for the report; the game's own messages go to stderr.
+    with contextlib.redirect_stdout(sys.stderr):
+        report = run(options.scenarios, options.sizes, options.frames,
+                     options.render, options.seed)
+    text = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
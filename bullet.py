@@ -1,53 +1,110 @@
 import pygame
 from pygame.sprite import Sprite
 
+
+def bullet_image(ai_game):
+    """Return (image, offset) for the laser's full look, built once.
+
+    The glow, core and trail are pre-rendered into one surface, so a
+    bullet is a single blit at its rect's top-left plus offset. The cache
+    key holds every setting the drawing depends on, so changing any of
+    them builds a fresh image.
+    """
+    settings = ai_game.settings
+    key = ('bullet', settings.bullet_width, settings.bullet_height,
+           settings.bullet_glow_width, settings.bullet_core_color,
+           settings.bullet_glow_color, settings.bullet_trail_color)
+    return ai_game.assets.surface(key, lambda: _render_bullet(settings))
+
+
+def _render_bullet(settings):
+    """Draw glow, core and trail the way a lone laser used to be drawn."""
+    width, height = settings.bullet_width, settings.bullet_height
+    glow_width = settings.bullet_glow_width
+    centerx = width // 2
+
+    # Everything is laid out relative to the core rect's top-left corner;
+    # the trail dots hang up to 12 pixels below the core.
+    glow_left = centerx - glow_width // 2
+    left = min(0, glow_left, centerx - 2)
+    right = max(width, glow_left + glow_width, centerx + 3)
+    image = pygame.Surface((right - left, height + 12), pygame.SRCALPHA)
+
+    # Draw glow first
+    pygame.draw.rect(image, settings.bullet_glow_color,
+                     (glow_left - left, 0, glow_width, height),
+                     border_radius=2)
+
+    # Draw core laser
+    pygame.draw.rect(image, settings.bullet_core_color,
+                     (-left, 0, width, height), border_radius=1)
+
+    # Draw trailing particles
+    for i in range(3):
+        pygame.draw.circle(image, settings.bullet_trail_color,
+                           (centerx - left, height + i * 5), radius=2 - i)
+    return image, (left, 0)
+
+
 class Bullet(Sprite):
     """A class to manage laser beams fired from the ship."""
 
     def __init__(self, ai_game):
         super().__init__()
+        self.ai_game = ai_game
         self.screen = ai_game.screen
         self.settings = ai_game.settings
 
-        # Laser colors and dimensions come from the game settings.
-        self.core_color = self.settings.bullet_core_color
-        self.trail_color = self.settings.bullet_trail_color
-
+        # the size comes from the settings; so does the look, which
+        # bullet_image renders.
         self.width = self.settings.bullet_width
         self.height = self.settings.bullet_height
-        self.glow_width = self.settings.bullet_glow_width
 
         # Create main rect
         self.rect = pygame.Rect(0, 0, self.width, self.height)
         self.rect.midtop = ai_game.ship.rect.midtop
 
-        # Create glow surface
-        self.glow_surface = pygame.Surface((self.glow_width, self.height), pygame.SRCALPHA)
-        pygame.draw.rect(self.glow_surface, self.settings.bullet_glow_color,
-                        self.glow_surface.get_rect(),
-                        border_radius=2)
+        # the pool this bullet is flying in, and its slot in the pool.
+        self.pool = None
+        self.index = None
+
+    @property
+    def x(self):
+        """The laser's exact horizontal position."""
+        if self.pool is None:
+            return float(self.rect.x)
+        return float(self.pool.x[self.index])
+
+    @x.setter
+    def x(self, value):
+        if self.pool is None:
+            self.rect.x = value
+        else:
+            self.pool.move_bullet(self.index, x=value)
+
+    @property
+    def y(self):
+        """The laser's exact vertical position."""
+        if self.pool is None:
+            return float(self.rect.y)
+        return float(self.pool.y[self.index])
 
-        # Position tracking
-        self.y = float(self.rect.y)
+    @y.setter
+    def y(self, value):
+        if self.pool is None:
+            self.rect.y = value
+        else:
+            self.pool.move_bullet(self.index, y=value)
 
-    def update(self):
-        """Move the laser up the screen."""
-        self.y -= self.settings.bullet_speed
-        self.rect.y = self.y
+    def detach(self):
+        """Leave the pool, keeping the last known position in the rect."""
+        if self.pool is not None:
+            self.rect.topleft = (float(self.pool.x[self.index]),
+                                 float(self.pool.y[self.index]))
+        self.pool = None
+        self.index = None
 
     def draw_bullet(self):
-        """Draw the laser with glow effect."""
-        # Draw glow first
-        glow_rect = self.glow_surface.get_rect(center=self.rect.center)
-        self.screen.blit(self.glow_surface, glow_rect)
-
-        # Draw core laser
-        pygame.draw.rect(self.screen, self.core_color, self.rect,
-                        border_radius=1)
-
-        # Draw trailing particles
-        for i in range(3):
-            trail_y = self.rect.bottom + i * 5
-            pygame.draw.circle(self.screen, self.trail_color,
-                              (self.rect.centerx, trail_y),
-                              radius=2 - i)
+        """Draw the laser with glow effect; return the area it covers."""
+        image, (dx, dy) = bullet_image(self.ai_game)
+        return self.screen.blit(image, self.rect.move(dx, dy))
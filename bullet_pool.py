@@ -0,0 +1,143 @@
+"""A fixed set of reusable bullets with their positions kept in arrays.
+
+Firing used to build a brand-new Bullet every shot and every frame copied
+the bullets group just to find the ones past the top of the screen. The
+BulletPool builds its bullets once, hands out a free slot when the ship
+fires and takes the slot back when the bullet leaves the screen or hits
+an alien. Bullet positions live in NumPy arrays, so moving every bullet
+is one vectorized subtraction.
+"""
+
+import numpy as np
+from pygame.sprite import Group
+
+from bullet import Bullet, bullet_image
+
+
+class BulletPool(Group):
+    """A sprite group of live bullets drawn from preallocated slots."""
+
+    def __init__(self, ai_game):
+        super().__init__()
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+
+        capacity = self.settings.bullets_allowed
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+        self._bullets = [Bullet(ai_game) for _ in range(capacity)]
+        self._free = list(range(capacity - 1, -1, -1))
+        self._rects_stale = False
+
+    @property
+    def capacity(self):
+        """How many bullets the pool holds."""
+        return len(self._bullets)
+
+    # --- firing and retiring ---------------------------------------------
+
+    def fire(self, midtop):
+        """Launch a pooled bullet from midtop; return it, or None if full."""
+        if not self._free:
+            return None
+        bullet = self._bullets[self._free[-1]]
+        bullet.rect.midtop = midtop
+        self.add(bullet)
+        return bullet
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+
+        # Bullets built outside the pool take over a slot's place.
+        self._bullets[slot] = sprite
+        self.x[slot] = sprite.rect.x
+        self.y[slot] = sprite.rect.y
+        self.active[slot] = True
+        sprite.pool = self
+        sprite.index = slot
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if getattr(sprite, 'pool', None) is not self:
+            return
+        slot = sprite.index
+        sprite.detach()
+        self.active[slot] = False
+        self._free.append(slot)
+
+    def empty(self):
+        """Retire every bullet; slots are handed out from the first again."""
+        super().empty()
+        self._free = list(range(self.capacity - 1, -1, -1))
+
+    def _grow(self):
+        capacity = self.capacity
+        for name in ('x', 'y', 'active'):
+            old = getattr(self, name)
+            new = np.zeros(2 * capacity, dtype=old.dtype)
+            new[:capacity] = old
+            setattr(self, name, new)
+        # the new slots get bullets of their own, so fire() can use them.
+        self._bullets.extend(Bullet(self.ai_game) for _ in range(capacity))
+        self._free.extend(range(2 * capacity - 1, capacity - 1, -1))
+
+    def move_bullet(self, slot, x=None, y=None):
+        """Reposition one bullet (used by Bullet.x / Bullet.y assignments)."""
+        if x is not None:
+            self.x[slot] = x
+        if y is not None:
+            self.y[slot] = y
+        self._rects_stale = True
+
+    # --- per-frame movement ----------------------------------------------
+
+    def update(self):
+        """Move every bullet up the screen and retire those past the top."""
+        if not self:
+            return
+        self.y -= self.settings.bullet_speed
+        self._rects_stale = True
+
+        gone = np.flatnonzero(self.active &
+                              (self.y + self.settings.bullet_height <= 0))
+        for slot in gone.tolist():
+            self.remove(self._bullets[slot])
+
+    # --- queries and drawing ---------------------------------------------
+
+    def boxes(self):
+        """Return (bullets, left, top, right, bottom) for collision tests."""
+        live = np.flatnonzero(self.active)
+        left = self.x[live]
+        top = self.y[live]
+        bullets = [self._bullets[slot] for slot in live.tolist()]
+        return (bullets, left, top, left + self.settings.bullet_width,
+                top + self.settings.bullet_height)
+
+    def sync_rects(self):
+        """Copy the array positions into the bullet rects, if they moved."""
+        if not self._rects_stale:
+            return
+        xs = self.x.tolist()
+        ys = self.y.tolist()
+        for bullet in self.sprites():
+            bullet.rect.topleft = (xs[bullet.index], ys[bullet.index])
+        self._rects_stale = False
+
+    def draw(self, surface):
+        """Draw every live bullet; return the screen rects they cover.
+
+        All bullets share one pre-rendered image, so this is a single
+        batched blit straight from the position arrays.
+        """
+        live = np.flatnonzero(self.active)
+        if not len(live):
+            return []
+        image, (dx, dy) = bullet_image(self.ai_game)
+        xs = (self.x[live] + dx).astype(int).tolist()
+        ys = (self.y[live] + dy).astype(int).tolist()
+        return surface.blits([(image, pos) for pos in zip(xs, ys)])
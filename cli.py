@@ -3,10 +3,17 @@
 import argparse
 import re
 
+from player_files import read_players, write_players
 from profiles import DIFFICULTIES, ProfileError
 
 DEFAULT_WINDOW = "1200x800"
 
+# --history reports, each streamed from the game history file.
+HISTORY_REPORTS = ("players", "difficulties", "days")
+
+# full: redraw and flip the whole screen; dirty: update changed rects only.
+RENDER_MODES = ("full", "dirty")
+
 _SIZE_RE = re.compile(r"^(\d{3,5})x(\d{3,5})$")
 
 
@@ -26,17 +33,51 @@ def build_parser():
     parser.add_argument(
         '--windowed', nargs='?', const=DEFAULT_WINDOW, type=window_size,
         metavar='WxH', help=f"run in a window (default {DEFAULT_WINDOW})")
+    parser.add_argument(
+        '--render', choices=RENDER_MODES, default='full',
+        help="'dirty' repaints only changed areas (default: full)")
+    parser.add_argument(
+        '--profile-overlay', action='store_true',
+        help="show frame timings on screen (toggle in game with F3)")
+    parser.add_argument(
+        '--telemetry', action='store_true',
+        help="log frame-time summaries to telemetry.jsonl")
+    parser.add_argument(
+        '--startup-trace', action='store_true',
+        help="print how long each startup step took")
+    parser.add_argument(
+        '--seed', type=int, metavar='N',
+        help="seed all randomness, for a reproducible session")
+    parser.add_argument(
+        '--record', metavar='FILE',
+        help="record the session's input to FILE for --replay")
+    parser.add_argument(
+        '--replay', metavar='FILE',
+        help="re-run a recorded session headlessly and check the result")
     parser.add_argument(
         '--player', metavar='NAME',
         help="play as NAME, creating the player if needed")
     parser.add_argument(
         '--difficulty', choices=DIFFICULTIES,
         help="set the player's difficulty before starting")
+    parser.add_argument(
+        '--profile-db', action='store_true',
+        help="keep players in profiles.db (SQLite), importing profiles.json")
     parser.add_argument(
         '--list-players', action='store_true',
         help="print the saved players and exit")
     parser.add_argument(
         '--delete-player', metavar='NAME', help="delete a player and exit")
+    parser.add_argument(
+        '--export-players', metavar='FILE',
+        help="write every player to FILE (.csv, else JSONL) and exit")
+    parser.add_argument(
+        '--import-players', metavar='FILE',
+        help="merge the players in FILE (.csv, else JSONL) in and exit")
+    parser.add_argument(
+        '--history', choices=HISTORY_REPORTS,
+        help="summarize the recorded games per player, per difficulty "
+             "or per day, and exit")
     return parser
 
 
@@ -45,11 +86,18 @@ def parse_args(argv=None):
     return build_parser().parse_args(argv)
 
 
-def run_admin_commands(options, store):
+def run_admin_commands(options, store, history_path=None):
     """Run the options that manage players instead of playing.
 
     Returns an exit code when the game should not start, else None.
     """
+    if getattr(options, 'history', None):
+        try:
+            _print_history(options.history, history_path)
+        except ValueError as e:
+            print(f"error: {e}")
+            return 1
+        return 0
     if options.list_players:
         _print_players(store)
         return 0
@@ -61,6 +109,26 @@ def run_admin_commands(options, store):
             return 1
         print(f"Deleted {options.delete_player}.")
         return 0
+    if getattr(options, 'export_players', None):
+        try:
+            count = write_players(options.export_players,
+                                  store.export_records())
+        except OSError as e:
+            print(f"error: {e}")
+            return 1
+        print(f"Exported {count:,} players to {options.export_players}.")
+        return 0
+    if getattr(options, 'import_players', None):
+        try:
+            added, merged, skipped = store.import_records(
+                read_players(options.import_players))
+        except (OSError, ValueError) as e:
+            print(f"error: {e}")
+            return 1
+        print(f"Imported {added:,} new and {merged:,} existing players"
+              f" from {options.import_players}"
+              + (f" ({skipped:,} bad records skipped)." if skipped else "."))
+        return 0
     return None
 
 
@@ -89,3 +157,36 @@ def _print_players(store):
               f"{stats['best_level']:>7}{stats['games_played']:>7}"
               f"  {stats['difficulty']}")
     print("\n* active player")
+
+
+def _print_history(report, path):
+    """Print one of the HISTORY_REPORTS for the history file at path."""
+    # NumPy is only worth importing for the reports that read the history.
+    import history
+    if report == "days":
+        days = history.games_per_day(path)
+        if not days:
+            print("No games recorded yet.")
+            return
+        print(f"{'Day (UTC)':12s}{'Games':>7s}")
+        for day, games in days.items():
+            print(f"{day:12s}{games:>7}")
+        return
+
+    if report == "players":
+        rows = history.player_scores(path)
+        label = "Player"
+    else:
+        rows = history.difficulty_scores(path)
+        label = "Difficulty"
+    if not any(summary['games'] for summary in rows.values()):
+        print("No games recorded yet.")
+        return
+    print(f"{label:14s}{'Games':>7s}{'Mean':>10s}{'p10':>10s}{'p50':>10s}"
+          f"{'p90':>10s}{'Best':>10s}")
+    for name, summary in rows.items():
+        if not summary['games']:
+            continue
+        print(f"{name:14s}{summary['games']:>7}{summary['mean']:>10,.0f}"
+              f"{summary['p10']:>10,}{summary['p50']:>10,}"
+              f"{summary['p90']:>10,}{summary['max']:>10,}")
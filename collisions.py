@@ -0,0 +1,125 @@
+"""Broad-phase collision detection between sprite groups.
+
+pygame.sprite.groupcollide tests every sprite in one group against every
+sprite in the other. BroadPhase instead sorts the second group's boxes by
+their left edge (sweep and prune over x), so each sprite of the first group
+is only tested against the few boxes whose x-range overlaps its own. The
+results have the same shape as pygame's, so callers don't change.
+
+A group can supply its boxes directly by defining boxes(), returning
+(sprites, left, top, right, bottom) with NumPy arrays aligned to sprites
+(the alien Fleet does); otherwise the boxes are read from sprite rects.
+"""
+
+import numpy as np
+
+
+def group_boxes(group):
+    """Return (sprites, left, top, right, bottom) for a sprite group."""
+    boxes = getattr(group, 'boxes', None)
+    if boxes is not None:
+        return boxes()
+    sprites = group.sprites()
+    rects = np.array([tuple(sprite.rect) for sprite in sprites],
+                     dtype=float).reshape(-1, 4)
+    left, top = rects[:, 0], rects[:, 1]
+    return sprites, left, top, left + rects[:, 2], top + rects[:, 3]
+
+
+class BroadPhase:
+    """Sweep-and-prune replacement for groupcollide and spritecollideany."""
+
+    def __init__(self):
+        self.candidate_pairs = 0
+        self.hits = 0
+        self.last_frame = self.frame_stats()
+
+    def start_frame(self):
+        """Begin a new frame's counters, keeping the previous frame's."""
+        self.last_frame = self.frame_stats()
+        self.candidate_pairs = 0
+        self.hits = 0
+
+    def frame_stats(self):
+        """Return this frame's counters so far as a dict."""
+        return {'candidate_pairs': self.candidate_pairs, 'hits': self.hits}
+
+    def groupcollide(self, group1, group2, dokill1, dokill2):
+        """Return {sprite1: [sprite2, ...]} for every overlapping pair.
+
+        Like pygame.sprite.groupcollide, sprites of group1 are handled in
+        order, and with dokill2 a sprite of group2 is only credited to the
+        first sprite of group1 that hits it.
+        """
+        if not group1 or not group2:
+            return {}
+        sprites1, *boxes1 = group_boxes(group1)
+        sprites2, *boxes2 = group_boxes(group2)
+        pairs1, pairs2 = self._overlapping_pairs(boxes1, boxes2)
+
+        collisions = {}
+        claimed = set()
+        for i, j in zip(pairs1.tolist(), pairs2.tolist()):
+            if dokill2 and j in claimed:
+                continue
+            collisions.setdefault(sprites1[i], []).append(sprites2[j])
+            if dokill2:
+                claimed.add(j)
+        self.hits += len(collisions)
+
+        for sprite1, hit in collisions.items():
+            if dokill1:
+                sprite1.kill()
+            if dokill2:
+                for sprite2 in hit:
+                    sprite2.kill()
+        return collisions
+
+    def spritecollideany(self, sprite, group):
+        """Return a sprite in group that overlaps sprite, or None."""
+        if not group:
+            return None
+        rect = sprite.rect
+        one = [np.array([float(value)]) for value in
+               (rect.left, rect.top, rect.right, rect.bottom)]
+        sprites, *boxes = group_boxes(group)
+        _pairs1, pairs2 = self._overlapping_pairs(one, boxes)
+        if not len(pairs2):
+            return None
+        self.hits += 1
+        return sprites[int(pairs2[0])]
+
+    def _overlapping_pairs(self, boxes1, boxes2):
+        """Return index arrays (i, j) of overlapping boxes, i in order."""
+        left1, top1, right1, bottom1 = boxes1
+        left2, top2, right2, bottom2 = boxes2
+        if not len(left1) or not len(left2):
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        # Broad phase: a box of group2 can only overlap box i if its left
+        # edge lies in (left1[i] - widest, right1[i]).
+        order = np.argsort(left2, kind='stable')
+        sorted_left = left2[order]
+        widest = float((right2 - left2).max())
+        lo = np.searchsorted(sorted_left, left1 - widest, side='right')
+        hi = np.searchsorted(sorted_left, right1, side='left')
+        counts = np.maximum(hi - lo, 0)
+        total = int(counts.sum())
+        self.candidate_pairs += total
+        if not total:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        # Expand each [lo, hi) range into explicit candidate pairs.
+        starts = np.cumsum(counts) - counts
+        pairs1 = np.repeat(np.arange(len(left1)), counts)
+        offsets = np.arange(total) - np.repeat(starts, counts)
+        pairs2 = order[np.repeat(lo, counts) + offsets]
+
+        # Narrow phase: the same strict overlap test as Rect.colliderect.
+        hit = ((left1[pairs1] < right2[pairs2]) &
+               (right1[pairs1] > left2[pairs2]) &
+               (top1[pairs1] < bottom2[pairs2]) &
+               (bottom1[pairs1] > top2[pairs2]))
+        return pairs1[hit], pairs2[hit]
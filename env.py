@@ -0,0 +1,375 @@
+"""Gym-style environments for playing Alien Invasion from code.
+
+AlienInvasionEnv wraps one headless game: reset(seed) starts a new game
+and step(action) plays one frame, returning (observation, reward, done,
+info) as in OpenAI Gym. Frames run on a SteppedClock and are never drawn,
+explosions and sounds are switched off, and the observation is a small
+float32 vector read straight from the fleet and bullet arrays:
+
+    ship x, fleet left/right/top/bottom, fleet direction,
+    alien grid occupancy (rows x columns, row-major),
+    bullet x for every pool slot, then bullet y (-1 for an empty slot)
+
+Positions are scaled by the screen size, so they fall in [0, 1].
+
+With observation='pixels' the game is drawn instead (stars, ship, bullets,
+aliens and explosions, no HUD) into an offscreen surface that lives in a
+NumPy array, and the observation is a uint8 (height, width, 3) view of
+that array: nothing is copied. grayscale=True and resize=(h, w) shrink it
+on the fly, by indexing every n-th row and column and weighting the
+channels in integers, into a reused buffer. Either way the array is only
+valid until the next step; copy it to keep it.
+
+frame_skip=k repeats each action for k frames and draws only the last.
+
+VectorEnv steps N independent games in one process. The games share the
+display, the loaded images and one set of star layers, so each extra game
+only costs its own game state; each game scrolls the layers itself.
+"""
+
+import os
+import tempfile
+
+# Headless SDL must be configured before pygame initializes.
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+
+import numpy as np
+import pygame
+
+from game import AlienInvasion
+from game_clock import SteppedClock
+from profiles import ProfileStore
+from random_streams import RandomStreams
+from starfield import Starfield
+
+# Discrete actions: move (none, left, right) times fire (off, on). Holding
+# fire is autofire, so shots keep to the game's cooldown.
+NOOP, LEFT, RIGHT, FIRE, LEFT_FIRE, RIGHT_FIRE = range(6)
+ACTIONS = ('noop', 'left', 'right', 'fire', 'left_fire', 'right_fire')
+_MOVES_LEFT = (LEFT, LEFT_FIRE)
+_MOVES_RIGHT = (RIGHT, RIGHT_FIRE)
+
+DEFAULT_SIZE = (1200, 800)
+OBSERVATIONS = ('vector', 'pixels')
+
+# ITU-R 601 luma weights, scaled to sum to 256.
+_LUMA = (77, 150, 29)
+
+
+class AlienInvasionEnv:
+    """One headless game, stepped a frame at a time by an agent."""
+
+    def __init__(self, size=DEFAULT_SIZE, difficulty='normal',
+                 max_steps=None, game=None, observation='vector',
+                 grayscale=False, resize=None, frame_skip=1):
+        """Create the game; pass game to wrap one that already exists."""
+        if observation not in OBSERVATIONS:
+            raise ValueError(f"unknown observation {observation!r}")
+        if frame_skip < 1:
+            raise ValueError("frame_skip must be at least 1")
+        self._tmp = tempfile.TemporaryDirectory()
+        if game is None:
+            # a throwaway player, so training never touches real profiles.
+            profiles = ProfileStore(os.path.join(self._tmp.name,
+                                                 "profiles.json"))
+            profiles.create("Agent")
+            profiles.set_difficulty(difficulty)
+            game = AlienInvasion(argparse.Namespace(windowed=tuple(size)),
+                                 clock=SteppedClock(), profiles=profiles)
+        self.game = game
+        game.sounds_enabled = False
+        game.visual_effects = False
+        self.max_steps = max_steps
+        self.frame_skip = frame_skip
+        self.steps = 0
+        # a VectorEnv lends its first game's star layers to the others.
+        self.shares_stars = False
+
+        self.width = game.settings.screen_width
+        self.height = game.settings.screen_height
+        self.grid = game._fleet_grid()
+        self.bullet_slots = game.bullets.capacity
+        self.action_count = len(ACTIONS)
+        self.observation = observation
+        if observation == 'pixels':
+            self._setup_pixels(grayscale, resize)
+        else:
+            self.observation_shape = (6 + self.grid[0] * self.grid[1] +
+                                      2 * self.bullet_slots,)
+            self.observation_dtype = np.float32
+            self._observation = np.zeros(self.observation_shape,
+                                         dtype=np.float32)
+        self.observation_size = int(np.prod(self.observation_shape))
+
+    def _setup_pixels(self, grayscale, resize):
+        # the surface draws straight into this array. A pixels3d view of an
+        # ordinary surface would do the same, but it keeps the surface
+        # locked, and a locked surface cannot be blitted to. The bytes are
+        # in the display's order (BGRA), so sprites blit at full speed.
+        self._buffer = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        self.surface = pygame.image.frombuffer(
+            self._buffer, (self.width, self.height), 'BGRA')
+        self._rgb = self._buffer[:, :, 2::-1]
+        # the star layers are full-screen; blitting them in another pixel
+        # format would mean converting every pixel every frame.
+        self._star_layers = [self._convert(layer)
+                             for layer in self.game.stars.layers]
+
+        self.grayscale = grayscale
+        self.resize = tuple(resize) if resize else None
+        if self.resize:
+            # the pixel nearest the middle of each output cell.
+            rows, columns = self.resize
+            self._index = np.ix_(
+                ((np.arange(rows) + 0.5) * self.height / rows).astype(np.intp),
+                ((np.arange(columns) + 0.5) * self.width /
+                 columns).astype(np.intp))
+            # the same pixels as flat offsets, gathered into a reused buffer.
+            self._flat = (self._index[0] * self.width +
+                          self._index[1]).ravel()
+            self._sampled = np.zeros((rows * columns, 4), dtype=np.uint8)
+            self._sampled_rgb = self._sampled.reshape(
+                rows, columns, 4)[:, :, 2::-1]
+        shape = self.resize or (self.height, self.width)
+        self.observation_shape = shape if grayscale else shape + (3,)
+        self.observation_dtype = np.uint8
+        self._observation = np.zeros(self.observation_shape, dtype=np.uint8)
+        if grayscale:
+            self._luma = (np.zeros(shape, dtype=np.uint16),
+                          np.zeros(shape, dtype=np.uint16))
+
+    def _convert(self, layer):
+        converted = layer.convert(self.surface)
+        converted.set_colorkey(layer.get_colorkey(), pygame.RLEACCEL)
+        return converted
+
+    def reset(self, seed=None):
+        """Start a new game and return its first observation.
+
+        seed re-seeds the game's random streams; in pixel mode it also
+        re-bakes the starfield (or, with borrowed layers, starts them from
+        the top), so the stars follow the seed too.
+        """
+        ai = self.game
+        ai.clock = SteppedClock()
+        ai.rng = RandomStreams(seed)
+        ai.particles.reset(ai.rng.numpy('particles'))
+        if seed is not None and self.observation == 'pixels':
+            if self.shares_stars:
+                ai.stars.offsets = [0.0] * len(ai.stars.offsets)
+            else:
+                ai.stars = Starfield(ai)
+                self._star_layers = [self._convert(layer)
+                                     for layer in ai.stars.layers]
+        ai.last_shot_time = 0
+        ai.stats.game_active = False
+        ai._check_play_button(ai.play_button.rect.center)
+        ai.ship.moving_left = ai.ship.moving_right = False
+        self.steps = 0
+        return self.observe()
+
+    def step(self, action):
+        """Play action for frame_skip frames; return (obs, reward, done, info).
+
+        The reward is summed over the frames.
+        """
+        reward, done, info = self._advance(action)
+        return self.observe(), reward, done, info
+
+    def _advance(self, action):
+        reward = 0.0
+        for _ in range(self.frame_skip):
+            gained, done, info = self._advance_frame(action)
+            reward += gained
+            if done:
+                break
+        return reward, done, info
+
+    def _advance_frame(self, action):
+        ai = self.game
+        ai.ship.moving_left = action in _MOVES_LEFT
+        ai.ship.moving_right = action in _MOVES_RIGHT
+        fire = action >= FIRE
+        if fire and not ai.autofire_active:
+            # like pressing SPACE: the first shot goes out at once.
+            ai._fire_bullet()
+        ai.autofire_active = fire
+
+        score = ai.stats.score
+        ships_lost = ai.stats.ships_lost
+        ai.collisions.start_frame()
+        ai._update_game()
+        ai.clock.tick()
+        self.steps += 1
+
+        done = not ai.stats.game_active
+        truncated = (not done and self.max_steps is not None and
+                     self.steps >= self.max_steps)
+        info = {
+            'score': ai.stats.score,
+            'level': ai.stats.level,
+            'ships_left': ai.stats.ships_left,
+            'ship_lost': ai.stats.ships_lost > ships_lost,
+            'steps': self.steps,
+            'truncated': truncated,
+        }
+        return float(ai.stats.score - score), done or truncated, info
+
+    def observe(self, out=None):
+        """Fill out (or a reused buffer) with the observation."""
+        if self.observation == 'pixels':
+            return self._observe_pixels(out)
+        ai = self.game
+        obs = self._observation if out is None else out
+        width, height = self.width, self.height
+
+        obs[0] = ai.ship.rect.centerx / width
+        fleet = ai.aliens
+        count = fleet._count
+        alive = fleet.alive[:count]
+        cells = self.grid[0] * self.grid[1]
+        # the fleet keeps its left, right and bottom up to date already.
+        left, right, bottom = fleet.bounds()
+        if right > left:
+            obs[1] = left / width
+            obs[2] = right / width
+            obs[3] = fleet.y[:count][alive].min() / height
+            obs[4] = bottom / height
+        else:
+            obs[1:5] = 0
+        obs[5] = ai.settings.fleet_direction
+        occupancy = obs[6:6 + cells]
+        occupancy[:] = 0
+        occupancy[:min(count, cells)] = alive[:cells]
+
+        pool = ai.bullets
+        slots = self.bullet_slots
+        idle = ~pool.active[:slots]
+        start = 6 + cells
+        xs = obs[start:start + slots]
+        ys = obs[start + slots:]
+        np.multiply(pool.x[:slots], 1 / width, out=xs, casting='unsafe')
+        np.multiply(pool.y[:slots], 1 / height, out=ys, casting='unsafe')
+        xs[idle] = -1
+        ys[idle] = -1
+        return obs.copy() if out is None else obs
+
+    def render(self):
+        """Draw the game into the offscreen surface."""
+        ai = self.game
+        surface = self.surface
+        surface.fill(ai.settings.bg_color)
+        for layer, offset in zip(self._star_layers, ai.stars.offsets):
+            top = int(offset)
+            surface.blit(layer, (0, top))
+            if top:
+                surface.blit(layer, (0, top - self.height))
+        surface.blit(ai.ship.image, ai.ship.rect)
+        ai.bullets.draw(surface)
+        ai.aliens.draw(surface)
+        ai.particles.draw(surface)
+
+    def _observe_pixels(self, out=None):
+        self.render()
+        pixels = self._rgb
+        if self.resize:
+            # mode='raise' would buffer out; the offsets are all in range.
+            np.take(self._buffer.reshape(-1, 4), self._flat, axis=0,
+                    out=self._sampled, mode='clip')
+            pixels = self._sampled_rgb
+        if self.grayscale:
+            # weights sum to 256, so the shifted sum fits a uint8.
+            total, term = self._luma
+            np.multiply(pixels[..., 0], _LUMA[0], out=total, dtype=np.uint16)
+            for channel in (1, 2):
+                np.multiply(pixels[..., channel], _LUMA[channel], out=term,
+                            dtype=np.uint16)
+                total += term
+            target = self._observation if out is None else out
+            np.right_shift(total, 8, out=target, casting='unsafe')
+            return target
+        if out is not None:
+            out[...] = pixels
+            return out
+        if self.resize:
+            self._observation[...] = pixels
+            return self._observation
+        return pixels
+
+    def close(self):
+        """Remove the throwaway profile directory."""
+        self._tmp.cleanup()
+
+
+class VectorEnv:
+    """N independent games stepped together in one process."""
+
+    def __init__(self, count, size=DEFAULT_SIZE, difficulty='normal',
+                 max_steps=None, **options):
+        """Create count games; options go to every AlienInvasionEnv."""
+        self.envs = [AlienInvasionEnv(size, difficulty, max_steps, **options)
+                     for _ in range(count)]
+        # every game baked an identical-looking starfield; keep one set of
+        # layers.
+        first = self.envs[0]
+        for env in self.envs[1:]:
+            env.shares_stars = True
+        self._share_stars()
+
+        self.count = count
+        self.observation_shape = first.observation_shape
+        self.observation_size = first.observation_size
+        self.action_count = first.action_count
+        self._observations = np.zeros((count,) + self.observation_shape,
+                                      dtype=first.observation_dtype)
+        self._seed = None
+
+    def _share_stars(self):
+        # only the layers: each game keeps its own scroll offsets, so
+        # stepping n games does not scroll the stars n times.
+        first = self.envs[0]
+        for env in self.envs[1:]:
+            env.game.stars.layers = first.game.stars.layers
+            if first.observation == 'pixels':
+                env._star_layers = first._star_layers
+
+    def reset(self, seed=None):
+        """Reset every game (game i gets seed + i); return stacked obs.
+
+        The games share the first game's star layers, baked from seed.
+        """
+        self._seed = seed
+        for i, env in enumerate(self.envs):
+            env.reset(None if seed is None else seed + i)
+            if i == 0:
+                self._share_stars()   # before the others draw a frame
+            env.observe(self._observations[i])
+        return self._observations.copy()
+
+    def step(self, actions):
+        """Step game i with actions[i]; return stacked obs, rewards, dones.
+
+        A game that finishes is reset at once, so every row of the next
+        observation belongs to a live game; its info holds the last
+        observation of the finished game as 'final_observation'.
+        """
+        rewards = np.zeros(self.count, dtype=np.float32)
+        dones = np.zeros(self.count, dtype=bool)
+        infos = []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            rewards[i], dones[i], info = env._advance(int(action))
+            if dones[i]:
+                info['final_observation'] = env.observe(
+                    np.empty_like(self._observations[i]))
+                env.reset()
+            env.observe(self._observations[i])
+            infos.append(info)
+        return self._observations.copy(), rewards, dones, infos
+
+    def close(self):
+        for env in self.envs:
+            env.close()
@@ -1,79 +1,70 @@
 import pygame
 from pygame.sprite import Sprite
-import random
+
+# Per-type look of an explosion: particle count, speed, size range,
+# colors, and how quickly particles slow down and shrink each tick.
+EXPLOSION_TYPES = {
+    'ship': {
+        'size': 60,
+        'num_particles': 50,
+        'speed': 10,
+        'sizes': (3, 6),
+        'colors': [
+            (255, 100, 100),  # Red
+            (255, 150, 50),    # Orange
+            (255, 255, 150)    # Yellow
+        ],
+        'damping': 0.85,
+        'shrink': 0.5,
+    },
+    'alien': {
+        'size': 30,
+        'num_particles': 30,
+        'speed': 5,
+        'sizes': (2, 4),
+        'colors': [
+            (255, 150, 0),    # Orange
+            (200, 100, 0),     # Dark orange
+            (255, 200, 100)    # Light yellow
+        ],
+        'damping': 0.9,
+        'shrink': 0.3,
+    },
+}
 
 class Explosion(Sprite):
-    """Explosion animation class with different sizes"""
-    
-    def __init__(self, center, explosion_type='alien'):
+    """Explosion animation class with different sizes
+
+    The particles themselves live in the game's ParticleSystem, shared by
+    all of its explosions; an Explosion is a handle on its burst that
+    removes itself from its groups once all of its particles have faded.
+    """
+
+    def __init__(self, ai_game, center, explosion_type='alien'):
         super().__init__()
+        self.particle_system = ai_game.particles
         self.explosion_type = explosion_type
-        self.frame = 0
-        self.last_update = pygame.time.get_ticks()
-        self.frame_rate = 50  # ms between frames
-        
-        # Configure based on explosion type
-        if self.explosion_type == 'ship':
-            self.size = 60
-            self.num_particles = 50
-            self.colors = [
-                (255, 100, 100),  # Red
-                (255, 150, 50),    # Orange
-                (255, 255, 150)    # Yellow
-            ]
-        else:  # Default/alien explosion
-            self.size = 30
-            self.num_particles = 30
-            self.colors = [
-                (255, 150, 0),    # Orange
-                (200, 100, 0),     # Dark orange
-                (255, 200, 100)    # Light yellow
-            ]
 
-        # Particles are drawn directly to the screen in draw(), so this
-        # sprite needs no image surface; keep only a rect for positioning.
+        # Configure based on explosion type (unknown types look like aliens)
+        config = EXPLOSION_TYPES.get(explosion_type, EXPLOSION_TYPES['alien'])
+        self.size = config['size']
+        self.num_particles = config['num_particles']
+        self.colors = config['colors']
+
+        # Particles are drawn by the particle system, so this sprite needs
+        # no image surface; keep only a rect for positioning.
         self.rect = pygame.Rect(0, 0, self.size * 2, self.size * 2)
         self.rect.center = center
 
-        # Create particles
-        self.particles = []
-        for _ in range(self.num_particles):
-            particle = {
-                "pos": [self.rect.centerx, self.rect.centery],
-                "vel": [
-                    random.uniform(-5, 5) * (2 if self.explosion_type == 'ship' else 1),
-                    random.uniform(-5, 5) * (2 if self.explosion_type == 'ship' else 1)
-                ],
-                "color": random.choice(self.colors),
-                "size": random.randint(
-                    3, 6) if self.explosion_type == 'ship' else random.randint(2, 4)
-            }
-            self.particles.append(particle)
+        self.owner = self.particle_system.emit(
+            self.rect.center, self.num_particles, config['speed'],
+            config['sizes'], self.colors, config['damping'], config['shrink'])
 
     def update(self):
-        """Update explosion particles"""
-        now = pygame.time.get_ticks()
-        if now - self.last_update > self.frame_rate:
-            self.last_update = now
-            self.frame += 1
-            
-            for p in self.particles:
-                p["pos"][0] += p["vel"][0]
-                p["pos"][1] += p["vel"][1]
-                p["vel"][0] *= 0.85 if self.explosion_type == 'ship' else 0.9
-                p["vel"][1] *= 0.85 if self.explosion_type == 'ship' else 0.9
-                p["size"] = max(0, p["size"] - (
-                    0.5 if self.explosion_type == 'ship' else 0.3))
-                
-            # Remove dead particles
-            self.particles = [p for p in self.particles if p["size"] > 0]
-            
-        if not self.particles:
+        """Remove a finished explosion (the game steps the particles)"""
+        if not self.particle_system.live_count(self.owner):
             self.kill()
 
     def draw(self, screen):
-        """Draw explosion particles directly to screen"""
-        for p in self.particles:
-            pygame.draw.circle(screen, p["color"], 
-                             (int(p["pos"][0]), int(p["pos"][1])), 
-                             int(p["size"]))
\ No newline at end of file
+        """Draw this explosion's particles directly to screen"""
+        self.particle_system.draw(screen, owner=self.owner)
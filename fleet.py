@@ -0,0 +1,188 @@
+"""The alien fleet, stored as arrays so the whole fleet moves in one step.
+
+Aliens still exist as sprites (they carry the shared image and a rect for
+drawing), but their exact positions and liveness live in
+NumPy arrays owned by the Fleet. Moving the fleet is a single vectorized
+add, and the fleet's bounding box is kept up to date as it moves, so the
+edge and bottom checks cost the same no matter how many aliens there are.
+Alien rects are only refreshed from the arrays when the fleet is drawn;
+collision tests read the arrays directly through boxes().
+"""
+
+import numpy as np
+from pygame.sprite import Group
+
+
+class Fleet(Group):
+    """A sprite group of aliens backed by position and liveness arrays."""
+
+    def __init__(self, ai_game):
+        super().__init__()
+        self.settings = ai_game.settings
+        self.screen_rect = ai_game.screen.get_rect()
+
+        # One slot per alien created since the fleet was last emptied;
+        # slots of destroyed aliens stay allocated but are marked dead.
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.alive = np.zeros(0, dtype=bool)
+        self._slots = []
+        self._count = 0
+        self.alien_width = 0
+        self.alien_height = 0
+
+        # (left, right, bottom) of the live aliens, or None when it must
+        # be recomputed (an alien on the edge died or was moved by hand).
+        self._bounds = None
+        self._rects_stale = False
+
+    # --- building --------------------------------------------------------
+
+    def add_alien(self, alien, x, y):
+        """Add an alien to the fleet with its top-left corner at (x, y)."""
+        slot = self._count
+        if slot == len(self.x):
+            self._grow(max(16, 2 * slot))
+        self.x[slot] = x
+        self.y[slot] = y
+        self.alive[slot] = True
+        self._count += 1
+        self._slots.append(alien)
+
+        self.alien_width, self.alien_height = alien.rect.size
+        alien.fleet = self
+        alien.index = slot
+        alien.rect.topleft = (x, y)
+        self._extend_bounds(x, y)
+        self.add(alien)
+
+    def _grow(self, capacity):
+        for name in ('x', 'y', 'alive'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def empty(self):
+        """Remove every alien and release all slots for reuse."""
+        super().empty()
+        self._slots.clear()
+        self._count = 0
+        self._bounds = None
+        self._rects_stale = False
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        if getattr(sprite, 'fleet', None) is not self:
+            return
+        slot = sprite.index
+        self.alive[slot] = False
+        sprite.detach()
+
+        # Only losing an alien on the edge of the fleet moves its bounds.
+        if self._bounds is not None:
+            left, right, bottom = self._bounds
+            x, y = self.x[slot], self.y[slot]
+            if (x <= left or x + self.alien_width >= right or
+                    y + self.alien_height >= bottom):
+                self._bounds = None
+
+    def move_alien(self, slot, x=None, y=None):
+        """Reposition one alien (used by Alien.x / Alien.y assignments)."""
+        if x is not None:
+            self.x[slot] = x
+        if y is not None:
+            self.y[slot] = y
+        self._bounds = None
+        self._rects_stale = True
+
+    # --- per-frame movement ----------------------------------------------
+
+    def update(self):
+        """Bounce off the screen edges, then move the whole fleet sideways."""
+        if not self._count:
+            return
+        if self.at_edge():
+            self._change_direction()
+
+        dx = self.settings.alien_speed * self.settings.fleet_direction
+        self.x[:self._count] += dx
+        left, right, bottom = self.bounds()
+        self._bounds = (left + dx, right + dx, bottom)
+        self._rects_stale = True
+
+    def _change_direction(self):
+        """Drop the entire fleet and reverse its direction."""
+        drop = self.settings.fleet_drop_speed
+        self.y[:self._count] += drop
+        left, right, bottom = self.bounds()
+        self._bounds = (left, right, bottom + drop)
+        self.settings.fleet_direction *= -1
+
+    # --- queries ---------------------------------------------------------
+
+    def bounds(self):
+        """Return (left, right, bottom) of the live aliens."""
+        if self._bounds is None:
+            live = self.alive[:self._count]
+            if not live.any():
+                # An empty fleet can't touch an edge or the bottom.
+                return (float('inf'), float('-inf'), float('-inf'))
+            xs = self.x[:self._count][live]
+            ys = self.y[:self._count][live]
+            self._bounds = (float(xs.min()),
+                            float(xs.max()) + self.alien_width,
+                            float(ys.max()) + self.alien_height)
+        return self._bounds
+
+    def at_edge(self):
+        """Return True if any alien has reached the left or right edge."""
+        left, right, _bottom = self.bounds()
+        return right >= self.screen_rect.right or left <= 0
+
+    def reached_bottom(self):
+        """Return True if any alien has reached the bottom of the screen."""
+        return self.bounds()[2] >= self.screen_rect.bottom
+
+    def boxes(self):
+        """Return (aliens, left, top, right, bottom) for collision tests."""
+        live = np.flatnonzero(self.alive[:self._count])
+        left = self.x[live]
+        top = self.y[live]
+        aliens = [self._slots[slot] for slot in live.tolist()]
+        return (aliens, left, top, left + self.alien_width,
+                top + self.alien_height)
+
+    def may_collide(self, rect):
+        """Cheap test: does rect overlap the fleet's bounding box at all?"""
+        left, right, bottom = self.bounds()
+        return (rect.right > left and rect.left < right and
+                rect.top < bottom)
+
+    # --- drawing ---------------------------------------------------------
+
+    def sync_rects(self):
+        """Copy the array positions into the alien rects, if they moved."""
+        if not self._rects_stale:
+            return
+        xs = self.x.tolist()
+        ys = self.y.tolist()
+        for alien in self.sprites():
+            alien.rect.topleft = (xs[alien.index], ys[alien.index])
+        self._rects_stale = False
+
+    def draw(self, surface, *args, **kwargs):
+        """Draw the aliens and return the screen rects they cover."""
+        self.sync_rects()
+        super().draw(surface, *args, **kwargs)
+        return list(self.spritedict.values())
+
+    def _extend_bounds(self, x, y):
+        if self._bounds is None:
+            if self._count > 1:
+                return  # stale anyway; bounds() will rebuild it
+            self._bounds = (x, x + self.alien_width, y + self.alien_height)
+            return
+        left, right, bottom = self._bounds
+        self._bounds = (min(left, x), max(right, x + self.alien_width),
+                        max(bottom, y + self.alien_height))
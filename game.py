@@ -0,0 +1,656 @@
+"""The game itself: the AlienInvasion class and its main loop.
+
+alien_invasion.py is the entry point; it only imports this module (and
+with it pygame and the sprites) once a game is actually going to run.
+Both open the profiles through storage.py.
+"""
+
+import sys
+
+import pygame
+
+import storage
+from assets import shared_assets
+from paths import TELEMETRY_FILENAME
+from profiles import ProfileError, MAX_NAME_LENGTH
+from profile_panel import ProfilePanel
+from settings import Settings
+from game_stats import GameStats
+from scoreboard import Scoreboard
+from button import Button
+from ship import Ship
+from bullet_pool import BulletPool
+from alien import Alien
+from fleet import Fleet
+from collisions import BroadPhase
+from starfield import Starfield
+from renderer import DirtyRenderer
+from game_clock import RealTimeClock
+from profiler import FrameProfiler
+from telemetry import Telemetry
+from history import GameHistory
+from random_streams import RandomStreams
+from replay import Recorder
+from explosion import Explosion
+from particles import ParticleSystem
+from startup import StartupTrace
+
+class AlienInvasion:
+    """overall class to manage game assets and behavior"""
+
+    def __init__(self, options=None, clock=None, profiles=None,
+                 startup=None):
+        """initialize the game and create game resources
+
+        clock drives all game timers and the frame cap; it defaults to
+        real time (pass a game_clock.SteppedClock to simulate headlessly).
+        profiles defaults to the player profiles in PROFILES_FILE (or its
+        database, with --profile-db); tools that run throwaway games pass
+        their own ProfileStore, and their games stay out of the history.
+        startup is the StartupTrace the launcher started timing with.
+
+        The sounds and the first fleet are left for after the first frame
+        (see _finish_startup), so the window shows up sooner.
+        """
+        self.startup = startup if startup is not None else StartupTrace()
+        self.show_startup_trace = getattr(options, 'startup_trace', False)
+
+        # only what the first frame needs; audio starts after it.
+        pygame.display.init()
+        pygame.font.init()
+        self.startup.mark("pygame display and font init")
+
+        self.settings = Settings()
+
+        # --windowed is handy for development; the default is fullscreen.
+        windowed = getattr(options, 'windowed', None)
+        if windowed:
+            self.screen = pygame.display.set_mode(windowed)
+        else:
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        self.settings.screen_width = self.screen.get_rect().width
+        self.settings.screen_height = self.screen.get_rect().height
+        self.startup.mark("display mode")
+
+        # images and sounds are loaded once and shared by every sprite.
+        self.assets = shared_assets
+        self.assets.set_display(self.screen)
+
+        # cap the frame rate so gameplay speed does not depend on the machine.
+        self.clock = clock if clock is not None else RealTimeClock()
+
+        # all randomness comes from streams of one seed (--seed), and all
+        # input from one event source, so a session can be replayed.
+        self.rng = RandomStreams(getattr(options, 'seed', None))
+        self.event_source = pygame.event
+
+        pygame.display.set_caption("Alien Invasion")
+
+        # player profiles own the high scores, so load them before the stats.
+        self.history = None
+        if profiles is None:
+            # saved from a background thread, so key presses that change
+            # the player never wait on the disk.
+            profiles = storage.open_profiles(options, journal=True)
+            self.history = GameHistory(storage.history_path())
+        self.profiles = profiles
+        self.startup.mark("profiles")
+
+        # Pending name being typed on the idle screen (None when not typing),
+        # and a short feedback message shown under the Play button.
+        self.name_input = None
+        self.profile_message = ""
+
+        # difficulty is a per-player preference.
+        self.settings.apply_difficulty(self.profiles.difficulty)
+
+        # create an instance to store game statistics and create a scoreboard.
+        self.stats = GameStats(self)
+        self.sb = Scoreboard(self)
+
+        self.ship = Ship(self)
+        # bullets are recycled from a fixed pool instead of built per shot.
+        self.bullets = BulletPool(self)
+
+        self.aliens = Fleet(self)
+
+        # bullet/alien and ship/alien tests only look at nearby pairs.
+        self.collisions = BroadPhase()
+
+        # Make the Play button and the idle-screen profile panel.
+        self.play_button = Button(self, "Play")
+        self.profile_panel = ProfilePanel(self)
+
+        # silent until _finish_startup loads the sounds.
+        self.sounds_enabled = False
+        self.muted = False
+        self.shoot_sound = None
+        self.explosion_sound = None
+        self.ship_hit_sound = None
+        self.background_music = None
+        self._startup_pending = True
+
+        self.autofire_active = False
+        self.last_shot_time = 0
+        self.startup.mark("ship, scoreboard and panel")
+
+        self.stars = Starfield(self)
+        self.startup.mark("starfield")
+
+        # this game's explosions share one particle system, drawn in a
+        # single pass.
+        self.explosions = pygame.sprite.Group()
+        self.particles = ParticleSystem()
+        self.particles.reset(self.rng.numpy('particles'))
+        # headless simulations that never draw can turn explosions off.
+        self.visual_effects = True
+
+        self.game_paused = False
+
+        # Non-blocking ship respawn delay (milliseconds), set when the ship
+        # is hit; 0 means no respawn is pending.
+        self.ship_respawn_time = 0
+        self.ship_respawn_delay = 1000
+
+        self._prep_pause_text()
+
+        # --render=dirty repaints only what changed; full redraws everything.
+        self.dirty_area = 0
+        self.dirty_renderer = None
+        if getattr(options, 'render', 'full') == 'dirty':
+            self.dirty_renderer = DirtyRenderer(self)
+
+        # --record FILE writes the seed, clock and input down for --replay.
+        self.recorder = None
+        if getattr(options, 'record', None):
+            self.recorder = Recorder(self, options.record)
+
+        # F3 or --profile-overlay shows where each frame's time goes.
+        self.profiler = FrameProfiler(self)
+        if getattr(options, 'profile_overlay', False):
+            self.profiler.enable()
+
+        # --telemetry logs frame-time summaries next to the profiles.
+        self.telemetry = None
+        if getattr(options, 'telemetry', False):
+            self.telemetry = Telemetry(
+                self, storage.data_path(TELEMETRY_FILENAME))
+        self.startup.mark("overlays and tools")
+
+    def _finish_startup(self):
+        """start audio and build the fleet, once the first frame is up."""
+        self._startup_pending = False
+        self.startup.mark("first frame")
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            # No audio device available; run the game silently.
+            print("Warning: audio unavailable, continuing without sound.")
+        else:
+            self._load_sounds()
+        self.startup.mark("audio and sounds")
+
+        # a game started already has built its own.
+        if not self.stats.game_active:
+            self._create_fleet()
+        self.startup.mark("fleet")
+        if self.show_startup_trace:
+            print(self.startup.report())
+
+    def _prep_pause_text(self):
+        """pre-render the pause overlay text once (it never changes)."""
+        pause_font = pygame.font.SysFont(None, 48)
+        self.pause_text = pause_font.render(
+            "Game Paused", True, (255, 255, 255))
+        self.pause_text_rect = self.pause_text.get_rect(
+            center=(self.settings.screen_width // 2,
+                    self.settings.screen_height // 2))
+
+    def _update_stars(self):
+        """scroll the star layers.
+
+        The layers wrap around at the bottom of the screen (see
+        Starfield.update), so stars never run out and need no refill.
+        """
+        self.stars.update()
+
+    def _load_sounds(self):
+        """load sounds for the game; disable audio if files are missing"""
+        try:
+            self.shoot_sound = self.assets.sound('laser1.wav')
+            self.explosion_sound = self.assets.sound('explosion.wav')
+            self.ship_hit_sound = self.assets.sound('big_explosion.ogg')
+            self.background_music = self.assets.sound('spacetheme.ogg')
+        except (pygame.error, FileNotFoundError) as e:
+            print(f"Warning: could not load sounds ({e}); continuing without sound.")
+            return
+
+        # set the volume for the sounds
+        self.shoot_sound.set_volume(0.3)
+        self.explosion_sound.set_volume(0.3)
+        self.ship_hit_sound.set_volume(0.5)
+        self.background_music.set_volume(0.3)
+
+        # play the background music
+        self.background_music.play(-1)
+        self.sounds_enabled = True
+
+    def _play_sound(self, sound):
+        """play a sound effect if audio is enabled."""
+        if self.sounds_enabled and not self.muted and sound is not None:
+            sound.play()
+
+    def _toggle_mute(self):
+        """silence or restore all game audio."""
+        self.muted = not self.muted
+        if not self.sounds_enabled:
+            return
+        if self.muted:
+            self.background_music.stop()
+        else:
+            self.background_music.play(-1)
+
+    def run_game(self):
+        """start the main loop for the game"""
+        while True:
+            self._run_one_frame()
+
+    def _run_one_frame(self):
+        """advance the game by a single frame."""
+        telemetry = self.telemetry
+        if telemetry:
+            telemetry.start_frame()
+        self.collisions.start_frame()
+        self._check_events()
+        self._update_game()
+        self._update_screen()
+        if telemetry:
+            telemetry.end_frame()
+        if self._startup_pending:
+            self._finish_startup()
+        self.clock.tick(self.settings.fps)
+
+    def _update_game(self):
+        """advance the game world one frame, without input or drawing."""
+        if self.stats.game_active and not self.game_paused:
+            self.stats.frames += 1
+            self._update_stars()
+            self.ship.update()
+            self._update_bullets()
+            self._update_aliens()
+            self._auto_fire_bullets()
+            self._check_ship_respawn()
+
+        # Explosions are purely visual; keep animating them even when
+        # the game is paused or over so they never freeze mid-effect.
+        self._update_explosions()
+
+    def _update_bullets(self):
+        """update position of bullets and delete old bullets."""
+        # update bullet positions; the pool retires bullets that reach
+        # the top of the screen.
+        self.bullets.update()
+
+        self._check_bullet_alien_collisions()
+
+    def _check_bullet_alien_collisions(self):
+        """check for any bullets that have hit aliens; remove both if so."""
+        collisions = self.collisions.groupcollide(
+            self.bullets, self.aliens, True, True
+        )
+
+        if collisions:
+            self._play_sound(self.explosion_sound)
+            for aliens in collisions.values():
+                if self.visual_effects:
+                    for alien in aliens:
+                        explosion = Explosion(self, alien.rect.center)
+                        self.explosions.add(explosion)
+                self.stats.score += self.settings.alien_points
+            self.sb.prep_score()
+            self.sb.check_high_score()
+
+        # Start a new fleet only when the current one was destroyed by
+        # bullets. While a ship respawn is pending the aliens group is also
+        # empty, but the respawn (not this handler) recreates the fleet.
+        if not self.aliens and not self.ship_respawn_time:
+            # if the entire fleet is destroyed, start a new fleet.
+            self.bullets.empty()
+            self._create_fleet()
+            self.settings.increase_speed()
+
+            # increase level.
+            self.stats.level += 1
+            self.sb.prep_level()
+
+    def _update_aliens(self):
+        """update the positions for all aliens in the fleet."""
+        # the fleet bounces off the edges and moves as a whole.
+        self.aliens.update()
+
+        # look for alien-ship collisions, once the fleet is close enough.
+        if (self.aliens.may_collide(self.ship.rect) and
+                self.collisions.spritecollideany(self.ship, self.aliens)):
+            self._ship_hit()
+
+        # check if any aliens have reached the bottom of the screen.
+        self._check_aliens_bottom()
+
+    def _ship_hit(self):
+        """respond to ship being hit by alien."""
+        # Ignore further collisions while a respawn is already pending.
+        if self.ship_respawn_time:
+            return
+        self.stats.ships_lost += 1
+
+        # Create big explosion at ship position
+        if self.visual_effects:
+            explosion = Explosion(self, self.ship.rect.center,
+                                  explosion_type='ship')
+            self.explosions.add(explosion)
+        # create a sound of explosion
+        self._play_sound(self.ship_hit_sound)
+        if self.stats.ships_left > 0:
+            # decrement ships_left, and update scoreboard.
+            self.stats.ships_left -= 1
+            self.sb.prep_ships()
+
+            # get rid of any remaining aliens and bullets.
+            self.aliens.empty()
+            self.bullets.empty()
+
+            # move the ship off-screen while it "respawns".
+            self.ship.rect.bottom = 0
+            self.ship.x = float(self.ship.rect.x)
+
+            # schedule a non-blocking respawn instead of sleeping.
+            self.ship_respawn_time = self.clock.ticks()
+        else:
+            self.stats.game_active = False
+            # record the finished game against the active player's profile.
+            self._record_game_result()
+            # show the mouse cursor once the game ends.
+            pygame.mouse.set_visible(True)
+
+    def _check_ship_respawn(self):
+        """respawn the ship and fleet once the respawn delay has elapsed."""
+        if (self.ship_respawn_time and
+                self.clock.ticks() - self.ship_respawn_time
+                >= self.ship_respawn_delay):
+            self.ship_respawn_time = 0
+            # create a new fleet and center the ship.
+            self._create_fleet()
+            self.ship.center_ship()
+
+    def _check_aliens_bottom(self):
+        """check if any aliens have reached the bottom of the screen."""
+        if self.aliens.reached_bottom():
+            # treat this the same as if the ship got hit.
+            self._ship_hit()
+
+    def _check_events(self):
+        """respond to keypresses and mouse events."""
+        for event in self.event_source.get():
+            if event.type == pygame.QUIT:
+                self._quit_game()
+            elif event.type == pygame.KEYDOWN:
+                self._check_keydown_events(event)
+            elif event.type == pygame.KEYUP:
+                self._check_keyup_events(event)
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                self._check_play_button(event.pos)
+
+
+    def _check_play_button(self, mouse_pos):
+        """start a new game when the player clicks Play."""
+        button_clicked = self.play_button.rect.collidepoint(mouse_pos)
+        if button_clicked and not self.stats.game_active:
+            # a game always belongs to a player, so require one first.
+            if not self.profiles.active:
+                self.profile_message = "Press N to add a player first."
+                return
+
+            # reset the game settings at the player's chosen difficulty.
+            self.settings.apply_difficulty(self.profiles.difficulty)
+
+            # reset the game statistics.
+            self.stats.reset_stats()
+            self.stats.started = self.clock.ticks()
+
+            # reset transient gameplay state from any previous game.
+            self.game_paused = False
+            self.autofire_active = False
+            self.ship_respawn_time = 0
+            self.explosions.empty()
+            self.particles.clear()
+            self.name_input = None
+            self.profile_message = ""
+
+            self.stats.game_active = True
+            self.sb.prep_score()
+            self.sb.prep_level()
+            self.sb.prep_ships()
+
+            # get rid of any remaining aliens and bullets.
+            self.aliens.empty()
+            self.bullets.empty()
+
+            # create a new fleet and center the ship.
+            self._create_fleet()
+            self.ship.center_ship()
+
+            # hide the mouse cursor.
+            pygame.mouse.set_visible(False)
+
+    def _check_keydown_events(self, event):
+        """Responds to key presses."""
+        # While naming a player, every key belongs to the text prompt.
+        if self.name_input is not None:
+            self._check_name_entry_keydown_events(event)
+            return
+
+        if not self.stats.game_active and event.key in (
+                pygame.K_n, pygame.K_TAB, pygame.K_DELETE, pygame.K_d):
+            self._check_profile_keydown_events(event)
+            return
+
+        if event.key == pygame.K_m:
+            self._toggle_mute()
+        elif event.key == pygame.K_p:
+            if self.stats.game_active:
+                self.game_paused = not self.game_paused
+        elif event.key == pygame.K_RIGHT:
+            # move the ship to the right.
+            self.ship.moving_right = True
+        elif event.key == pygame.K_LEFT:
+            self.ship.moving_left = True
+        elif event.key == pygame.K_q:
+            self._quit_game()
+        elif event.key == pygame.K_F3:
+            self.profiler.toggle()
+        elif event.key == pygame.K_SPACE:
+            self.autofire_active = not self.autofire_active
+            if self.autofire_active:
+                self._fire_bullet()
+        # start the game when the player presses Enter.
+        elif event.key == pygame.K_RETURN:
+            if not self.stats.game_active:
+                mouse_pos = self.play_button.rect.center # get the center of the button
+                self._check_play_button(mouse_pos)       # simulate a mouse click
+
+    def _record_game_result(self):
+        """store the score and level of a finished game in the profile."""
+        stats = self.stats
+        if self.history and self.profiles.active:
+            self.history.record(
+                self.profiles.active, self.settings.difficulty, stats.score,
+                stats.level, self.clock.ticks() - stats.started, stats.frames)
+        self.profiles.record_game(stats.score, stats.level)
+        self._refresh_profile_display()
+
+    def _quit_game(self):
+        """save an in-progress game's result, then exit."""
+        if self.stats.game_active:
+            self.stats.game_active = False
+            self._record_game_result()
+        self.profiles.close()
+        if self.history:
+            self.history.close()
+        if self.telemetry:
+            self.telemetry.close()
+        if self.recorder:
+            self.recorder.close()
+        sys.exit()
+
+    def _refresh_profile_display(self):
+        """re-read the active player's preferences into the game state."""
+        self.settings.apply_difficulty(self.profiles.difficulty)
+        self.stats.high_score = self.profiles.high_score
+        self.sb.prep_high_score()
+        self.sb.prep_player()
+
+        # Between games the ship icons preview what the next game grants.
+        if not self.stats.game_active:
+            self.stats.ships_left = self.settings.ship_limit
+            self.sb.prep_ships()
+
+    def _check_profile_keydown_events(self, event):
+        """handle player-management keys on the idle screen."""
+        if event.key == pygame.K_n:
+            self.name_input = ""
+            self.profile_message = ""
+        elif event.key == pygame.K_TAB:
+            if self.profiles.select_next():
+                self.profile_message = ""
+                self._refresh_profile_display()
+        elif event.key == pygame.K_DELETE:
+            active = self.profiles.active
+            if active:
+                self.profiles.delete(active)
+                self.profile_message = f"Deleted {active}."
+                self._refresh_profile_display()
+        elif event.key == pygame.K_d:
+            if self.profiles.active:
+                self.profiles.cycle_difficulty()
+                self.profile_message = ""
+                self._refresh_profile_display()
+
+    def _check_name_entry_keydown_events(self, event):
+        """build up the new player's name while the prompt is open."""
+        if event.key == pygame.K_ESCAPE:
+            self.name_input = None
+            self.profile_message = ""
+        elif event.key == pygame.K_BACKSPACE:
+            self.name_input = self.name_input[:-1]
+        elif event.key == pygame.K_RETURN:
+            try:
+                name = self.profiles.create(self.name_input)
+            except ProfileError as e:
+                self.profile_message = str(e)
+            else:
+                self.name_input = None
+                self.profile_message = f"Welcome, {name}!"
+                self._refresh_profile_display()
+        elif event.unicode and event.unicode.isprintable():
+            if len(self.name_input) < MAX_NAME_LENGTH:
+                self.name_input += event.unicode
+
+    def _check_keyup_events(self, event):
+        """Responds to key releases."""
+        if event.key == pygame.K_RIGHT:
+            self.ship.moving_right = False
+        elif event.key == pygame.K_LEFT:
+            self.ship.moving_left = False
+        elif event.key == pygame.K_SPACE:
+            self.autofire_active = False
+
+    def _auto_fire_bullets(self):
+        """fire bullets automatically if autofire is active."""
+        current_time = self.clock.ticks()
+        if self.autofire_active and (current_time - self.last_shot_time) > self.settings.autofire_cooldown:
+            self._fire_bullet()
+
+    def _fire_bullet(self):
+        """create a new bullet and add it to the bullets group."""
+        if len(self.bullets) < self.settings.bullets_allowed:
+            self.bullets.fire(self.ship.rect.midtop)
+            self.last_shot_time = self.clock.ticks()
+            self._play_sound(self.shoot_sound)
+
+    def _fleet_grid(self):
+        """return the (rows, aliens per row) of a fleet on this screen."""
+        # make an alien and find the number of aliens in a row.
+        # spacing between each alien is equal to one alien width.
+        alien = Alien(self)
+        alien_width, alien_height = alien.rect.size
+        available_space_x = self.settings.screen_width - (4 * alien_width)
+        number_aliens_x = int(available_space_x // (2 * alien_width))
+
+        # determine the number of aliens that fit on the screen
+        ship_height = self.ship.rect.height
+        available_space_y = self.settings.screen_height - (8 * alien_height) - ship_height
+        number_rows = int(available_space_y // (3 * alien_height))
+        return number_rows, number_aliens_x
+
+    def _create_fleet(self):
+        """create a fleet of aliens."""
+        number_rows, number_aliens_x = self._fleet_grid()
+
+        # create full fleet of aliens
+        for row_number in range(number_rows):
+            for alien_number in range(number_aliens_x):
+                # create an alien and place it in the row
+                self._create_alien(alien_number, row_number)
+
+    def _create_alien(self, alien_number, row_number):
+        alien = Alien(self)
+        alien_width, alien_height = alien.rect.size
+        x = alien_width + 2 * alien_width * alien_number
+        y = alien_height * 2 + 2 * alien_height * row_number
+        self.aliens.add_alien(alien, x, y)
+
+    def _update_explosions(self):
+        """Update explosion animations"""
+        self.particles.update(self.clock.ticks())
+        self.explosions.update()
+
+    def _update_screen(self):
+        """update images on the screen, and flip to the new screen"""
+        if self.dirty_renderer:
+            self.dirty_renderer.draw_frame()
+            self.dirty_area = self.dirty_renderer.dirty_area
+            return
+
+        # redraw the screen during each pass through the loop.
+        self.screen.fill(self.settings.bg_color)
+        # draw the stars first
+        self.stars.draw(self.screen)
+        self.ship.blitme()
+        self.bullets.draw(self.screen)
+        self.aliens.draw(self.screen)
+
+        # draw the score information.
+        self.sb.show_score()
+
+        # draw the play button and player management panel when idle.
+        if not self.stats.game_active:
+            self.play_button.draw_button()
+            self.profile_panel.draw()
+
+        # draw explosions
+        self.particles.draw(self.screen)
+
+        # Draw pause text if the game is paused
+        if self.game_paused:
+            self.screen.blit(self.pause_text, self.pause_text_rect)
+
+        if self.profiler.enabled:
+            self.profiler.draw()
+
+        self._flip_display()
+        self.dirty_area = self.settings.screen_width * self.settings.screen_height
+
+    def _flip_display(self):
+        """make the most recently drawn screen visible."""
+        pygame.display.flip()
+
@@ -0,0 +1,64 @@
+"""Clocks that drive game time: real time for play, stepped for simulation.
+
+Every timer in the game (autofire cooldown, respawn delay, explosion
+animation) and the frame-rate cap read time through the game's clock
+instead of pygame.time directly. RealTimeClock is the normal wall clock;
+SteppedClock advances a fixed number of milliseconds per frame without
+sleeping, so a headless run can simulate gameplay as fast as the CPU
+allows and still see exactly the timings of a 60 fps game.
+
+Both clocks count milliseconds, and tick(fps) ends a frame.
+"""
+
+import time
+
+import pygame
+
+
+class RealTimeClock:
+    """Wall-clock time, with the frame rate capped by sleeping."""
+
+    def __init__(self):
+        self._clock = pygame.time.Clock()
+        # pygame.time.get_ticks stays at 0 without a full pygame.init(),
+        # which the game skips, so the clock keeps its own time.
+        self._start = time.perf_counter()
+
+    def ticks(self):
+        """Milliseconds since the clock was created, counting from 1."""
+        return int((time.perf_counter() - self._start) * 1000) + 1
+
+    def tick(self, fps):
+        """End a frame, sleeping to hold fps; return the ms it took."""
+        return self._clock.tick(fps)
+
+    def get_fps(self):
+        """Average frame rate over the last few frames."""
+        return self._clock.get_fps()
+
+
+class SteppedClock:
+    """Simulated time that moves a fixed step per frame and never sleeps.
+
+    Like pygame.time.get_ticks, ticks() is a whole number of milliseconds;
+    it is computed from the frame count, so rounding never accumulates.
+    The clock starts one step in, so no frame happens at time 0 (the game
+    uses 0 to mean "no timer pending").
+    """
+
+    def __init__(self, fps=60, step_ms=None):
+        self.step_ms = step_ms if step_ms is not None else 1000 / fps
+        self.frames = 0
+
+    def ticks(self):
+        """Simulated milliseconds elapsed."""
+        return round(self.step_ms * (self.frames + 1))
+
+    def tick(self, fps=None):
+        """End a frame by advancing one step; return the step in ms."""
+        self.frames += 1
+        return self.step_ms
+
+    def get_fps(self):
+        """The simulated frame rate."""
+        return 1000 / self.step_ms
@@ -17,3 +17,7 @@ class GameStats:
         self.ships_left = self.settings.ship_limit
         self.score = 0
         self.level = 1
+        self.ships_lost = 0
+        # frames played, and the clock time the game started at.
+        self.frames = 0
+        self.started = 0
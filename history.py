@@ -0,0 +1,195 @@
+"""Per-game history: one fixed-size binary record for every finished game.
+
+Profiles only keep four running totals per player; the history keeps each
+game (when it ended, player, difficulty, score, level, duration, frames)
+so trends and outliers can be looked at later. Records are NumPy
+structured rows, packed little-endian, appended after a short header.
+GameHistory collects them in memory and appends a batch with one write,
+on quit or when the batch is full.
+
+The readers stream the file a chunk of records at a time, so a history
+of millions of games is summed up in constant memory. Score percentiles
+come from the same HDR-style buckets as telemetry's histograms: exact
+below 128 and within 1/64 above. A record torn by a crash mid-append is
+ignored.
+"""
+
+import atexit
+import time
+
+import numpy as np
+
+from profiles import DIFFICULTIES, MAX_NAME_LENGTH
+from telemetry import histogram
+
+MAGIC = b"AIHIST01"
+
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),           # unix time the game ended
+    ('player', f'S{MAX_NAME_LENGTH}'),
+    ('difficulty', 'u1'),      # index into profiles.DIFFICULTIES
+    ('score', '<i8'),
+    ('level', '<u2'),
+    ('duration_ms', '<u4'),
+    ('frames', '<u4'),
+], align=False)
+
+CHUNK_RECORDS = 64 * 1024
+PERCENTILES = (10, 50, 90)
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class GameHistory:
+    """Buffer finished games and append them to the history file."""
+
+    def __init__(self, path, batch=16):
+        self.path = path
+        self._buffer = np.zeros(batch, dtype=RECORD_DTYPE)
+        self._count = 0
+        self.writes = 0
+        atexit.register(self.close)
+
+    def record(self, player, difficulty, score, level, duration_ms, frames,
+               when=None):
+        """Add one finished game; it reaches the disk with its batch."""
+        self._buffer[self._count] = (
+            time.time() if when is None else when,
+            player.encode('ascii'), DIFFICULTIES.index(difficulty),
+            score, level, max(int(duration_ms), 0), frames)
+        self._count += 1
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Append the buffered games in one write."""
+        if not self._count:
+            return
+        data = self._buffer[:self._count].tobytes()
+        self._count = 0
+        try:
+            with open(self.path, 'ab') as f:
+                end = f.tell()
+                if end < len(MAGIC):
+                    f.truncate(0)
+                    f.write(MAGIC)
+                else:
+                    # cut off a record torn by a crash, so this batch
+                    # starts on a record boundary.
+                    size = RECORD_DTYPE.itemsize
+                    whole = len(MAGIC) + (end - len(MAGIC)) // size * size
+                    if whole != end:
+                        f.truncate(whole)
+                f.write(data)
+            self.writes += 1
+        except OSError as e:
+            print(f"Warning: could not write the game history ({e}).")
+
+    def close(self):
+        """Write anything still buffered."""
+        self.flush()
+
+
+def read_chunks(path, chunk=None):
+    """Yield the history's records as arrays of at most chunk rows.
+
+    A missing file has no records; a file that is not a history raises
+    ValueError.
+    """
+    chunk = chunk or CHUNK_RECORDS
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    size = RECORD_DTYPE.itemsize
+    with f:
+        if f.read(len(MAGIC)) not in (MAGIC, b""):
+            raise ValueError(f"{path} is not a game history file")
+        while True:
+            data = f.read(chunk * size)
+            # whole records only: a crash can leave a torn last one.
+            count = len(data) // size
+            if count:
+                yield np.frombuffer(data, RECORD_DTYPE, count)
+            if len(data) < chunk * size:
+                return
+
+
+class Distribution:
+    """Count, mean, extremes and bucketed values, added a batch at a time."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = {}
+
+    def add(self, values):
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += int(values.sum())
+        low, high = int(values.min()), int(values.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        for lower, count in histogram(values):
+            self.buckets[lower] = self.buckets.get(lower, 0) + count
+
+    def percentile(self, p):
+        """The p-th percentile, rounded down to its value and bucket."""
+        rank = p / 100 * (self.count - 1)
+        seen = 0
+        for lower in sorted(self.buckets):
+            seen += self.buckets[lower]
+            if seen > rank:
+                return lower
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {'games': 0}
+        summary = {'games': self.count,
+                   'mean': round(self.total / self.count, 1)}
+        for p in PERCENTILES:
+            summary[f"p{p}"] = self.percentile(p)
+        summary['min'] = self.min
+        summary['max'] = self.max
+        return summary
+
+
+def player_scores(path):
+    """Score distribution of every player, by the name they played as."""
+    players = {}
+    for records in read_chunks(path):
+        names, groups = np.unique(records['player'], return_inverse=True)
+        for i, name in enumerate(names.tolist()):
+            players.setdefault(name.decode('ascii'), Distribution()).add(
+                records['score'][groups == i])
+    return {name: players[name].summary()
+            for name in sorted(players, key=str.lower)}
+
+
+def difficulty_scores(path):
+    """Score distribution per difficulty, with its buckets."""
+    difficulties = {name: Distribution() for name in DIFFICULTIES}
+    for records in read_chunks(path):
+        for i, name in enumerate(DIFFICULTIES):
+            difficulties[name].add(records['score'][records['difficulty'] == i])
+    report = {}
+    for name, distribution in difficulties.items():
+        report[name] = distribution.summary()
+        report[name]['buckets'] = sorted(distribution.buckets.items())
+    return report
+
+
+def games_per_day(path):
+    """Games finished per UTC day, as {'YYYY-MM-DD': count}."""
+    days = {}
+    for records in read_chunks(path):
+        day, counts = np.unique(
+            (records['time'] // SECONDS_PER_DAY).astype(np.int64),
+            return_counts=True)
+        for d, count in zip(day.tolist(), counts.tolist()):
+            days[d] = days.get(d, 0) + count
+    return {time.strftime('%Y-%m-%d', time.gmtime(d * SECONDS_PER_DAY)): n
+            for d, n in sorted(days.items())}
@@ -0,0 +1,167 @@
+"""One particle system shared by every explosion on screen.
+
+Each explosion used to keep its own list of particle dicts, step them in
+a Python loop and draw them one pygame.draw.circle at a time. Here every
+live particle lives in the same set of NumPy arrays, so a tick moves,
+damps and shrinks all of them in one vectorized step and drops the dead
+ones in bulk. Drawing blits pre-rendered dots in a single Surface.blits.
+"""
+
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """Position, velocity, size and color arrays for all live particles."""
+
+    def __init__(self, capacity=256, tick_ms=50):
+        # particles advance one step every tick_ms milliseconds.
+        self.tick_ms = tick_ms
+        self.last_tick = None
+        self.rng = np.random.default_rng()
+
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.size = np.zeros(capacity)
+        self.shrink = np.zeros(capacity)
+        self.damping = np.zeros(capacity)
+        self.color = np.zeros(capacity, dtype=np.intp)
+        self.owner = np.zeros(capacity, dtype=np.int64)
+
+        # colors are stored as indices into the palette.
+        self.palette = []
+        self._color_index = {}
+        self._dots = {}
+        self._next_owner = 1
+        self._live = {}
+
+    # --- emitting --------------------------------------------------------
+
+    def emit(self, center, count, speed, sizes, colors, damping, shrink):
+        """Add a burst of count particles at center; return its owner id.
+
+        Velocities are uniform in [-speed, speed] on each axis, sizes are
+        integers in the inclusive range sizes, and colors are picked
+        uniformly from colors.
+        """
+        start = self.count
+        end = start + count
+        if end > len(self.size):
+            self._grow(max(end, 2 * len(self.size)))
+
+        owner = self._next_owner
+        self._next_owner += 1
+        indices = np.array([self._palette_index(c) for c in colors])
+
+        self.pos[start:end] = center
+        self.vel[start:end] = self.rng.uniform(-speed, speed, (count, 2))
+        self.size[start:end] = self.rng.integers(sizes[0], sizes[1] + 1, count)
+        self.color[start:end] = self.rng.choice(indices, count)
+        self.damping[start:end] = damping
+        self.shrink[start:end] = shrink
+        self.owner[start:end] = owner
+        self.count = end
+        self._live[owner] = count
+        return owner
+
+    def _palette_index(self, color):
+        color = tuple(color)
+        if color not in self._color_index:
+            self._color_index[color] = len(self.palette)
+            self.palette.append(color)
+        return self._color_index[color]
+
+    def _grow(self, capacity):
+        for name in ('pos', 'vel', 'size', 'shrink', 'damping', 'color',
+                     'owner'):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    # --- stepping --------------------------------------------------------
+
+    def update(self, now):
+        """Advance one step if tick_ms have passed since the last one."""
+        # The system is shared, so a new game's clock may start over.
+        if self.last_tick is None or now < self.last_tick:
+            self.last_tick = now
+        if now - self.last_tick > self.tick_ms:
+            self.last_tick = now
+            self.step()
+
+    def step(self):
+        """Move, damp and shrink every particle, then drop the dead ones."""
+        n = self.count
+        if not n:
+            return
+        self.pos[:n] += self.vel[:n]
+        self.vel[:n] *= self.damping[:n, None]
+        self.size[:n] -= self.shrink[:n]
+
+        keep = np.flatnonzero(self.size[:n] > 0)
+        if len(keep) < n:
+            k = len(keep)
+            for name in ('pos', 'vel', 'size', 'shrink', 'damping', 'color',
+                         'owner'):
+                array = getattr(self, name)
+                array[:k] = array[keep]
+            self.count = k
+            owners, counts = np.unique(self.owner[:k], return_counts=True)
+            self._live = dict(zip(owners.tolist(), counts.tolist()))
+
+    def live_count(self, owner):
+        """How many particles of the burst owner are still alive."""
+        return self._live.get(owner, 0)
+
+    def clear(self):
+        """Remove every particle."""
+        self.count = 0
+        self._live = {}
+
+    def reset(self, rng):
+        """Start over for a new game, drawing randomness from rng."""
+        self.clear()
+        self.rng = rng
+        self.last_tick = None
+
+    # --- drawing ---------------------------------------------------------
+
+    def draw(self, surface, owner=None):
+        """Draw all live particles, or only those of one burst.
+
+        Returns the bounding rect of what was drawn, or None.
+        """
+        n = self.count
+        if not n:
+            return None
+        radii = self.size[:n].astype(int)
+        mask = radii > 0
+        if owner is not None:
+            mask &= self.owner[:n] == owner
+        idx = np.flatnonzero(mask)
+        if not len(idx):
+            return None
+        radii = radii[idx]
+        corners = self.pos[idx].astype(int) - radii[:, None]
+        surface.blits(
+            [(self._dot(c, r), (x, y)) for c, r, (x, y) in zip(
+                self.color[idx].tolist(), radii.tolist(), corners.tolist())],
+            doreturn=False)
+
+        far = corners + 2 * radii[:, None]
+        left, top = corners.min(axis=0).tolist()
+        right, bottom = far.max(axis=0).tolist()
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def _dot(self, color_index, radius):
+        """Return a cached filled circle of the given color and radius."""
+        key = (color_index, radius)
+        dot = self._dots.get(key)
+        if dot is None:
+            dot = pygame.Surface((2 * radius, 2 * radius), pygame.SRCALPHA)
+            pygame.draw.circle(dot, self.palette[color_index],
+                               (radius, radius), radius)
+            self._dots[key] = dot
+        return dot
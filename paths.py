@@ -15,6 +15,17 @@ HIGH_SCORE_FILE = os.path.join(BASE_DIR, 'high_score.txt')
 # above is only read once, to migrate scores from before profiles existed.
 PROFILES_FILE = os.path.join(BASE_DIR, 'profiles.json')
 
+# --profile-db keeps the profiles in this SQLite database instead, in the
+# same directory as the JSON file they are imported from.
+PROFILES_DB_FILENAME = 'profiles.db'
+
+# --telemetry appends frame-time summaries to this file, kept in the same
+# directory as the profiles.
+TELEMETRY_FILENAME = 'telemetry.jsonl'
+
+# every finished game is appended to this binary log, next to the profiles.
+HISTORY_FILENAME = 'history.bin'
+
 
 def resource_path(*parts):
     """Return an absolute path to a resource inside the project directory."""
@@ -0,0 +1,73 @@
+"""Player records in CSV or JSONL files, for moving players between machines.
+
+The format follows the file name: .csv is a CSV file with a header row,
+anything else is JSONL, one record per line. Both are read and written a
+record at a time, so files of any size stream in constant memory. The
+records are the stores' own; reading only parses them, cleaning them up
+is left to the store's import_records.
+"""
+
+import csv
+import json
+import os
+
+from profiles import _EMPTY_STATS
+
+FIELDS = ("name",) + tuple(_EMPTY_STATS) + ("difficulty",)
+
+
+def is_csv(path):
+    return path.lower().endswith(".csv")
+
+
+def write_players(path, records):
+    """Write records to path atomically; return how many were written."""
+    tmp_path = path + '.tmp'
+    count = 0
+    try:
+        with open(tmp_path, 'w', newline='') as f:
+            if is_csv(path):
+                writer = csv.DictWriter(f, FIELDS, extrasaction='ignore')
+                writer.writeheader()
+                for record in records:
+                    writer.writerow(record)
+                    count += 1
+            else:
+                for record in records:
+                    f.write(json.dumps({field: record[field]
+                                        for field in FIELDS}) + "\n")
+                    count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def read_players(path):
+    """Yield the raw records in path; lines that do not parse become None.
+
+    Raises OSError if the file cannot be opened.
+    """
+    with open(path, 'r', newline='') as f:
+        if is_csv(path):
+            for row in csv.DictReader(f):
+                yield {field: _number(value) if field in _EMPTY_STATS
+                       else value for field, value in row.items()}
+        else:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    yield None
+
+
+def _number(value):
+    """CSV cells are text: turn a stat back into an int."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
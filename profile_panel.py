@@ -1,6 +1,6 @@
 """Idle-screen panel for player management: current player, top scores, hints."""
 
-import pygame.font
+import pygame
 
 from profiles import MAX_NAME_LENGTH
 
@@ -9,6 +9,10 @@ HINT_COLOR = (140, 140, 170)
 MESSAGE_COLOR = (255, 220, 100)
 TITLE_COLOR = (100, 255, 100)
 
+# the panel image is see-through wherever no line is drawn.
+_TRANSPARENT = (255, 0, 255)
+LINE_GAP = 6
+
 
 class ProfilePanel:
     """Draw profile information under the Play button while the game is idle."""
@@ -22,59 +26,90 @@ class ProfilePanel:
         self.font = pygame.font.SysFont(None, 32)
         self.hint_font = pygame.font.SysFont(None, 26)
 
+        # the rendered panel, and what it showed when it was rendered; it
+        # is only rendered again when any of that changes.
+        self.image = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self._shown = None
+
     def draw(self):
-        """Draw the panel, centered below the Play button."""
-        top = self.ai_game.play_button.rect.bottom + 40
+        """Draw the panel, centered below the Play button.
+
+        Returns the screen area the panel covers.
+        """
+        image, rect = self.render()
+        return self.screen.blit(image, rect)
+
+    def render(self):
+        """Return the panel image and its screen rect, re-rendered if stale."""
+        ai = self.ai_game
+        shown = (ai.profiles.version, ai.name_input, ai.profile_message,
+                 ai.settings.difficulty, ai.muted,
+                 ai.play_button.rect.bottom)
+        if shown != self._shown:
+            self._shown = shown
+            self.image = self._render_panel()
+            self.rect = self.image.get_rect(
+                centerx=self.screen_rect.centerx,
+                top=ai.play_button.rect.bottom + 40)
+        return self.image, self.rect
+
+    def _render_panel(self):
+        """Render every line of the panel into one image."""
+        ai = self.ai_game
+        lines = []   # (text, font, color, extra space above)
 
         # The active player's name is already in the scoreboard, so the panel
         # only shows what the player can do about it.
-        if self.ai_game.name_input is None:
-            top = self._draw_line(
-                "N: new player    TAB: switch player    DEL: delete player",
-                self.hint_font, HINT_COLOR, top)
-            sound = "off" if self.ai_game.muted else "on"
-            top = self._draw_line(
-                f"D: difficulty ({self.ai_game.settings.difficulty})"
-                f"    M: sound ({sound})",
-                self.hint_font, HINT_COLOR, top)
-            top = self._draw_stats(top)
+        if ai.name_input is None:
+            lines.append(
+                ("N: new player    TAB: switch player    DEL: delete player",
+                 self.hint_font, HINT_COLOR, 0))
+            sound = "off" if ai.muted else "on"
+            lines.append((f"D: difficulty ({ai.settings.difficulty})"
+                          f"    M: sound ({sound})",
+                          self.hint_font, HINT_COLOR, 0))
+            stats = self._stats_line()
+            if stats:
+                lines.append((stats, self.hint_font, TEXT_COLOR, 0))
         else:
-            top = self._draw_line(
-                f"New player name: {self.ai_game.name_input}_",
-                self.font, TEXT_COLOR, top)
-            top = self._draw_line(
-                f"Enter: confirm    Esc: cancel    (max {MAX_NAME_LENGTH} chars)",
-                self.hint_font, HINT_COLOR, top)
-
-        if self.ai_game.profile_message:
-            top = self._draw_line(self.ai_game.profile_message, self.hint_font,
-                                  MESSAGE_COLOR, top)
-
-        leaderboard = self.ai_game.profiles.leaderboard()
+            lines.append((f"New player name: {ai.name_input}_",
+                          self.font, TEXT_COLOR, 0))
+            lines.append((f"Enter: confirm    Esc: cancel    "
+                          f"(max {MAX_NAME_LENGTH} chars)",
+                          self.hint_font, HINT_COLOR, 0))
+
+        if ai.profile_message:
+            lines.append((ai.profile_message, self.hint_font, MESSAGE_COLOR, 0))
+
+        leaderboard = ai.profiles.leaderboard()
         if leaderboard:
-            top = self._draw_line("- Top Pilots -", self.hint_font,
-                                  TITLE_COLOR, top + 10)
+            lines.append(("- Top Pilots -", self.hint_font, TITLE_COLOR, 10))
             for rank, (name, high_score) in enumerate(leaderboard, start=1):
-                top = self._draw_line(f"{rank}. {name} - {high_score:,}",
-                                      self.hint_font, TEXT_COLOR, top)
+                lines.append((f"{rank}. {name} - {high_score:,}",
+                              self.hint_font, TEXT_COLOR, 0))
+
+        images = [(font.render(text, True, color, self.bg_color), space)
+                  for text, font, color, space in lines]
+        width = max(image.get_width() for image, _space in images)
+        height = sum(image.get_height() + space + LINE_GAP
+                     for image, space in images) - LINE_GAP
+        panel = pygame.Surface((width, height)).convert()
+        panel.fill(_TRANSPARENT)
+        panel.set_colorkey(_TRANSPARENT, pygame.RLEACCEL)
+        top = 0
+        for image, space in images:
+            rect = image.get_rect(centerx=width // 2, top=top + space)
+            panel.blit(image, rect)
+            top = rect.bottom + LINE_GAP
+        return panel
 
-    def _draw_stats(self, top):
-        """Draw the active player's career stats, if there is one."""
+    def _stats_line(self):
+        """The active player's career stats, if there is one."""
         name = self.ai_game.profiles.active
         if not name:
-            return top
+            return None
         stats = self.ai_game.profiles.stats_for(name)
-        return self._draw_line(
-            f"Games: {stats['games_played']}    "
-            f"Best level: {stats['best_level']}    "
-            f"Total score: {stats['total_score']:,}",
-            self.hint_font, TEXT_COLOR, top)
-
-    def _draw_line(self, text, font, color, top):
-        """Blit one centered line and return the top of the next line."""
-        image = font.render(text, True, color, self.bg_color)
-        rect = image.get_rect()
-        rect.centerx = self.screen_rect.centerx
-        rect.top = top
-        self.screen.blit(image, rect)
-        return rect.bottom + 6
+        return (f"Games: {stats['games_played']}    "
+                f"Best level: {stats['best_level']}    "
+                f"Total score: {stats['total_score']:,}")
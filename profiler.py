@@ -0,0 +1,226 @@
+"""In-game frame profiler: per-phase timings drawn as an overlay.
+
+F3 (or --profile-overlay) turns it on. While on, the game's frame, update
+and draw methods are wrapped so each call adds its perf_counter_ns
+duration to its phase; at the end of a frame the phase totals go into a
+ring buffer holding the last few seconds. The overlay shows the rolling
+mean of each phase as a bar, the recent frame times as a graph, and how
+many bullets, aliens, particles and stars there are.
+
+Turning it off removes the wrappers, so a disabled profiler runs exactly
+the game's own methods and costs nothing per call.
+"""
+
+import time
+
+import numpy as np
+import pygame
+
+# (phase, game attribute holding the object, method). Phases can nest:
+# collisions happen inside bullets, and the draw phases inside screen.
+# Several methods may add up into one phase.
+TIMED = (
+    ('events', None, '_check_events'),
+    ('stars', None, '_update_stars'),
+    ('ship', 'ship', 'update'),
+    ('bullets', None, '_update_bullets'),
+    ('collisions', None, '_check_bullet_alien_collisions'),
+    ('aliens', None, '_update_aliens'),
+    ('explosions', None, '_update_explosions'),
+    ('screen', None, '_update_screen'),
+    ('draw stars', 'stars', 'draw'),
+    ('draw sprites', 'ship', 'blitme'),
+    ('draw sprites', 'bullets', 'draw'),
+    ('draw sprites', 'aliens', 'draw'),
+    ('draw hud', 'sb', 'show_score'),
+    ('flip', None, '_flip_display'),
+    ('wait', 'clock', 'tick'),
+)
+
+# column 0 of the ring buffer is the whole frame.
+PHASES = ('frame',) + tuple(dict.fromkeys(phase for phase, _o, _m in TIMED))
+
+TEXT_COLOR = (220, 220, 220)
+BAR_COLOR = (100, 200, 255)
+OVER_BUDGET_COLOR = (255, 100, 100)
+PANEL_COLOR = (0, 0, 0, 170)
+
+
+class FrameProfiler:
+    """Time the phases of each frame and draw them over the game."""
+
+    def __init__(self, ai_game, window=120, refresh=10):
+        self.ai_game = ai_game
+        self.enabled = False
+
+        # the last window frames, in ns per phase; frames counts every
+        # frame recorded, so frames % window is the next row to write.
+        self.samples = np.zeros((window, len(PHASES)), dtype=np.int64)
+        self.frames = 0
+        self._current = [0] * len(PHASES)
+        self._installed = []
+
+        # the overlay is re-rendered every refresh frames, then just blitted.
+        self.refresh = refresh
+        self.font = pygame.font.SysFont(None, 20)
+        self._panel = None
+        self._panel_frame = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+
+    # --- switching on and off --------------------------------------------
+
+    def toggle(self):
+        """Turn the profiler on or off."""
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    def enable(self):
+        """Start timing: wrap the frame and every timed method."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._install(self.ai_game, '_run_one_frame', self._frame_wrapper())
+        for phase, owner, method in TIMED:
+            target = self.ai_game if owner is None else getattr(
+                self.ai_game, owner)
+            column = PHASES.index(phase)
+            self._install(target, method,
+                          self._phase_wrapper(column, getattr(target, method)))
+
+    def disable(self):
+        """Stop timing and put the game's own methods back."""
+        for target, method, before in reversed(self._installed):
+            if before is None:
+                delattr(target, method)
+            else:
+                setattr(target, method, before)
+        self._installed = []
+        self.enabled = False
+
+    def _install(self, target, method, wrapper):
+        # remember an instance attribute already in the way, to restore it.
+        before = vars(target).get(method)
+        setattr(target, method, wrapper)
+        self._installed.append((target, method, before))
+
+    def _phase_wrapper(self, column, method):
+        current = self._current
+        perf_counter_ns = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[column] += perf_counter_ns() - start
+        return timed
+
+    def _frame_wrapper(self):
+        # the game's own _run_one_frame, looked up on the class so the
+        # wrapper never calls itself.
+        run_one_frame = type(self.ai_game)._run_one_frame.__get__(self.ai_game)
+        perf_counter_ns = time.perf_counter_ns
+
+        def timed():
+            current = self._current
+            for column in range(len(current)):
+                current[column] = 0
+            start = perf_counter_ns()
+            run_one_frame()
+            current[0] = perf_counter_ns() - start
+            if self.enabled:
+                self.samples[self.frames % len(self.samples)] = current
+                self.frames += 1
+        return timed
+
+    # --- statistics ------------------------------------------------------
+
+    def recorded(self):
+        """The recorded rows, oldest first (at most one window)."""
+        window = len(self.samples)
+        if self.frames <= window:
+            return self.samples[:self.frames]
+        return np.roll(self.samples, -(self.frames % window), axis=0)
+
+    def means(self):
+        """Mean milliseconds per frame for each phase over the window."""
+        rows = self.recorded()
+        if not len(rows):
+            return dict.fromkeys(PHASES, 0.0)
+        return dict(zip(PHASES, (rows.mean(axis=0) / 1e6).tolist()))
+
+    def counts(self):
+        """How many of each kind of thing the game is handling."""
+        ai = self.ai_game
+        return {
+            'bullets': len(ai.bullets),
+            'aliens': len(ai.aliens),
+            'particles': ai.particles.count,
+            'stars': ai.stars.star_count,
+        }
+
+    # --- overlay ---------------------------------------------------------
+
+    def draw(self, surface=None):
+        """Draw the overlay in the bottom-left corner; return its rect."""
+        surface = surface or self.ai_game.screen
+        if (self._panel is None or
+                self.frames - self._panel_frame >= self.refresh):
+            self._panel = self._render_panel()
+            self._panel_frame = self.frames
+            self.rect = self._panel.get_rect(
+                bottomleft=(10, surface.get_height() - 10))
+        return surface.blit(self._panel, self.rect)
+
+    def _render_panel(self):
+        """Render the whole overlay into one translucent surface."""
+        budget = 1000 / self.ai_game.settings.fps
+        means = self.means()
+        frame_ms = self.recorded()[:, 0] / 1e6
+        p95 = float(np.percentile(frame_ms, 95)) if len(frame_ms) else 0.0
+        line = self.font.get_linesize()
+        label_width, bar_width, graph_height = 90, 120, 30
+
+        lines = [f"frame {means['frame']:.2f} ms  p95 {p95:.2f}  "
+                 f"fps {self.ai_game.clock.get_fps():.0f}"]
+        counts = "  ".join(f"{name} {count}"
+                           for name, count in self.counts().items())
+        width = max(label_width + bar_width + 60,
+                    *(self.font.size(text)[0] for text in lines + [counts]))
+        height = line * (len(PHASES) + 1) + graph_height + 12
+        panel = pygame.Surface((width + 12, height), pygame.SRCALPHA)
+        panel.fill(PANEL_COLOR)
+
+        panel.blit(self.font.render(lines[0], True, TEXT_COLOR), (6, 4))
+        top = 4 + line
+        self._draw_graph(panel, pygame.Rect(6, top, width, graph_height),
+                         frame_ms, budget)
+        top += graph_height + 4
+
+        # one bar per phase, full width at one frame's time budget.
+        for phase in PHASES[1:]:
+            ms = means[phase]
+            panel.blit(self.font.render(phase, True, TEXT_COLOR), (6, top))
+            bar = min(bar_width, round(bar_width * ms / budget))
+            panel.fill(BAR_COLOR, (6 + label_width, top + 3, bar, line - 6))
+            panel.blit(self.font.render(f"{ms:.2f}", True, TEXT_COLOR),
+                       (12 + label_width + bar_width, top))
+            top += line
+        panel.blit(self.font.render(counts, True, TEXT_COLOR), (6, top))
+        return panel
+
+    def _draw_graph(self, panel, rect, frame_ms, budget):
+        """Plot recent frame times, with a line at the frame budget."""
+        scale = rect.height / (2 * budget)
+        budget_y = rect.bottom - round(budget * scale)
+        pygame.draw.line(panel, OVER_BUDGET_COLOR, (rect.left, budget_y),
+                         (rect.right, budget_y))
+        if len(frame_ms) < 2:
+            return
+        step = rect.width / (len(self.samples) - 1)
+        heights = np.minimum(frame_ms * scale, rect.height)
+        points = [(rect.left + round(i * step), rect.bottom - round(h))
+                  for i, h in enumerate(heights.tolist())]
+        pygame.draw.lines(panel, BAR_COLOR, False, points)
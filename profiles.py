@@ -2,11 +2,50 @@
 
 Profiles are keyed by lower-cased name so "Ace" and "ACE" are the same
 player, while the display spelling the player typed is preserved.
+
+By default every change is saved at once. In write-behind mode a change
+only marks the store dirty; a background thread waits until changes stop
+coming for a short delay, then writes them all in one compact file write.
+flush() (and close(), which the game calls on quit and which also runs at
+process exit) writes any pending change synchronously. Either way the
+file is replaced atomically, so a crash never leaves half a file.
+
+Journal mode goes further: rewriting every player to bump one counter
+costs as much as the whole file. Instead, each batch of changes appends
+one small JSON line per changed player (their record, or a deletion) and
+one for a new active player to a journal beside the file, with a single
+fsync. Loading replays the journal over the last snapshot. Once the
+journal outgrows journal_limit it is compacted: a fresh snapshot is
+written and the journal starts over. Journal lines are cleaned up like
+stored records, and a line torn by a crash is cut off. Every snapshot
+carries a generation number and every journal starts with the one it
+extends, so a journal that a crash left behind after compaction is
+recognized as already folded in and dropped, never replayed.
+
+Several processes (the game and the admin commands, say) can share one
+file. Every read and write happens under an advisory lock on a file
+beside it, which also counts the saves. A save that finds the count or
+the files changed since this store last looked re-reads them and merges
+first. High score and best level take the maximum of both sides. Games
+played and total score add what this store recorded since it last
+synced. A player deleted on either side stays deleted.
 """
 
+import atexit
+import bisect
+import contextlib
+import copy
+import functools
+import heapq
 import json
 import os
 import re
+import threading
+
+try:
+    import fcntl
+except ImportError:     # not POSIX: saves still merge, just unlocked
+    fcntl = None
 
 MAX_NAME_LENGTH = 12
 DEFAULT_PLAYER_NAME = "Player 1"
@@ -15,6 +54,16 @@ DEFAULT_PLAYER_NAME = "Player 1"
 DIFFICULTIES = ("easy", "normal", "hard")
 DEFAULT_DIFFICULTY = "normal"
 
+# journal mode appends changes to path + JOURNAL_SUFFIX.
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_LIMIT = 64 * 1024
+# every store on a path takes the advisory lock on path + LOCK_SUFFIX;
+# the lock file counts the saves made under it.
+LOCK_SUFFIX = ".lock"
+
+# how many leaders the store keeps ranked as scores come in.
+TOP_K = 10
+
 _NAME_RE = re.compile(r"^[A-Za-z0-9 _-]+$")
 
 _EMPTY_STATS = {
@@ -54,53 +103,274 @@ def _clean_record(name, raw):
     return record
 
 
+def _record_from(raw, key=""):
+    """A cleaned-up record from outside data, or None without a usable name.
+
+    key is the name to fall back on when the record has none.
+    """
+    if not isinstance(raw, dict):
+        return None
+    name = raw.get("name")
+    try:
+        name = normalize_name(name if name else key)
+    except ProfileError:
+        return None
+    return _clean_record(name, raw)
+
+
+def _put(players, key, raw):
+    """Store a cleaned-up record, unless it has no usable name."""
+    record = _record_from(raw, key)
+    if record is not None:
+        players[record["name"].lower()] = record
+
+
+def _fold_record(record, other):
+    """Add another record's games to record, as record_game would."""
+    for key in ("high_score", "best_level"):
+        record[key] = max(record[key], other[key])
+    for key in ("games_played", "total_score"):
+        record[key] += other[key]
+
+
+def _merge_record(theirs, ours, base):
+    """Combine two processes' versions of one player's record.
+
+    base is the record both started from (None if both created it).
+    Bests take the maximum and counters add up both sides' games.
+    """
+    base = base or _EMPTY_STATS
+    record = dict(theirs)
+    for key in ("high_score", "best_level"):
+        record[key] = max(theirs[key], ours[key])
+    for key in ("games_played", "total_score"):
+        record[key] = theirs[key] + max(ours[key] - base[key], 0)
+    if ours["difficulty"] != base.get("difficulty"):
+        record["difficulty"] = ours["difficulty"]
+    return record
+
+
+def _mutation(method):
+    """Run a store method under the store's lock."""
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return locked
+
+
 class ProfileStore:
     """Load, mutate, and persist the set of player profiles."""
 
-    def __init__(self, path):
+    def __init__(self, path, write_behind=False, delay=0.5, journal=False,
+                 journal_limit=JOURNAL_LIMIT):
         self.path = path
+        self.journal_path = path + JOURNAL_SUFFIX
         self._players = {}
         self._active_key = None
+        self._lock_file = None
+        self._generation = 0
         self._load()
 
+        # the best TOP_K players as sorted (-high_score, key) pairs, and a
+        # counter that goes up with every change, for caching views.
+        self._top = []
+        self._rebuild_top()
+        self.version = 0
+
+        # write-behind state; the lock keeps the writer's snapshot from
+        # seeing a half-made change. Journal mode always writes behind.
+        self.journal = journal
+        self.journal_limit = journal_limit
+        self.write_behind = write_behind or journal
+        self.delay = delay
+        self.writes = 0
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._wake = threading.Event()
+        self._closing = False
+        self._thread = None
+
+        # players changed since the last write.
+        self._touched = set()
+
     # --- persistence -----------------------------------------------------
 
     def _load(self):
+        with self._file_lock():
+            self._players, active = self._read_disk()
+            self._set_stamp()
+        if isinstance(active, str) and active.lower() in self._players:
+            self._active_key = active.lower()
+        # what the disk held for each player when we last read or wrote it.
+        self._base = copy.deepcopy(self._players)
+        self._base_active = self._active_key
+
+    def _read_disk(self):
+        """Return (players, active name) as saved, journal replayed."""
         try:
             with open(self.path, 'r') as f:
                 data = json.load(f)
         except (OSError, ValueError):
-            return
+            data = None
         if not isinstance(data, dict):
-            return
-
-        players = data.get("players")
-        if isinstance(players, dict):
-            for key, raw in players.items():
-                if not isinstance(raw, dict):
-                    continue
-                name = raw.get("name")
+            data = {}
+
+        players = {}
+        stored = data.get("players")
+        if isinstance(stored, dict):
+            for key, raw in stored.items():
+                _put(players, key, raw)
+        generation = data.get("journal")
+        self._generation = generation if isinstance(generation, int) else 0
+        return players, self._replay_journal(players, data.get("active"))
+
+    def _replay_journal(self, players, active):
+        """Apply the journal's changes; return the active player's name.
+
+        Called with the file lock held: a last line torn by a crash is cut
+        off, so the next batch starts on a line of its own, and a journal
+        from before the snapshot is removed.
+        """
+        try:
+            f = open(self.journal_path, 'rb')
+        except OSError:
+            return active
+        end = 0
+        with f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    self._truncate_journal(end)
+                    break
+                first = end == 0
+                end += len(line)
                 try:
-                    name = normalize_name(name if name else key)
-                except ProfileError:
+                    entry = json.loads(line)
+                except ValueError:
                     continue
-                self._players[name.lower()] = _clean_record(name, raw)
+                if not isinstance(entry, dict):
+                    continue
+                if first and entry.get("journal", 0) != self._generation:
+                    # compaction wrote the snapshot but crashed before it
+                    # could remove the journal it folded in.
+                    self._remove_journal()
+                    return active
+                if "put" in entry:
+                    _put(players, "", entry["put"])
+                elif "del" in entry:
+                    players.pop(str(entry["del"]).lower(), None)
+                elif "active" in entry:
+                    active = entry["active"]
+        return active
+
+    def _remove_journal(self):
+        try:
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        except OSError as e:
+            print(f"Warning: could not remove the profiles journal ({e}).")
 
-        active = data.get("active")
-        if isinstance(active, str) and active.lower() in self._players:
-            self._active_key = active.lower()
+    def _truncate_journal(self, size):
+        try:
+            os.truncate(self.journal_path, size)
+        except OSError as e:
+            print(f"Warning: could not repair the profiles journal ({e}).")
+
+    def snapshot(self):
+        """Return a copy of everything save() writes."""
+        with self._lock:
+            return {
+                "active": self.active,
+                "players": copy.deepcopy(self._players),
+            }
 
     def save(self):
-        """Write profiles to disk atomically; never raise on I/O failure."""
-        data = {
-            "active": self.active,
-            "players": self._players,
-        }
+        """Persist the profiles: now, or soon in write-behind mode."""
+        # every change ends in a save.
+        self.version += 1
+        if not self.write_behind:
+            with self._file_lock():
+                self._sync()
+                data = self.snapshot()
+                changes = self._take_changes()
+                self._finish_write(changes, self._write(data, indent=2))
+            return
+        with self._lock:
+            self._dirty = True
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._write_behind,
+                                            name="profiles", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+        self._wake.set()
+
+    def flush(self):
+        """Write any pending write-behind change now."""
+        with self._write_lock:
+            if not self._dirty:
+                return
+            with self._file_lock():
+                with self._lock:
+                    self._dirty = False
+                    self._sync()
+                    changes = self._take_changes()
+                    lines = (self._journal_lines(changes) if self.journal
+                             else [])
+                    size = sum(len(line) for line in lines)
+                    # a snapshot already holds everything the lines say.
+                    compact = (not self.journal or
+                               not os.path.exists(self.path) or
+                               self._journal_size + size > self.journal_limit)
+                    data = self.snapshot() if compact else None
+                # other processes wait for the disk; this one's changes
+                # can go on meanwhile.
+                if compact:
+                    ok = self._write(data)
+                else:
+                    ok = self._append(lines)
+                with self._lock:
+                    self._finish_write(changes, ok)
+
+    def close(self):
+        """Flush pending changes and stop the write-behind thread."""
+        if self._thread is not None:
+            self._closing = True
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+            self._closing = False
+            atexit.unregister(self.close)
+        self.flush()
+
+    def _write_behind(self):
+        while not self._closing:
+            self._wake.wait()
+            # debounce: keep waiting while changes keep coming.
+            while not self._closing:
+                self._wake.clear()
+                if not self._wake.wait(self.delay):
+                    break
+            self.flush()
+
+    def _write(self, data, indent=None):
+        """Write data to disk atomically; return whether it worked.
+
+        Never raises on I/O failure.
+        """
         tmp_path = self.path + '.tmp'
+        separators = None if indent else (',', ':')
+        # the snapshot includes everything journaled so far; a new
+        # generation makes sure the old journal is never replayed over it.
+        data = dict(data, journal=self._generation + 1)
         try:
             with open(tmp_path, 'w') as f:
-                json.dump(data, f, indent=2)
+                json.dump(data, f, indent=indent, separators=separators)
             os.replace(tmp_path, self.path)
+            self._generation += 1
+            self.writes += 1
+            self._remove_journal()
+            self._count_save()
         except OSError as e:
             print(f"Warning: could not save profiles ({e}).")
             try:
@@ -108,7 +378,162 @@ class ProfileStore:
                     os.remove(tmp_path)
             except OSError:
                 pass
-
+            self._set_stamp()
+            return False
+        self._set_stamp()
+        return True
+
+    def _journal_lines(self, changes):
+        """One journal line per player changed since the last flush."""
+        lines = []
+        for key in sorted(changes['players']):
+            record = changes['players'][key]
+            entry = {"put": record} if record else {"del": key}
+            lines.append(json.dumps(entry, separators=(',', ':')) + "\n")
+        if changes['active'] != self._base_active:
+            lines.append(json.dumps({"active": self.active}) + "\n")
+        return lines
+
+    def _append(self, lines):
+        """Append lines to the journal and fsync them, as one batch.
+
+        Returns whether it worked; never raises on I/O failure.
+        """
+        try:
+            with open(self.journal_path, 'a') as f:
+                if f.tell() == 0:
+                    # the snapshot generation this journal extends.
+                    f.write(json.dumps({"journal": self._generation}) + "\n")
+                f.write("".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            self.writes += 1
+            self._count_save()
+        except OSError as e:
+            print(f"Warning: could not save profiles ({e}).")
+            self._set_stamp()
+            return False
+        self._set_stamp()
+        return True
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Hold the lock every store on this path takes to read or write."""
+        try:
+            lock = open(self.path + LOCK_SUFFIX, 'a+')
+        except OSError:
+            lock = None   # no lock here, but saves still merge
+        try:
+            if lock and fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self._lock_file = lock
+            yield
+        finally:
+            self._lock_file = None
+            if lock:
+                lock.close()   # releases the lock too
+
+    def _saves(self):
+        """How many saves the lock file has counted (None without one)."""
+        lock = self._lock_file
+        if lock is None:
+            return None
+        lock.seek(0)
+        try:
+            return int(lock.read() or 0)
+        except ValueError:
+            return 0
+
+    def _count_save(self):
+        lock = self._lock_file
+        if lock is not None:
+            saves = self._saves() + 1
+            lock.truncate(0)
+            lock.write(str(saves))
+            lock.flush()
+
+    def _stamp(self):
+        """Identify what is on disk: the save count, then the files' stat.
+
+        File times can be too coarse to tell two quick saves apart; the
+        count cannot, but only stores that take the lock keep it.
+        """
+        stamp = [self._saves()]
+        for path in (self.path, self.journal_path):
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_ino, st.st_mtime_ns, st.st_size))
+        return tuple(stamp)
+
+    def _set_stamp(self):
+        self._disk_stamp = self._stamp()
+        journal = self._disk_stamp[2]
+        self._journal_size = journal[2] if journal else 0
+
+    def _sync(self):
+        """Merge in whatever other processes saved since we last looked.
+
+        A player deleted on either side stays deleted; for the rest see
+        _merge_record. Called with the file lock held.
+        """
+        if self._stamp() == self._disk_stamp:
+            return
+        players, active = self._read_disk()
+        base = self._base
+        merged = {}
+        for key, theirs in players.items():
+            ours = self._players.get(key)
+            if ours is not None:
+                merged[key] = _merge_record(theirs, ours, base.get(key))
+            elif key not in base:
+                merged[key] = dict(theirs)   # created there
+        for key, ours in self._players.items():
+            if key not in players and key not in base:
+                merged[key] = ours     # created here
+
+        # each process keeps its own active player unless it was deleted;
+        # the file names the one the last save had.
+        active = active.lower() if isinstance(active, str) else None
+        if self._active_key not in merged:
+            if active in merged:
+                self._active_key = active
+            else:
+                self._active_key = min(merged) if merged else None
+        self._players = merged
+        self._base = players
+        self._base_active = active
+        self._set_stamp()
+        self._rebuild_top()
+        self.version += 1
+
+    def _take_changes(self):
+        """Hand the changes since the last write over to a writer."""
+        changes = {
+            'players': {key: dict(self._players[key])
+                        if key in self._players else None
+                        for key in self._touched},
+            'active': self._active_key,
+        }
+        self._touched = set()
+        return changes
+
+    def _finish_write(self, changes, ok):
+        """Note what reached the disk, or keep it pending if nothing did."""
+        if not ok:
+            self._touched.update(changes['players'])
+            self._dirty = True
+            return
+        for key, record in changes['players'].items():
+            if record:
+                self._base[key] = record
+            else:
+                self._base.pop(key, None)
+        self._base_active = changes['active']
+
+    @_mutation
     def ensure_default(self, legacy_high_score_file=None):
         """Create a starter profile on first run, importing any old score."""
         if self._players:
@@ -120,6 +545,8 @@ class ProfileStore:
                     self._active_record()["high_score"] = max(int(f.read()), 0)
             except (OSError, ValueError):
                 pass
+            self._place(self._active_key)
+            self._touched.add(self._active_key)
         self.save()
 
     # --- queries ---------------------------------------------------------
@@ -150,14 +577,28 @@ class ProfileStore:
         """Return a copy of a player's stats, or raise ProfileError."""
         return dict(self._require(name))
 
+    def export_records(self):
+        """Yield a copy of every player's record, in name order."""
+        with self._lock:
+            keys = sorted(self._players)
+        for key in keys:
+            with self._lock:
+                record = self._players.get(key)
+                if record is not None:
+                    yield dict(record)
+
     def leaderboard(self, limit=5):
         """Top (name, high_score) pairs, highest first, name breaking ties."""
-        ranked = sorted(self._players.values(),
-                        key=lambda r: (-r["high_score"], r["name"].lower()))
-        return [(r["name"], r["high_score"]) for r in ranked[:limit]]
+        if limit <= TOP_K:
+            ranked = self._top[:limit]
+        else:
+            ranked = sorted((-r["high_score"], key)
+                            for key, r in self._players.items())[:limit]
+        return [(self._players[key]["name"], -score) for score, key in ranked]
 
     # --- mutations -------------------------------------------------------
 
+    @_mutation
     def create(self, name):
         """Create a player, make them active, and return the stored name."""
         name = normalize_name(name)
@@ -165,9 +606,12 @@ class ProfileStore:
             raise ProfileError(f"'{name}' already exists.")
         self._players[name.lower()] = _clean_record(name, None)
         self._active_key = name.lower()
+        self._place(self._active_key)
+        self._touched.add(self._active_key)
         self.save()
         return name
 
+    @_mutation
     def select(self, name):
         """Make an existing player active and return their name."""
         record = self._require(name)
@@ -175,6 +619,7 @@ class ProfileStore:
         self.save()
         return record["name"]
 
+    @_mutation
     def select_next(self):
         """Activate the next player in name order; return them, or None."""
         keys = sorted(self._players)
@@ -188,6 +633,7 @@ class ProfileStore:
         self.save()
         return self.active
 
+    @_mutation
     def delete(self, name):
         """Delete a player, activating another one if the active one went."""
         record = self._require(name)
@@ -196,8 +642,41 @@ class ProfileStore:
         if self._active_key == key:
             remaining = sorted(self._players)
             self._active_key = remaining[0] if remaining else None
+        if any(k == key for _score, k in self._top):
+            self._rebuild_top()
+        self._touched.add(key)
         self.save()
 
+    @_mutation
+    def import_records(self, records):
+        """Merge raw player records in and save once, at the end.
+
+        Each record is cleaned up like a stored one; one without a usable
+        name is skipped. A player that already exists gets the record's
+        games added as record_game would, and keeps their difficulty.
+        Returns (added, merged, skipped) counts.
+        """
+        added = merged = skipped = 0
+        for raw in records:
+            record = _record_from(raw)
+            if record is None:
+                skipped += 1
+                continue
+            key = record["name"].lower()
+            mine = self._players.get(key)
+            if mine is None:
+                self._players[key] = record
+                added += 1
+            else:
+                _fold_record(mine, record)
+                merged += 1
+            self._touched.add(key)
+        if added or merged:
+            self._rebuild_top()
+            self.save()
+        return added, merged, skipped
+
+    @_mutation
     def set_difficulty(self, difficulty):
         """Store a difficulty for the active player and return it."""
         if difficulty not in DIFFICULTIES:
@@ -205,6 +684,7 @@ class ProfileStore:
         record = self._active_record()
         if record:
             record["difficulty"] = difficulty
+            self._touched.add(self._active_key)
             self.save()
         return difficulty
 
@@ -213,6 +693,7 @@ class ProfileStore:
         index = DIFFICULTIES.index(self.difficulty)
         return self.set_difficulty(DIFFICULTIES[(index + 1) % len(DIFFICULTIES)])
 
+    @_mutation
     def record_game(self, score, level):
         """Fold a finished game's result into the active player's stats."""
         record = self._active_record()
@@ -222,10 +703,32 @@ class ProfileStore:
         record["best_level"] = max(record["best_level"], int(level))
         record["games_played"] += 1
         record["total_score"] += max(int(score), 0)
+        self._place(self._active_key)
+        self._touched.add(self._active_key)
         self.save()
 
     # --- helpers ---------------------------------------------------------
 
+    def _rebuild_top(self):
+        """Rank everyone; only needed when a leader is deleted."""
+        self._top = heapq.nsmallest(
+            TOP_K, ((-r["high_score"], key) for key, r in self._players.items()))
+
+    def _place(self, key):
+        """Move a player to their place in the top K, if they have one.
+
+        High scores never go down, so a leader never drops out by this.
+        """
+        top = self._top
+        for i, (_score, k) in enumerate(top):
+            if k == key:
+                del top[i]
+                break
+        entry = (-self._players[key]["high_score"], key)
+        if len(top) < TOP_K or entry < top[-1]:
+            bisect.insort(top, entry)
+            del top[TOP_K:]
+
     def _active_record(self):
         return self._players.get(self._active_key) if self._active_key else None
 
@@ -0,0 +1,146 @@
+"""Dirty-rectangle rendering: repaint and flip only what changed.
+
+The normal renderer (AlienInvasion._update_screen) clears and redraws the
+whole screen and flips it every frame. On a large fullscreen software
+surface that dominates the frame, even when only a few sprites moved.
+DirtyRenderer keeps a background image, restores just the areas sprites
+covered last frame, redraws the sprites, and hands only those rects to
+pygame.display.update.
+
+Moving things (ship, bullets, aliens, explosions, the profiler overlay)
+are repainted every frame. Overlays (HUD text and icons, Play button,
+idle-screen panel, pause text) are only repainted when their image or
+position changed, or when something dirty overlaps them.
+
+The starfield is baked into the background and does not scroll in this
+mode: scrolling stars would make the whole screen dirty every frame.
+"""
+
+import pygame
+
+
+class DirtyRenderer:
+    """Draw a game frame, updating only the changed parts of the display."""
+
+    def __init__(self, ai_game):
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.screen_rect = self.screen.get_rect()
+
+        self.background = pygame.Surface(self.screen.get_size()).convert()
+        self.background.fill(ai_game.settings.bg_color)
+        ai_game.stars.draw(self.background)
+
+        # what is on the display now: rects covered by moving things, and
+        # the signature and rect of each overlay.
+        self._moving = []
+        self._overlays = {}
+        self._first_frame = True
+
+        # per-frame report: how many pixels (and rects) were updated.
+        self.dirty_area = 0
+        self.dirty_rects = 0
+
+    def draw_frame(self):
+        """Repaint the changed regions and push them to the display."""
+        layers = self._layers()
+        overlays = {layer[1]: layer for layer in layers
+                    if layer[0] == 'overlay'}
+
+        # Holes to restore from the background: whatever moved last frame,
+        # plus the old and new places of overlays that changed or went away.
+        if self._first_frame:
+            dirty = [self.screen_rect.copy()]
+        else:
+            dirty = list(self._moving)
+        for key, (signature, rect) in self._overlays.items():
+            layer = overlays.get(key)
+            if layer is None or layer[2] is not signature or layer[3] != rect:
+                dirty.append(rect)
+        redraw = set()
+        for key, layer in overlays.items():
+            before = self._overlays.get(key)
+            if (before is None or before[0] is not layer[2] or
+                    before[1] != layer[3]):
+                redraw.add(key)
+                dirty.append(layer[3].copy())
+
+        # An overlay partly inside a hole is repainted whole, so its hole
+        # grows to cover it (which may reach further overlays).
+        grew = True
+        while grew:
+            grew = False
+            for key, layer in overlays.items():
+                if key not in redraw and layer[3].collidelist(dirty) != -1:
+                    redraw.add(key)
+                    dirty.append(layer[3].copy())
+                    grew = True
+        for rect in dirty:
+            self.screen.blit(self.background, rect, rect)
+
+        moving = []
+        shown = {}
+        for layer in layers:
+            if layer[0] == 'moving':
+                rects = [rect for rect in layer[1]() if rect]
+                moving.extend(rects)
+                dirty.extend(rects)
+                continue
+
+            # overlays sit on top of anything drawn into them this frame.
+            _kind, key, signature, rect, draw = layer
+            shown[key] = (signature, rect.copy())
+            if key in redraw or rect.collidelist(moving) != -1:
+                draw()
+                dirty.append(rect.copy())
+
+        self._moving = moving
+        self._overlays = shown
+        self._first_frame = False
+
+        dirty = [rect.clip(self.screen_rect) for rect in dirty]
+        dirty = [rect for rect in dirty if rect]
+        self.dirty_rects = len(dirty)
+        self.dirty_area = sum(rect.w * rect.h for rect in dirty)
+        pygame.display.update(dirty)
+
+    def _layers(self):
+        """Everything on screen this frame, bottom to top.
+
+        Moving layers are ('moving', draw) where draw returns the rects it
+        covered; overlays are ('overlay', key, signature, rect, draw), where
+        the signature is the image drawn, so a re-rendered image counts as
+        a change.
+        """
+        ai = self.ai_game
+        screen = self.screen
+        layers = [
+            ('moving', lambda: [screen.blit(ai.ship.image, ai.ship.rect)]),
+            ('moving', lambda: ai.bullets.draw(screen)),
+            ('moving', lambda: ai.aliens.draw(screen)),
+        ]
+
+        for key, image, rect in ai.sb.hud_items():
+            layers.append(('overlay', key, image, rect,
+                           lambda image=image, rect=rect: screen.blit(image, rect)))
+
+        if not ai.stats.game_active:
+            button = ai.play_button
+            layers.append(('overlay', 'play_button', button.msg_image,
+                           button.rect, button.draw_button))
+            # the panel keeps its image until what it shows changes.
+            image, rect = ai.profile_panel.render()
+            layers.append(('overlay', 'profile_panel', image, rect,
+                           lambda: screen.blit(image, rect)))
+
+        layers.append(('moving', lambda: [ai.particles.draw(screen)]))
+
+        if ai.game_paused:
+            layers.append(('overlay', 'pause', ai.pause_text,
+                           ai.pause_text_rect,
+                           lambda: screen.blit(ai.pause_text, ai.pause_text_rect)))
+
+        # the profiler overlay changes every frame, so it always repaints.
+        if ai.profiler.enabled:
+            layers.append(('moving', lambda: [ai.profiler.draw(screen)]))
+        return layers
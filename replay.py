@@ -0,0 +1,232 @@
+"""Record a session's input and replay it headlessly, exactly.
+
+Gameplay depends on three things besides the code: the session seed, the
+player profiles the session started with, and what happened each frame,
+namely the clock time and the input events _check_events handled. With
+--record FILE, a Recorder stands in for the game's clock and event source
+and writes all of that to a gzipped JSON-lines file:
+
+    {"version": 1, "seed": ..., "size": [w, h], "fps": 60, "start": ms,
+     "profiles": {...}}                     header
+    [dt]  or  [dt, event, event, ...]       one line per frame
+    {"result": {...}}                       final stats, written on quit
+
+Clock time is latched once per frame, so every timer in a frame sees the
+same millisecond. --replay FILE feeds the recorded frames back through
+Replay on the dummy video driver and checks the score, level and ship
+losses against the recorded result.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import tempfile
+
+import pygame
+
+REPLAY_VERSION = 1
+
+# event type -> compact tag used in the file.
+_TAGS = {pygame.KEYDOWN: 'd', pygame.KEYUP: 'u',
+         pygame.MOUSEBUTTONDOWN: 'm', pygame.QUIT: 'q'}
+
+
+class ReplayError(ValueError):
+    """A replay file is missing, unreadable, or from another version."""
+
+
+def encode_event(event):
+    """Return the compact list form of an event the game handles, or None."""
+    tag = _TAGS.get(event.type)
+    if tag == 'd':
+        return [tag, event.key, getattr(event, 'unicode', '')]
+    if tag == 'u':
+        return [tag, event.key]
+    if tag == 'm':
+        return [tag, *event.pos]
+    if tag == 'q':
+        return [tag]
+    return None
+
+
+def decode_event(data):
+    """Rebuild a pygame event from its compact list form."""
+    tag = data[0]
+    if tag == 'd':
+        return pygame.event.Event(pygame.KEYDOWN, key=data[1], unicode=data[2])
+    if tag == 'u':
+        return pygame.event.Event(pygame.KEYUP, key=data[1])
+    if tag == 'm':
+        return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1,
+                                  pos=(data[1], data[2]))
+    return pygame.event.Event(pygame.QUIT)
+
+
+def game_result(ai_game):
+    """The stats a replay has to reproduce."""
+    stats = ai_game.stats
+    return {
+        'score': stats.score,
+        'level': stats.level,
+        'ships_left': stats.ships_left,
+        'ships_lost': stats.ships_lost,
+        'high_score': stats.high_score,
+        'game_active': stats.game_active,
+    }
+
+
+class Recorder:
+    """Stand in for the game's clock and event source, writing both down."""
+
+    def __init__(self, ai_game, path):
+        self.ai_game = ai_game
+        self.clock = ai_game.clock
+        self.path = path
+
+        # this frame's latched time, and the events handled so far in it.
+        self._now = self.clock.ticks()
+        self._last = self._now
+        self._events = []
+
+        self._file = gzip.open(path, 'wt')
+        header = {
+            'version': REPLAY_VERSION,
+            'seed': ai_game.rng.seed,
+            'size': list(ai_game.screen.get_size()),
+            'fps': ai_game.settings.fps,
+            'start': self._now,
+            'profiles': ai_game.profiles.snapshot(),
+        }
+        self._file.write(json.dumps(header) + "\n")
+
+        ai_game.clock = self
+        ai_game.event_source = self
+
+    # --- clock -----------------------------------------------------------
+
+    def ticks(self):
+        """The time this frame started, in milliseconds."""
+        return self._now
+
+    def tick(self, fps=None):
+        """End the frame: write it down, then let the real clock tick."""
+        self._write_frame()
+        elapsed = self.clock.tick(fps)
+        self._now = self.clock.ticks()
+        return elapsed
+
+    def get_fps(self):
+        return self.clock.get_fps()
+
+    # --- events ----------------------------------------------------------
+
+    def get(self):
+        """Return pending events, noting the ones the game handles."""
+        events = pygame.event.get()
+        for event in events:
+            data = encode_event(event)
+            if data is not None:
+                self._events.append(data)
+        return events
+
+    def _write_frame(self):
+        line = [self._now - self._last] + self._events
+        self._file.write(json.dumps(line, separators=(',', ':')) + "\n")
+        self._last = self._now
+        self._events = []
+
+    def close(self):
+        """Write the unfinished frame and the final stats, then close."""
+        if self._file.closed:
+            return
+        self._write_frame()
+        self._file.write(json.dumps({'result': game_result(self.ai_game)})
+                         + "\n")
+        self._file.close()
+
+
+def load_replay(path):
+    """Read a replay file into (header, frames, result or None)."""
+    try:
+        with gzip.open(path, 'rt') as f:
+            lines = [json.loads(line) for line in f]
+    except (OSError, EOFError, ValueError) as e:
+        raise ReplayError(f"cannot read replay {path}: {e}") from e
+    if not lines or not isinstance(lines[0], dict):
+        raise ReplayError(f"{path} is not a replay file")
+    header = lines[0]
+    if header.get('version') != REPLAY_VERSION:
+        raise ReplayError(f"unsupported replay version {header.get('version')}")
+    result = None
+    if len(lines) > 1 and isinstance(lines[-1], dict):
+        result = lines.pop()['result']
+    return header, lines[1:], result
+
+
+class Replay:
+    """Stand in for the game's clock and event source, from a recording."""
+
+    def __init__(self, header, frames):
+        self.frames = frames
+        self.frame = 0
+        # the first frame starts at the header's time; each later frame
+        # line holds the step from the one before.
+        self._now = header['start']
+
+    @property
+    def done(self):
+        """True once every recorded frame has been played."""
+        return self.frame >= len(self.frames)
+
+    def ticks(self):
+        return self._now
+
+    def tick(self, fps=None):
+        """Move on to the next recorded frame, without sleeping."""
+        self.frame += 1
+        if self.done:
+            return 0
+        dt = self.frames[self.frame][0]
+        self._now += dt
+        return dt
+
+    def get_fps(self):
+        return 0.0
+
+    def get(self):
+        """The events handled in the current frame."""
+        if self.done:
+            return []
+        return [decode_event(data) for data in self.frames[self.frame][1:]]
+
+
+def run_replay(path):
+    """Replay a recording headlessly; return (recorded, replayed) results.
+
+    Assumes SDL is set up for headless use (the dummy video driver).
+    """
+    from game import AlienInvasion
+    from profiles import ProfileStore
+
+    header, frames, recorded = load_replay(path)
+    replay = Replay(header, frames)
+    options = argparse.Namespace(windowed=tuple(header['size']),
+                                 seed=header['seed'])
+    with tempfile.TemporaryDirectory() as tmp:
+        # start from the recorded profiles, without touching the real ones.
+        profiles_path = os.path.join(tmp, "profiles.json")
+        with open(profiles_path, 'w') as f:
+            json.dump(header['profiles'], f)
+        ai = AlienInvasion(options, clock=replay,
+                           profiles=ProfileStore(profiles_path))
+        ai.event_source = replay
+        try:
+            while not replay.done:
+                ai._run_one_frame()
+        except SystemExit:
+            # the recording ended with the player quitting.
+            pass
+        replayed = game_result(ai)
+        pygame.quit()
+    return recorded, replayed
@@ -88,10 +88,19 @@ class Scoreboard:
         self.player_rect.left = 10
         self.player_rect.top = 80
 
+    def hud_items(self):
+        """Return (key, image, rect) for everything the scoreboard draws."""
+        items = [
+            ('score', self.score_image, self.score_rect),
+            ('high_score', self.high_score_image, self.high_score_rect),
+            ('level', self.level_image, self.level_rect),
+            ('player', self.player_image, self.player_rect),
+        ]
+        for number, ship in enumerate(self.ships):
+            items.append((('ship', number), ship.image, ship.rect))
+        return items
+
     def show_score(self):
         """Draw score to the screen."""
-        self.screen.blit(self.score_image, self.score_rect)
-        self.screen.blit(self.high_score_image, self.high_score_rect)
-        self.screen.blit(self.level_image, self.level_rect)
-        self.screen.blit(self.player_image, self.player_rect)
-        self.ships.draw(self.screen)
+        self.screen.blits([(image, rect) for _key, image, rect
+                           in self.hud_items()], doreturn=False)
@@ -52,7 +52,8 @@ class Settings:
         self.bullet_trail_color = (255, 50, 50)
         self.bullets_allowed = 30    # numbers of bullets allowed on screen
 
-        # star background settings
+        # star background settings: stars per screen, baked into layers
+        # once, so a higher count doesn't slow down the frame.
         self.star_count = 100
 
         # alien settings
@@ -0,0 +1,280 @@
+"""Self-play tournaments: many seeded headless games, summarized per difficulty.
+
+Usage:
+    python -m simulate                              # 100 games per difficulty
+    python -m simulate --games 1000 --difficulties normal hard
+    python -m simulate --policy random --workers 4 --output report.json
+    python -m simulate --policy mybots:sniper       # any module:function
+
+Games are spread over a process pool. Each worker builds one headless
+AlienInvasionEnv when it starts, so images and fonts are loaded once per
+worker, and then plays the games it is handed one after another. Workers
+share nothing, so throughput grows with the number of cores.
+
+A policy is a function policy(game, rng) -> action, called every frame
+with the AlienInvasion instance and a NumPy Generator seeded for the game;
+actions are the ones env.py defines. Game i of every difficulty uses seed
+seed + i, so difficulties are compared on the same games. The report
+holds score, level and survival-time distributions per difficulty.
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from env import ACTIONS, FIRE, LEFT_FIRE, NOOP, RIGHT_FIRE, AlienInvasionEnv
+from settings import DIFFICULTY_PRESETS
+
+DEFAULT_GAMES = 100
+# five minutes of play at 60 fps; longer games are cut off (truncated).
+DEFAULT_MAX_FRAMES = 5 * 60 * 60
+PERCENTILES = (10, 50, 90)
+
+
+# --- policies ------------------------------------------------------------
+
+def idle(game, rng):
+    """Never move or shoot."""
+    return NOOP
+
+
+def random_policy(game, rng):
+    """A uniformly random action every frame."""
+    return int(rng.integers(len(ACTIONS)))
+
+
+def autopilot(game, rng, epsilon=0.05):
+    """Hold fire and stay under the nearest alien of the fleet's bottom row.
+
+    The game itself has no randomness, so an epsilon share of frames get a
+    random action instead; that is what makes the seeded games differ.
+    """
+    if rng.random() < epsilon:
+        return random_policy(game, rng)
+    fleet = game.aliens
+    count = fleet._count
+    alive = fleet.alive[:count]
+    if not alive.any():
+        return FIRE
+    xs = fleet.x[:count][alive]
+    ys = fleet.y[:count][alive]
+    bottom_row = xs[ys >= ys.max() - fleet.alien_height / 2]
+    centers = bottom_row + fleet.alien_width / 2
+    ship_x = game.ship.rect.centerx
+    target = centers[np.abs(centers - ship_x).argmin()]
+    if target < ship_x - game.settings.ship_speed:
+        return LEFT_FIRE
+    if target > ship_x + game.settings.ship_speed:
+        return RIGHT_FIRE
+    return FIRE
+
+
+POLICIES = {
+    'autopilot': autopilot,
+    'random': random_policy,
+    'idle': idle,
+}
+
+
+def resolve_policy(name):
+    """Return a built-in policy, or import one named 'module:function'."""
+    if name in POLICIES:
+        return POLICIES[name]
+    module, _sep, attr = name.partition(':')
+    if not attr:
+        raise ValueError(f"unknown policy {name!r}; use one of "
+                         f"{', '.join(POLICIES)} or module:function")
+    return getattr(importlib.import_module(module), attr)
+
+
+# --- playing (worker side) -----------------------------------------------
+
+# the worker's environment and policy, built once by _init_worker.
+_worker = None
+
+
+def _init_worker(policy, max_frames):
+    global _worker
+    if multiprocessing.parent_process() is not None:
+        # a pool worker: keep the game's warnings out of the report.
+        sys.stdout = sys.stderr
+    env = AlienInvasionEnv(max_steps=max_frames)
+    _worker = (env, resolve_policy(policy))
+
+
+def play_game(task):
+    """Play a (difficulty, seed[, params]) game to the end; return its result.
+
+    params, if given, maps settings such as alien_speed to the values to
+    start the game with instead of the preset's.
+    """
+    difficulty, seed, *params = task
+    env, policy = _worker
+    game = env.game
+    game.profiles.set_difficulty(difficulty)
+    env.reset(seed)
+    for name, value in (params[0] if params else {}).items():
+        setattr(game.settings, name, value)
+    rng = np.random.default_rng(seed)
+    done = False
+    while not done:
+        _reward, done, info = env._advance(policy(game, rng))
+    return {
+        'difficulty': difficulty,
+        'seed': seed,
+        'score': info['score'],
+        'level': info['level'],
+        'frames': info['steps'],
+        'truncated': info['truncated'],
+    }
+
+
+# --- the tournament ------------------------------------------------------
+
+@contextlib.contextmanager
+def game_runner(policy='autopilot', workers=None,
+                max_frames=DEFAULT_MAX_FRAMES):
+    """Yield play(tasks) -> results, playing the tasks on a worker pool.
+
+    The pool lives as long as the with block, so several batches can be
+    played without starting new workers. workers=1 plays in this process.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(policy, max_frames)
+        yield lambda tasks: [play_game(task) for task in tasks]
+        return
+
+    # fresh interpreters: no pygame state is inherited from this one.
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(policy, max_frames)) as pool:
+        def play(tasks):
+            chunksize = max(1, len(tasks) // (workers * 8))
+            return list(pool.map(play_game, tasks, chunksize=chunksize))
+        yield play
+
+
+def run(games=DEFAULT_GAMES, difficulties=None, policy='autopilot',
+        workers=None, max_frames=DEFAULT_MAX_FRAMES, seed=0):
+    """Play games per difficulty on workers processes; return the report.
+
+    workers=1 plays every game in this process.
+    """
+    difficulties = list(difficulties or DIFFICULTY_PRESETS)
+    resolve_policy(policy)   # fail here, not in every worker
+    workers = workers or os.cpu_count() or 1
+    # interleave difficulties so every worker gets a similar mix.
+    tasks = [(difficulty, seed + i) for i in range(games)
+             for difficulty in difficulties]
+
+    started = time.perf_counter()
+    with game_runner(policy, workers, max_frames) as play:
+        results = play(tasks)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'meta': {
+            'policy': policy,
+            'games_per_difficulty': games,
+            'max_frames': max_frames,
+            'seed': seed,
+            'workers': workers,
+            'elapsed_s': round(elapsed, 2),
+            'games_per_s': round(len(tasks) / elapsed, 2),
+        },
+        'difficulties': {
+            difficulty: summarize([r for r in results
+                                   if r['difficulty'] == difficulty])
+            for difficulty in difficulties
+        },
+    }
+
+
+def distribution(values):
+    """Mean, percentiles, min and max of a list of numbers."""
+    values = np.asarray(values, dtype=np.float64)
+    summary = {'mean': round(float(values.mean()), 2)}
+    for p, value in zip(PERCENTILES,
+                        np.percentile(values, PERCENTILES).tolist()):
+        summary[f"p{p}"] = round(value, 2)
+    summary['min'] = round(float(values.min()), 2)
+    summary['max'] = round(float(values.max()), 2)
+    return summary
+
+
+def summarize(results, fps=60):
+    """Summarize the results of one difficulty's games."""
+    if not results:
+        return {'games': 0}
+    levels, counts = np.unique([r['level'] for r in results],
+                               return_counts=True)
+    return {
+        'games': len(results),
+        'truncated': sum(r['truncated'] for r in results),
+        'score': distribution([r['score'] for r in results]),
+        'level': distribution([r['level'] for r in results]),
+        'levels_reached': {str(level): int(count) for level, count
+                           in zip(levels.tolist(), counts.tolist())},
+        'survival_s': distribution([r['frames'] / fps for r in results]),
+    }
+
+
+def build_parser():
+    """Build the argument parser for the tournament runner."""
+    parser = argparse.ArgumentParser(
+        prog="simulate.py", description="Alien Invasion self-play tournament")
+    parser.add_argument(
+        '--games', type=int, default=DEFAULT_GAMES,
+        help=f"games per difficulty (default {DEFAULT_GAMES})")
+    parser.add_argument(
+        '--difficulties', nargs='+', choices=list(DIFFICULTY_PRESETS),
+        metavar='NAME', help=f"difficulties to play (default: all of "
+                             f"{', '.join(DIFFICULTY_PRESETS)})")
+    parser.add_argument(
+        '--policy', default='autopilot',
+        help=f"{', '.join(POLICIES)} or module:function (default autopilot)")
+    parser.add_argument(
+        '--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument(
+        '--max-frames', type=int, default=DEFAULT_MAX_FRAMES,
+        help=f"cut games off after this many frames "
+             f"(default {DEFAULT_MAX_FRAMES})")
+    parser.add_argument(
+        '--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument(
+        '--output', metavar='FILE', help="write the report to FILE")
+    return parser
+
+
+def main(argv=None):
+    """Run the tournament and print (or save) the JSON report."""
+    options = build_parser().parse_args(argv)
+    # keep stdout for the report; the game's own messages go to stderr.
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            report = run(options.games, options.difficulties, options.policy,
+                         options.workers, options.max_frames, options.seed)
+        except (ValueError, ImportError, AttributeError) as e:
+            print(f"error: {e}")
+            return 1
+    text = json.dumps(report, indent=2)
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""Player profiles in SQLite, for installations with thousands of players.
+
+SQLiteProfileStore has the same API as profiles.ProfileStore, but every
+change is one small transaction instead of a rewrite of the whole file,
+and queries use indexes: players are keyed by lower-cased name, and an
+index on (high_score, name) serves the leaderboard top k without sorting
+everyone. The first time a database is opened with import_from, the
+players of that JSON profiles file are copied in, in one transaction.
+"""
+
+import contextlib
+import sqlite3
+
+from profiles import (DEFAULT_DIFFICULTY, DEFAULT_PLAYER_NAME, DIFFICULTIES,
+                      ProfileError, ProfileStore, _clean_record, _EMPTY_STATS,
+                      _record_from, normalize_name)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    high_score INTEGER NOT NULL DEFAULT 0,
+    best_level INTEGER NOT NULL DEFAULT 0,
+    games_played INTEGER NOT NULL DEFAULT 0,
+    total_score INTEGER NOT NULL DEFAULT 0,
+    difficulty TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS players_by_high_score
+    ON players (high_score DESC, key);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_COLUMNS = ("name",) + tuple(_EMPTY_STATS) + ("difficulty",)
+
+# import_records: a player who exists already gets the games added, the
+# way record_game adds one.
+_UPSERT = """
+INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    high_score = MAX(high_score, excluded.high_score),
+    best_level = MAX(best_level, excluded.best_level),
+    games_played = games_played + excluded.games_played,
+    total_score = total_score + excluded.total_score
+"""
+
+
+class SQLiteProfileStore:
+    """Load, mutate, and persist player profiles in a SQLite database."""
+
+    def __init__(self, path, import_from=None):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # goes up with every committed change, for caching views.
+        self.version = 0
+        with self._db:
+            self._db.executescript(_SCHEMA)
+        if import_from and self._meta('imported_from') is None:
+            self.import_json(import_from)
+        self._active_key = self._meta('active')
+
+    # --- persistence -----------------------------------------------------
+
+    def import_json(self, path):
+        """Copy every player of a JSON profiles file in; return the count.
+
+        Players already in the database keep their records.
+        """
+        # the JSON store already knows how to read and repair the file.
+        data = ProfileStore(path).snapshot()
+        rows = [(key,) + tuple(record[column] for column in _COLUMNS)
+                for key, record in data["players"].items()]
+        with self._transaction():
+            self._db.executemany(
+                "INSERT OR IGNORE INTO players VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            if data["active"] and self._meta('active') is None:
+                self._set_meta('active', data["active"].lower())
+            self._set_meta('imported_from', path)
+        return len(rows)
+
+    def snapshot(self):
+        """Return every player in the JSON store's save format."""
+        rows = self._db.execute("SELECT * FROM players ORDER BY key")
+        return {
+            "active": self.active,
+            "players": {row["key"]: self._record(row) for row in rows},
+        }
+
+    def save(self):
+        """Every change is committed as it is made; nothing to do."""
+
+    def flush(self):
+        """Every change is committed as it is made; nothing to do."""
+
+    def close(self):
+        """Close the database connection."""
+        self._db.close()
+
+    def ensure_default(self, legacy_high_score_file=None):
+        """Create a starter profile on first run, importing any old score."""
+        if self._db.execute("SELECT 1 FROM players LIMIT 1").fetchone():
+            return
+        self.create(DEFAULT_PLAYER_NAME)
+        if legacy_high_score_file:
+            try:
+                with open(legacy_high_score_file, 'r') as f:
+                    score = max(int(f.read()), 0)
+            except (OSError, ValueError):
+                return
+            with self._transaction():
+                self._db.execute(
+                    "UPDATE players SET high_score = ? WHERE key = ?",
+                    (score, self._active_key))
+
+    # --- queries ---------------------------------------------------------
+
+    @property
+    def active(self):
+        """Display name of the active player, or None."""
+        record = self._active_record()
+        return record["name"] if record else None
+
+    @property
+    def high_score(self):
+        """High score of the active player (0 if there is none)."""
+        record = self._active_record()
+        return record["high_score"] if record else 0
+
+    @property
+    def difficulty(self):
+        """Difficulty chosen by the active player."""
+        record = self._active_record()
+        return record["difficulty"] if record else DEFAULT_DIFFICULTY
+
+    def names(self):
+        """Display names of all players, sorted case-insensitively."""
+        return [row[0] for row in
+                self._db.execute("SELECT name FROM players ORDER BY key")]
+
+    def stats_for(self, name):
+        """Return a copy of a player's stats, or raise ProfileError."""
+        return self._record(self._require(name))
+
+    def export_records(self):
+        """Yield every player's record, in name order."""
+        for row in self._db.execute("SELECT * FROM players ORDER BY key"):
+            yield self._record(row)
+
+    def leaderboard(self, limit=5):
+        """Top (name, high_score) pairs, highest first, name breaking ties."""
+        rows = self._db.execute(
+            "SELECT name, high_score FROM players "
+            "ORDER BY high_score DESC, key LIMIT ?", (limit,))
+        return [tuple(row) for row in rows]
+
+    # --- mutations -------------------------------------------------------
+
+    def create(self, name):
+        """Create a player, make them active, and return the stored name."""
+        name = normalize_name(name)
+        record = _clean_record(name, None)
+        try:
+            with self._transaction():
+                self._db.execute(
+                    "INSERT INTO players VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (name.lower(),) + tuple(record[c] for c in _COLUMNS))
+                self._set_active(name.lower())
+        except sqlite3.IntegrityError:
+            raise ProfileError(f"'{name}' already exists.") from None
+        return name
+
+    def select(self, name):
+        """Make an existing player active and return their name."""
+        row = self._require(name)
+        with self._transaction():
+            self._set_active(row["key"])
+        return row["name"]
+
+    def select_next(self):
+        """Activate the next player in name order; return them, or None."""
+        row = self._db.execute(
+            "SELECT key FROM players WHERE key > ? ORDER BY key LIMIT 1",
+            (self._active_key or "",)).fetchone()
+        if row is None:
+            # past the last player: wrap around to the first.
+            row = self._db.execute(
+                "SELECT key FROM players ORDER BY key LIMIT 1").fetchone()
+        if row is None:
+            return None
+        with self._transaction():
+            self._set_active(row["key"])
+        return self.active
+
+    def delete(self, name):
+        """Delete a player, activating another one if the active one went."""
+        key = self._require(name)["key"]
+        with self._transaction():
+            self._db.execute("DELETE FROM players WHERE key = ?", (key,))
+            if self._active_key == key:
+                row = self._db.execute(
+                    "SELECT key FROM players ORDER BY key LIMIT 1").fetchone()
+                self._set_active(row["key"] if row else None)
+
+    def import_records(self, records):
+        """Merge raw player records in, in one transaction.
+
+        Same rules and result as ProfileStore.import_records.
+        """
+        count = "SELECT COUNT(*) FROM players"
+        before = self._db.execute(count).fetchone()[0]
+        imported = skipped = 0
+        with self._transaction():
+            for raw in records:
+                record = _record_from(raw)
+                if record is None:
+                    skipped += 1
+                    continue
+                self._db.execute(
+                    _UPSERT, (record["name"].lower(),) +
+                    tuple(record[c] for c in _COLUMNS))
+                imported += 1
+        added = self._db.execute(count).fetchone()[0] - before
+        return added, imported - added, skipped
+
+    def set_difficulty(self, difficulty):
+        """Store a difficulty for the active player and return it."""
+        if difficulty not in DIFFICULTIES:
+            raise ProfileError(f"Unknown difficulty: {difficulty}")
+        with self._transaction():
+            self._db.execute(
+                "UPDATE players SET difficulty = ? WHERE key = ?",
+                (difficulty, self._active_key))
+        return difficulty
+
+    def cycle_difficulty(self):
+        """Move the active player to the next difficulty and return it."""
+        index = DIFFICULTIES.index(self.difficulty)
+        return self.set_difficulty(DIFFICULTIES[(index + 1) % len(DIFFICULTIES)])
+
+    def record_game(self, score, level):
+        """Fold a finished game's result into the active player's stats."""
+        with self._transaction():
+            self._db.execute(
+                "UPDATE players SET high_score = MAX(high_score, ?), "
+                "best_level = MAX(best_level, ?), "
+                "games_played = games_played + 1, "
+                "total_score = total_score + ? WHERE key = ?",
+                (int(score), int(level), max(int(score), 0),
+                 self._active_key))
+
+    # --- helpers ---------------------------------------------------------
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Commit the block's changes as one transaction (or none)."""
+        with self._db:
+            yield
+        self.version += 1
+
+    @staticmethod
+    def _record(row):
+        return {column: row[column] for column in _COLUMNS}
+
+    def _active_record(self):
+        if self._active_key is None:
+            return None
+        return self._db.execute("SELECT * FROM players WHERE key = ?",
+                                (self._active_key,)).fetchone()
+
+    def _require(self, name):
+        try:
+            key = normalize_name(name).lower()
+        except ProfileError:
+            key = None
+        row = self._db.execute("SELECT * FROM players WHERE key = ?",
+                               (key,)).fetchone()
+        if row is None:
+            raise ProfileError(f"No such player: {name}")
+        return row
+
+    def _set_active(self, key):
+        self._active_key = key
+        self._set_meta('active', key)
+
+    def _meta(self, key):
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?",
+                               (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key, value):
+        self._db.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)",
+                         (key, value))
@@ -0,0 +1,84 @@
+"""Scrolling star background, pre-baked into a few parallax layers.
+
+Stars used to be individual sprites, each with its own per-pixel-alpha
+surface, moved and blitted one by one every frame. The Starfield instead
+draws every star once into a handful of screen-sized layers, one per
+speed band, and scrolls each layer as a whole. A frame costs at most two
+blits per layer however many stars there are, so settings.star_count
+can grow with the display.
+"""
+
+import pygame
+
+# Layer scroll speeds in pixels per frame, slowest (farthest) first.
+# Each star joins the band closest to the speed it would have had alone.
+LAYER_SPEEDS = (0.2, 0.4, 0.6, 0.8)
+
+# Transparent color of the layers; stars are always blended over the
+# background color, so they never come out pure black.
+COLORKEY = (0, 0, 0)
+
+
+class Starfield:
+    """A few wrapping star layers that scroll down at different speeds."""
+
+    def __init__(self, ai_game):
+        self.settings = ai_game.settings
+        self.width = self.settings.screen_width
+        self.height = self.settings.screen_height
+        self.star_count = self.settings.star_count
+        self.rng = ai_game.rng.python('stars')
+
+        self.layers = [self._new_layer() for _ in LAYER_SPEEDS]
+        self.offsets = [0.0] * len(LAYER_SPEEDS)
+        for _ in range(self.star_count):
+            self._bake_star()
+
+    def _new_layer(self):
+        layer = pygame.Surface((self.width, self.height)).convert()
+        layer.fill(COLORKEY)
+        layer.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        return layer
+
+    def _bake_star(self):
+        """Draw one random star into the layer matching its speed."""
+        size = self.rng.choice([1, 1, 1, 2])  # Mostly small stars
+        color = (
+            self.rng.randint(200, 255),  # R
+            self.rng.randint(200, 255),  # G
+            self.rng.randint(200, 255)   # B
+        )
+        x = self.rng.randint(0, self.width)
+        y = self.rng.randint(0, self.height - 1)
+
+        # Bigger stars drift more slowly and are dimmer.
+        speed = self.rng.uniform(0.3, 0.8) * (1/size)
+        brightness = min(self.rng.uniform(0.5, 1.5) * (1/size), 1.0)
+
+        # Layers are opaque, so pre-blend the star into the background.
+        bg = self.settings.bg_color
+        color = tuple(int(b + (c - b) * brightness) for c, b in zip(color, bg))
+
+        band = min(range(len(LAYER_SPEEDS)),
+                   key=lambda i: abs(LAYER_SPEEDS[i] - speed))
+        layer = self.layers[band]
+        pygame.draw.circle(layer, color, (x, y), size)
+        # Stars on the seam also appear on the far side, so the wrap is
+        # invisible.
+        if y < size:
+            pygame.draw.circle(layer, color, (x, y + self.height), size)
+        elif y >= self.height - size:
+            pygame.draw.circle(layer, color, (x, y - self.height), size)
+
+    def update(self):
+        """Scroll every layer down, wrapping at the bottom of the screen."""
+        for i, speed in enumerate(LAYER_SPEEDS):
+            self.offsets[i] = (self.offsets[i] + speed) % self.height
+
+    def draw(self, surface):
+        """Blit each layer at its scroll offset (at most two blits each)."""
+        for layer, offset in zip(self.layers, self.offsets):
+            top = int(offset)
+            surface.blit(layer, (0, top))
+            if top:
+                surface.blit(layer, (0, top - self.height))
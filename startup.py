@@ -0,0 +1,33 @@
+"""Startup timing: where the time goes between launch and a playable game.
+
+The launcher and the game mark() the end of each startup step; with
+--startup-trace the game prints the steps once its deferred work (sounds
+and the first fleet) is done.
+"""
+
+import time
+
+
+class StartupTrace:
+    """Named steps, each timed from the end of the one before."""
+
+    def __init__(self, started=None):
+        """Start timing at started (a perf_counter value), or now."""
+        self.started = time.perf_counter() if started is None else started
+        self._last = self.started
+        self.steps = []
+
+    def mark(self, name):
+        """End a step called name; it lasted since the previous mark."""
+        now = time.perf_counter()
+        self.steps.append((name, now - self._last))
+        self._last = now
+
+    def report(self):
+        """The steps and their total, one per line, in milliseconds."""
+        lines = ["Startup trace:"]
+        for name, seconds in self.steps:
+            lines.append(f"{seconds * 1000:9.1f} ms  {name}")
+        total = self._last - self.started
+        lines.append(f"{total * 1000:9.1f} ms  total")
+        return "\n".join(lines)
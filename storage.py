@@ -0,0 +1,38 @@
+"""Where the game keeps its data: the player profiles and the files beside them.
+
+Both the launcher (alien_invasion.py) and the game (game.py) open the
+profiles through here, so neither has to import the other.
+"""
+
+import os
+
+from paths import (HIGH_SCORE_FILE, HISTORY_FILENAME, PROFILES_DB_FILENAME,
+                   PROFILES_FILE)
+from profiles import ProfileStore
+from sqlite_profiles import SQLiteProfileStore
+
+
+def open_profiles(options=None, journal=False):
+    """Open the player profiles: PROFILES_FILE, or its database.
+
+    With --profile-db the profiles live in SQLite next to PROFILES_FILE,
+    and the JSON file's players are imported the first time. journal
+    opens the JSON file in journal mode, as the game does.
+    """
+    if getattr(options, 'profile_db', False):
+        store = SQLiteProfileStore(data_path(PROFILES_DB_FILENAME),
+                                   import_from=PROFILES_FILE)
+    else:
+        store = ProfileStore(PROFILES_FILE, journal=journal)
+    store.ensure_default(HIGH_SCORE_FILE)
+    return store
+
+
+def data_path(filename):
+    """A data file kept in the same directory as PROFILES_FILE."""
+    return os.path.join(os.path.dirname(PROFILES_FILE), filename)
+
+
+def history_path():
+    """The game history file, next to PROFILES_FILE."""
+    return data_path(HISTORY_FILENAME)
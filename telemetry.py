@@ -0,0 +1,179 @@
+"""Frame telemetry for long sessions: per-frame samples, flushed as JSONL.
+
+With --telemetry, every frame records its timings, frame rate, sprite
+counts, level and game state into a preallocated NumPy buffer. When a
+buffer fills (every 10 seconds at 60 fps) it is handed to a background
+thread and recording carries on in a spare buffer, so the main loop never
+waits on summarizing or disk I/O. The thread appends one JSON line per
+buffer: percentiles, HDR-style latency histograms, and sprite, level and
+state summaries.
+
+If the writer falls so far behind that no spare buffer is free, the
+current buffer is reused and its frames are counted as dropped instead of
+stalling the game.
+"""
+
+import json
+import queue
+import threading
+import time
+
+import numpy as np
+
+FRAME_DTYPE = np.dtype([
+    ('interval_ns', np.int64),   # end of the previous frame to end of this
+    ('work_ns', np.int64),       # updating and drawing, without the cap wait
+    ('fps', np.float32),
+    ('bullets', np.uint32),
+    ('aliens', np.uint32),
+    ('particles', np.uint32),
+    ('explosions', np.uint32),
+    ('level', np.uint16),
+    ('state', np.uint8),
+])
+
+STATES = ('idle', 'playing', 'paused')
+PERCENTILES = (50, 90, 95, 99, 99.9)
+COUNTS = ('bullets', 'aliens', 'particles', 'explosions')
+
+# Histogram buckets keep the top SUB_BUCKET_BITS bits of a value, so every
+# bucket is within 1/64 of its lower bound, from microseconds to seconds.
+SUB_BUCKET_BITS = 7
+
+
+def histogram(values_us):
+    """Bucket integer microsecond values; return [[lower_us, count], ...]."""
+    values = np.maximum(np.asarray(values_us, dtype=np.int64), 0)
+    if not len(values):
+        return []
+    bits = np.zeros(len(values), dtype=np.int64)
+    nonzero = values > 0
+    bits[nonzero] = np.floor(np.log2(values[nonzero])).astype(np.int64) + 1
+    shift = np.maximum(bits - SUB_BUCKET_BITS, 0)
+    lower = (values >> shift) << shift
+    buckets, counts = np.unique(lower, return_counts=True)
+    return [[int(b), int(c)] for b, c in zip(buckets, counts)]
+
+
+def latency_summary(values_ns):
+    """Mean, percentiles and max in ms, plus a histogram in microseconds."""
+    ms = values_ns / 1e6
+    summary = {'mean': round(float(ms.mean()), 3)}
+    for p, value in zip(PERCENTILES, np.percentile(ms, PERCENTILES).tolist()):
+        summary[f"p{p:g}".replace('.', '')] = round(value, 3)
+    summary['max'] = round(float(ms.max()), 3)
+    summary['histogram_us'] = histogram(values_ns // 1000)
+    return summary
+
+
+def summarize(frames):
+    """Summarize a batch of recorded frames as one JSON-ready dict."""
+    return {
+        'frames': len(frames),
+        'frame_ms': latency_summary(frames['interval_ns']),
+        'work_ms': latency_summary(frames['work_ns']),
+        'fps': {'mean': round(float(frames['fps'].mean()), 1),
+                'min': round(float(frames['fps'].min()), 1)},
+        'sprites': {name: {'mean': round(float(frames[name].mean()), 1),
+                           'max': int(frames[name].max())}
+                    for name in COUNTS},
+        'level': {'min': int(frames['level'].min()),
+                  'max': int(frames['level'].max())},
+        'states': {state: int(np.count_nonzero(frames['state'] == i))
+                   for i, state in enumerate(STATES)},
+    }
+
+
+class Telemetry:
+    """Record every frame and write batch summaries off the main loop."""
+
+    def __init__(self, ai_game, path, capacity=600, buffers=3):
+        self.ai_game = ai_game
+        self.path = path
+        self.session = time.time()
+        self.batches = 0
+        self.dropped = 0
+
+        # buffers not being written; the writer gives them back when done.
+        self._free = queue.SimpleQueue()
+        for _ in range(buffers - 1):
+            self._free.put(np.zeros(capacity, dtype=FRAME_DTYPE))
+        self._buffer = np.zeros(capacity, dtype=FRAME_DTYPE)
+        self._count = 0
+        self._frame_start = None
+        self._last_end = None
+
+        self._pending = queue.SimpleQueue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_batches,
+                                        name="telemetry", daemon=True)
+        self._thread.start()
+
+    # --- recording (main loop) -------------------------------------------
+
+    def start_frame(self):
+        """Mark the start of a frame's work."""
+        self._frame_start = time.perf_counter_ns()
+
+    def end_frame(self):
+        """Record the frame that just finished updating and drawing."""
+        now = time.perf_counter_ns()
+        start = self._frame_start if self._frame_start is not None else now
+        last = self._last_end if self._last_end is not None else start
+        self._last_end = now
+
+        ai = self.ai_game
+        if not ai.stats.game_active:
+            state = 0
+        else:
+            state = 2 if ai.game_paused else 1
+        self._buffer[self._count] = (
+            now - last, now - start, ai.clock.get_fps(), len(ai.bullets),
+            len(ai.aliens), ai.particles.count, len(ai.explosions),
+            ai.stats.level, state)
+        self._count += 1
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        """Hand the recorded frames to the writer thread."""
+        if not self._count:
+            return
+        try:
+            spare = self._free.get_nowait()
+        except queue.Empty:
+            # the writer is behind: drop this batch rather than wait.
+            self.dropped += self._count
+            self._count = 0
+            return
+        self._pending.put((self._buffer, self._count, self.dropped))
+        self._buffer = spare
+        self._count = 0
+
+    def close(self, timeout=2.0):
+        """Flush what is left and wait for the writer to finish."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._pending.put(None)
+        self._thread.join(timeout)
+
+    # --- writing (background thread) -------------------------------------
+
+    def _write_batches(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            buffer, count, dropped = item
+            record = {'session': self.session, 'batch': self.batches,
+                      'time': time.time(), 'dropped': dropped}
+            record.update(summarize(buffer[:count]))
+            self._free.put(buffer)
+            self.batches += 1
+            try:
+                with open(self.path, 'a') as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                print(f"Warning: could not write telemetry ({e}).")
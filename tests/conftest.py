@@ -14,14 +14,15 @@ import pygame
 import pytest
 
 import alien_invasion
+import storage
 
 
 @pytest.fixture(autouse=True)
 def isolated_data_files(tmp_path, monkeypatch):
     """Never touch the developer's real profiles.json / high_score.txt."""
-    monkeypatch.setattr(alien_invasion, "PROFILES_FILE",
+    monkeypatch.setattr(storage, "PROFILES_FILE",
                         str(tmp_path / "profiles.json"))
-    monkeypatch.setattr(alien_invasion, "HIGH_SCORE_FILE",
+    monkeypatch.setattr(storage, "HIGH_SCORE_FILE",
                         str(tmp_path / "high_score.txt"))
     return tmp_path
 
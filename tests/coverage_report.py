@@ -15,8 +15,15 @@ import pytest
 
 MODULES = ["alien_invasion.py", "cli.py", "profiles.py", "profile_panel.py",
            "game_stats.py", "scoreboard.py", "settings.py", "ship.py",
-           "bullet.py", "alien.py", "star.py", "explosion.py", "button.py",
-           "paths.py"]
+           "bullet.py", "alien.py", "starfield.py", "explosion.py", "button.py",
+           "paths.py", "assets.py", "fleet.py", "bullet_pool.py",
+           "collisions.py", "particles.py", "renderer.py",
+           "game_clock.py", "bench.py", "profiler.py",
+           "telemetry.py", "random_streams.py", "replay.py",
+           "env.py", "simulate.py", "tune.py",
+           "sqlite_profiles.py", "history.py",
+           "player_files.py", "game.py", "startup.py",
+           "storage.py"]
 
 
 def main():
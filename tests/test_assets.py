@@ -0,0 +1,65 @@
+"""Tests for the shared asset cache."""
+
+import pygame
+
+from assets import AssetManager
+from helpers import start_game
+
+
+def test_fleet_creation_does_no_loading_after_warm_up(game):
+    start_game(game)
+    game.assets.reset_counters()
+    game.aliens.empty()
+    game._create_fleet()
+    stats = game.assets.stats()
+    assert stats['loads'] == 0
+    assert stats['misses'] == 0
+    assert stats['hits'] >= len(game.aliens)
+
+
+def test_aliens_and_ship_icons_share_surfaces(game):
+    start_game(game)
+    images = {id(alien.image) for alien in game.aliens}
+    assert len(images) == 1
+    assert all(ship.image is game.ship.image for ship in game.sb.ships)
+
+
+def test_image_is_loaded_once_and_counted(game):
+    manager = AssetManager()
+    manager.set_display(game.screen)
+    first = manager.image('spaceship.png')
+    assert manager.image('spaceship.png') is first
+    assert (manager.loads, manager.misses, manager.hits) == (1, 1, 1)
+    assert manager.load_time > 0
+
+
+def test_display_mode_change_drops_converted_images(game):
+    manager = AssetManager()
+    manager.set_display(game.screen)
+    first = manager.image('spaceship.png')
+    manager.set_display(game.screen)  # same mode: cache kept
+    assert manager.image('spaceship.png') is first
+
+    manager.set_display(pygame.display.set_mode((640, 480)))
+    assert manager.image('spaceship.png') is not first
+
+
+def test_generated_surfaces_are_built_once(game):
+    manager = AssetManager()
+    built = []
+
+    def factory():
+        built.append(1)
+        return pygame.Surface((4, 4))
+
+    assert manager.surface(('dot', 4), factory) is manager.surface(
+        ('dot', 4), factory)
+    assert built == [1]
+
+
+def test_pygame_quit_empties_the_cache(game):
+    manager = AssetManager()
+    manager.set_display(game.screen)
+    manager.image('spaceship.png')
+    pygame.quit()
+    assert manager.stats()['images'] == 0
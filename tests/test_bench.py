@@ -0,0 +1,59 @@
+"""Tests for the frame-time benchmark harness."""
+
+import json
+
+import bench
+from bench import PHASES, SCENARIOS, run_scenario, summarize
+
+
+def test_summarize_reports_percentiles_in_milliseconds():
+    stats = summarize([i * 1_000_000 for i in range(1, 101)], frames=50)
+    assert stats['calls'] == 100
+    assert stats['mean_ms'] == 50.5
+    assert stats['p50_ms'] == 50.5
+    assert 95 <= stats['p95_ms'] <= 96
+    assert stats['max_ms'] == 100
+    assert stats['per_frame_ms'] == 101  # two calls per frame
+
+
+def test_summarize_handles_phases_that_never_ran():
+    assert summarize([], frames=10)['calls'] == 0
+
+
+def test_every_scenario_runs_headlessly():
+    for name in SCENARIOS:
+        result = run_scenario(name, (800, 600), frames=5, warmup=2)
+        assert result['frame']['calls'] == 5
+        assert set(result['phases']) == set(PHASES)
+        assert result['phases']['screen']['calls'] == 5
+
+
+def test_scenarios_load_the_game_as_advertised():
+    idle = run_scenario('idle', (800, 600), frames=5, warmup=2)
+    assert idle['phases']['bullets']['calls'] == 0
+
+    bullets = run_scenario('max_bullets', (800, 600), frames=60, warmup=0)
+    assert bullets['load']['bullets'] > 30  # beyond the default limit
+
+    explosions = run_scenario('mass_explosions', (800, 600), frames=5,
+                              warmup=2)
+    assert explosions['load']['particles'] > 100
+
+
+def test_dirty_render_mode_reports_fewer_pixels():
+    full = run_scenario('full_fleet', (800, 600), frames=5, warmup=5)
+    dirty = run_scenario('full_fleet', (800, 600), frames=5, warmup=5,
+                         render='dirty')
+    assert full['load']['dirty_pixels'] == 800 * 600
+    assert dirty['load']['dirty_pixels'] < full['load']['dirty_pixels']
+
+
+def test_main_writes_a_json_report(tmp_path):
+    out = tmp_path / "bench.json"
+    assert bench.main(["--scenarios", "idle", "--sizes", "640x480",
+                       "--frames", "3", "--output", str(out)]) == 0
+    report = json.loads(out.read_text())
+    assert report['meta']['seed'] == 0
+    [result] = report['results']
+    assert result['scenario'] == 'idle'
+    assert result['size'] == "640x480"
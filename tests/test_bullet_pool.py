@@ -0,0 +1,99 @@
+"""Tests for the preallocated bullet pool."""
+
+from bullet import Bullet, bullet_image
+from helpers import start_game
+
+
+def test_pool_is_sized_from_the_settings(game):
+    assert game.bullets.capacity == game.settings.bullets_allowed
+    assert len(game.bullets) == 0
+
+
+def test_firing_reuses_pooled_bullets(game):
+    start_game(game)
+    game.aliens.empty()
+    pooled = set(map(id, game.bullets._bullets))
+    for _ in range(100):
+        game._fire_bullet()
+        game.bullets.empty()
+    game._fire_bullet()
+    assert id(game.bullets.sprites()[0]) in pooled
+
+
+def test_firing_stops_at_the_limit(game):
+    start_game(game)
+    for _ in range(game.settings.bullets_allowed + 5):
+        game._fire_bullet()
+    assert len(game.bullets) == game.settings.bullets_allowed
+    assert game.bullets.fire(game.ship.rect.midtop) is None
+
+
+def test_bullets_move_together_and_retire_at_the_top(game):
+    start_game(game)
+    game.aliens.empty()
+    low = game.bullets.fire((100, 500))
+    high = game.bullets.fire((200, 5))
+    game.bullets.update()
+    assert low.y == 500 - game.settings.bullet_speed
+    for _ in range(10):
+        game.bullets.update()
+    assert game.bullets.sprites() == [low]
+    assert high.pool is None
+
+
+def test_retired_slots_are_handed_out_again(game):
+    start_game(game)
+    bullet = game.bullets.fire((100, 100))
+    bullet.kill()
+    assert game.bullets.fire((100, 100)) is bullet
+
+
+def test_bullets_built_outside_the_pool_can_join_it(game):
+    start_game(game)
+    outsider = Bullet(game)
+    outsider.y = 400
+    capacity = game.bullets.capacity
+    for _ in range(capacity):
+        game.bullets.fire((0, 300))
+    game.bullets.add(outsider)  # the pool grows rather than refusing
+    assert outsider.y == 400
+    assert len(game.bullets) == capacity + 1
+
+    # the grown slots hold real bullets, ready to fire.
+    fired = game.bullets.fire((50, 300))
+    assert fired is not None and fired is not outsider
+    assert fired.rect.midtop == (50, 300)
+    assert len(game.bullets) == capacity + 2
+
+
+class _BlitsCounter:
+    """Stands in for the screen and records batched blits."""
+
+    def __init__(self):
+        self.calls = []
+
+    def blits(self, sequence):
+        self.calls.append(list(sequence))
+        return []
+
+
+def test_all_bullets_are_drawn_in_one_batched_blit(game):
+    start_game(game)
+    game.aliens.empty()
+    for x in range(0, 500, 50):
+        game.bullets.fire((x, 300))
+    screen = _BlitsCounter()
+    game.bullets.draw(screen)
+    assert len(screen.calls) == 1
+    images = {id(image) for image, _pos in screen.calls[0]}
+    assert len(screen.calls[0]) == 10 and len(images) == 1
+
+
+def test_bullet_image_is_rebuilt_when_settings_change(game):
+    image, offset = bullet_image(game)
+    assert bullet_image(game)[0] is image
+    game.settings.bullet_glow_width = 25
+    wider, wider_offset = bullet_image(game)
+    assert wider is not image
+    assert wider.get_width() > image.get_width()
+    assert wider_offset[0] < offset[0]
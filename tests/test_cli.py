@@ -4,6 +4,7 @@ import pygame
 import pytest
 
 import alien_invasion
+import storage
 from alien_invasion import AlienInvasion, main
 from cli import (DEFAULT_WINDOW, apply_player_options, parse_args,
                  run_admin_commands, window_size)
@@ -87,6 +88,62 @@ def test_delete_unknown_player_is_an_error(store, capsys):
     assert store.names() == ["Ace", "Bob"]
 
 
+@pytest.mark.parametrize("filename", ["players.csv", "players.jsonl"])
+def test_export_then_import_merges_like_record_game(store, tmp_path, capsys,
+                                                    filename):
+    store.record_game(score=700, level=4)   # Bob
+    path = str(tmp_path / filename)
+    assert run_admin_commands(parse_args(["--export-players", path]),
+                              store) == 0
+    assert "Exported 2 players" in capsys.readouterr().out
+
+    other = ProfileStore(str(tmp_path / "other.json"))
+    other.create("bob")
+    other.set_difficulty("hard")
+    other.record_game(score=300, level=6)
+    writes = other.writes
+    assert run_admin_commands(parse_args(["--import-players", path]),
+                              other) == 0
+    assert "1 new and 1 existing" in capsys.readouterr().out
+    assert other.writes == writes + 1   # one save for the whole file
+
+    bob = ProfileStore(other.path).stats_for("Bob")
+    assert bob == {"name": "bob", "high_score": 700, "best_level": 6,
+                   "games_played": 2, "total_score": 1000,
+                   "difficulty": "hard"}
+    assert other.stats_for("Ace")["games_played"] == 0
+
+
+def test_import_skips_bad_records(store, tmp_path, capsys):
+    path = tmp_path / "players.jsonl"
+    path.write_text('{"name": "Cid", "high_score": 40}\n'
+                    'not json\n'
+                    '\n'
+                    '{"name": "no/slashes"}\n'
+                    '{"name": "Dee", "games_played": -3, "difficulty": 9}\n')
+    assert run_admin_commands(parse_args(["--import-players", str(path)]),
+                              store) == 0
+    assert "(2 bad records skipped)" in capsys.readouterr().out
+    assert store.names() == ["Ace", "Bob", "Cid", "Dee"]
+    assert store.stats_for("Dee")["games_played"] == 0
+    assert store.stats_for("Dee")["difficulty"] == "normal"
+
+
+def test_import_keeps_csv_names_as_text(store, tmp_path):
+    path = tmp_path / "players.csv"
+    path.write_text("name,high_score,games_played\n007,12,x\n")
+    run_admin_commands(parse_args(["--import-players", str(path)]), store)
+    assert store.stats_for("007")["high_score"] == 12
+    assert store.stats_for("007")["games_played"] == 0
+
+
+def test_import_of_a_missing_file_is_an_error(store, tmp_path, capsys):
+    path = str(tmp_path / "nope.csv")
+    assert run_admin_commands(parse_args(["--import-players", path]),
+                              store) == 1
+    assert "error:" in capsys.readouterr().out
+
+
 def test_no_admin_command_means_play(store):
     assert run_admin_commands(parse_args([]), store) is None
 
@@ -132,7 +189,7 @@ def test_main_list_players_does_not_start_the_game(capsys, monkeypatch):
 
 
 def test_main_delete_player(capsys):
-    ProfileStore(alien_invasion.PROFILES_FILE).create("Ace")
+    ProfileStore(storage.PROFILES_FILE).create("Ace")
     assert main(["--delete-player", "Ace"]) == 0
     assert main(["--delete-player", "Ace"]) == 1  # already gone
     assert "Deleted Ace." in capsys.readouterr().out
@@ -153,7 +210,7 @@ def test_main_starts_the_game_with_the_parsed_options(monkeypatch):
     started = {}
 
     class FakeGame:
-        def __init__(self, options):
+        def __init__(self, options, startup=None):
             started['options'] = options
 
         def run_game(self):
@@ -165,7 +222,7 @@ def test_main_starts_the_game_with_the_parsed_options(monkeypatch):
     assert started['ran'] is True
     assert started['options'].windowed == (800, 600)
 
-    store = ProfileStore(alien_invasion.PROFILES_FILE)
+    store = ProfileStore(storage.PROFILES_FILE)
     assert store.active == "Cid"
     assert store.difficulty == "easy"
 
@@ -0,0 +1,90 @@
+"""Tests for the sweep-and-prune collision module."""
+
+import random
+
+import pygame
+from pygame.sprite import Group, Sprite
+
+from collisions import BroadPhase
+from helpers import start_game
+
+
+def _box_sprite(x, y, w, h):
+    sprite = Sprite()
+    sprite.rect = pygame.Rect(x, y, w, h)
+    return sprite
+
+
+def _random_group(rng, count, size):
+    return Group(_box_sprite(rng.randrange(0, 500), rng.randrange(0, 500),
+                             *size) for _ in range(count))
+
+
+def _as_sets(collisions):
+    return {a: set(hit) for a, hit in collisions.items()}
+
+
+def test_matches_pygame_groupcollide_without_kills():
+    rng = random.Random(3)
+    for _ in range(20):
+        bullets = _random_group(rng, 30, (5, 20))
+        aliens = _random_group(rng, 80, (40, 30))
+        expected = pygame.sprite.groupcollide(bullets, aliens, False, False)
+        got = BroadPhase().groupcollide(bullets, aliens, False, False)
+        assert _as_sets(got) == _as_sets(expected)
+
+
+def test_matches_pygame_groupcollide_with_kills():
+    rng = random.Random(5)
+    for _ in range(20):
+        bullets = _random_group(rng, 30, (5, 20))
+        aliens = _random_group(rng, 80, (40, 30))
+        twins = {a: _box_sprite(*a.rect) for a in bullets}
+        twins.update({a: _box_sprite(*a.rect) for a in aliens})
+        bullets2 = Group(twins[b] for b in bullets.sprites())
+        aliens2 = Group(twins[a] for a in aliens.sprites())
+
+        expected = pygame.sprite.groupcollide(bullets2, aliens2, True, True)
+        got = BroadPhase().groupcollide(bullets, aliens, True, True)
+        assert {twins[b] for b in got} == set(expected)
+        assert len(aliens) == len(aliens2)
+        assert len(bullets) == len(bullets2)
+
+
+def test_an_alien_is_credited_to_only_one_bullet():
+    alien = _box_sprite(0, 0, 40, 40)
+    first, second = _box_sprite(10, 10, 5, 5), _box_sprite(20, 10, 5, 5)
+    collisions = BroadPhase().groupcollide(
+        Group(first, second), Group(alien), True, True)
+    assert list(collisions.values()) == [[alien]]
+    assert len(collisions) == 1
+
+
+def test_candidate_pairs_are_far_fewer_than_all_pairs(game):
+    start_game(game)
+    for alien in game.aliens.sprites()[:10]:
+        game.bullets.fire((int(alien.x) + 5, int(alien.y) + 5))
+    aliens_before = len(game.aliens)
+    game.collisions.start_frame()
+    game._check_bullet_alien_collisions()
+    stats = game.collisions.frame_stats()
+    assert stats['hits'] == 10
+    assert stats['candidate_pairs'] < 10 * aliens_before // 4
+
+
+def test_spritecollideany_finds_an_overlap():
+    target = _box_sprite(100, 100, 10, 10)
+    group = Group(_box_sprite(0, 0, 10, 10), target)
+    phase = BroadPhase()
+    assert phase.spritecollideany(_box_sprite(105, 95, 10, 10), group) is target
+    assert phase.spritecollideany(_box_sprite(300, 300, 5, 5), group) is None
+    assert phase.spritecollideany(target, Group()) is None
+
+
+def test_start_frame_keeps_the_previous_frame_counts():
+    phase = BroadPhase()
+    phase.spritecollideany(_box_sprite(0, 0, 10, 10),
+                           Group(_box_sprite(5, 5, 10, 10)))
+    phase.start_frame()
+    assert phase.last_frame == {'candidate_pairs': 1, 'hits': 1}
+    assert phase.frame_stats() == {'candidate_pairs': 0, 'hits': 0}
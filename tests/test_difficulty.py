@@ -109,6 +109,7 @@ def test_switching_player_restores_their_difficulty(game):
 
 def test_difficulty_survives_a_restart(game):
     press(game, pygame.K_d)  # -> hard
+    game.profiles.close()    # as on quit or process exit
     pygame.quit()
 
     reborn = AlienInvasion()
@@ -0,0 +1,268 @@
+"""Tests for the Gym-style environment wrappers."""
+
+import tracemalloc
+
+import numpy as np
+import pygame
+import pytest
+
+from env import (ACTIONS, FIRE, LEFT, NOOP, RIGHT, RIGHT_FIRE,
+                 AlienInvasionEnv, VectorEnv)
+
+
+@pytest.fixture
+def env():
+    e = AlienInvasionEnv(size=(1200, 800))
+    yield e
+    e.close()
+    pygame.quit()
+
+
+def test_reset_starts_a_game_and_observes_it(env):
+    obs = env.reset(seed=1)
+    assert env.game.stats.game_active
+    assert obs.dtype == np.float32
+    assert obs.shape == (env.observation_size,)
+    rows, columns = env.grid
+    assert env.observation_size == 6 + rows * columns + 2 * 30
+
+    assert 0 < obs[0] < 1                      # ship x
+    assert 0 < obs[1] < obs[2] < 1             # fleet left < right
+    assert 0 < obs[3] < obs[4] < 1             # fleet top < bottom
+    assert obs[5] == 1                         # moving right
+    assert obs[6:6 + rows * columns].all()     # the whole grid is alive
+    assert (obs[6 + rows * columns:] == -1).all()  # no bullets yet
+
+
+def test_moving_actions_move_the_ship(env):
+    env.reset()
+    start = env.game.ship.x
+    for _ in range(10):
+        env.step(RIGHT)
+    assert env.game.ship.x > start
+    for _ in range(20):
+        env.step(LEFT)
+    assert env.game.ship.x < start
+    env.step(NOOP)
+    assert not env.game.ship.moving_left
+
+
+def test_fire_shoots_at_once_then_keeps_the_cooldown(env):
+    env.reset()
+    obs, _reward, _done, _info = env.step(FIRE)
+    assert len(env.game.bullets) == 1
+    bullet_x = obs[6 + env.grid[0] * env.grid[1]:][:env.bullet_slots]
+    assert (bullet_x >= 0).sum() == 1
+    for _ in range(5):
+        env.step(FIRE)
+    assert len(env.game.bullets) == 1   # cooldown not over yet
+
+
+def test_rewards_are_score_gains(env):
+    env.reset()
+    total = 0
+    for _ in range(1500):
+        _obs, reward, done, info = env.step(RIGHT_FIRE if
+                                            env.steps % 200 < 100 else FIRE)
+        total += reward
+        if done:
+            break
+    assert total > 0
+    assert total == info['score']
+
+
+def test_episode_ends_when_the_last_ship_is_lost(env):
+    env.reset()
+    env.game.stats.ships_left = 0
+    env.game._ship_hit()
+    _obs, _reward, done, info = env.step(NOOP)
+    assert done and not info['truncated']
+    assert not env.game.explosions  # visual effects are off
+
+
+def test_max_steps_truncates_an_episode():
+    env = AlienInvasionEnv(max_steps=3)
+    try:
+        env.reset()
+        dones = [env.step(NOOP)[2] for _ in range(3)]
+        assert dones == [False, False, True]
+    finally:
+        env.close()
+        pygame.quit()
+
+
+def test_same_seed_and_actions_replay_identically(env):
+    actions = np.random.default_rng(0).integers(len(ACTIONS), size=300)
+    runs = []
+    for _ in range(2):
+        env.reset(seed=5)
+        runs.append(np.array([env.step(int(a))[0] for a in actions]))
+    assert np.array_equal(runs[0], runs[1])
+
+
+def test_the_seed_picks_the_starfield_and_particles():
+    env = AlienInvasionEnv(observation='pixels')
+    try:
+        first = env.reset(seed=1).copy()
+        assert np.array_equal(env.reset(seed=1), first)
+        assert not np.array_equal(env.reset(seed=2), first)
+
+        particles = []
+        for _ in range(2):
+            env.reset(seed=3)
+            particles.append(env.game.particles.rng.random(4))
+        assert np.array_equal(particles[0], particles[1])
+    finally:
+        env.close()
+        pygame.quit()
+
+
+def test_vector_env_steps_independent_games():
+    venv = VectorEnv(3, max_steps=50)
+    try:
+        obs = venv.reset(seed=0)
+        assert obs.shape == (3, venv.observation_size)
+        games = [e.game for e in venv.envs]
+        assert (games[0].stars.layers is games[1].stars.layers is
+                games[2].stars.layers)
+
+        actions = np.array([LEFT, RIGHT, NOOP])
+        for _ in range(20):
+            obs, rewards, dones, infos = venv.step(actions)
+        assert obs[0, 0] < obs[2, 0] < obs[1, 0]   # ship positions diverge
+        assert rewards.shape == dones.shape == (3,)
+        assert len(infos) == 3
+
+        # finished games restart at once and report their last observation.
+        for _ in range(30):
+            obs, rewards, dones, infos = venv.step(actions)
+        assert dones.all()
+        assert all('final_observation' in info for info in infos)
+        assert all(env.steps == 0 for env in venv.envs)
+    finally:
+        venv.close()
+        pygame.quit()
+
+
+def test_vector_env_games_play_like_single_games():
+    actions = np.random.default_rng(1).integers(len(ACTIONS), size=(40, 3))
+    single = []
+    for i in range(3):
+        env = AlienInvasionEnv(max_steps=50)
+        try:
+            obs = [env.reset(seed=4 + i)]
+            obs += [env.step(int(a))[0] for a in actions[:, i]]
+            single.append(np.array(obs))
+        finally:
+            env.close()
+    venv = VectorEnv(3, max_steps=50)
+    try:
+        obs = [venv.reset(seed=4)]
+        obs += [venv.step(a)[0] for a in actions]
+        assert np.array_equal(np.array(obs), np.stack(single, axis=1))
+    finally:
+        venv.close()
+        pygame.quit()
+
+
+def test_vector_env_pixels_match_a_single_game():
+    # the first game bakes the shared layers from the seed; its frames
+    # must match a game of its own, stars included.
+    actions = np.random.default_rng(2).integers(len(ACTIONS), size=(10, 2))
+    env = AlienInvasionEnv(observation='pixels', grayscale=True,
+                           resize=(84, 84))
+    try:
+        single = [env.reset(seed=9).copy()]
+        single += [env.step(int(a))[0].copy() for a in actions[:, 0]]
+    finally:
+        env.close()
+    venv = VectorEnv(2, observation='pixels', grayscale=True,
+                     resize=(84, 84))
+    try:
+        frames = [venv.reset(seed=9)[0]]
+        frames += [venv.step(a)[0][0] for a in actions]
+        assert np.array_equal(np.array(frames), np.array(single))
+    finally:
+        venv.close()
+        pygame.quit()
+
+
+def test_pixel_observations_are_a_view_of_the_drawn_frame():
+    env = AlienInvasionEnv(observation='pixels')
+    try:
+        obs = env.reset(seed=1)
+        assert obs.shape == env.observation_shape == (800, 1200, 3)
+        assert obs.dtype == np.uint8
+        assert np.shares_memory(obs, env._buffer)   # no copy
+
+        # the frame shows the ship and the fleet over the background.
+        ship = env.game.ship.rect
+        assert (obs[ship.top:ship.bottom, ship.left:ship.right] !=
+                env.game.settings.bg_color).any()
+        assert tuple(obs[790, 5]) == env.game.settings.bg_color
+
+        obs, _reward, _done, _info = env.step(RIGHT)
+        assert np.shares_memory(obs, env._buffer)
+    finally:
+        env.close()
+        pygame.quit()
+
+
+def test_grayscale_downsampling_matches_the_full_frame():
+    env = AlienInvasionEnv(observation='pixels', grayscale=True,
+                           resize=(84, 84))
+    try:
+        small = env.reset(seed=1)
+        assert small.shape == (84, 84) and small.dtype == np.uint8
+        full = env._rgb.astype(np.float64)
+        luma = full @ np.array([0.299, 0.587, 0.114])
+        rows, columns = env._index
+        assert np.abs(luma[rows, columns] - small).max() <= 2
+    finally:
+        env.close()
+        pygame.quit()
+
+
+def test_downsampling_gathers_into_reused_buffers():
+    env = AlienInvasionEnv(observation='pixels', resize=(200, 300))
+    try:
+        obs = env.reset(seed=1)
+        assert obs is env._observation
+        assert np.array_equal(obs, env._rgb[env._index])
+
+        env.observe()
+        tracemalloc.start()
+        env.observe()
+        _size, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert peak < 200 * 300 * 3 // 4   # no frame-sized copy
+    finally:
+        env.close()
+        pygame.quit()
+
+
+def test_frame_skip_repeats_the_action():
+    env = AlienInvasionEnv(frame_skip=4)
+    try:
+        env.reset()
+        _obs, _reward, _done, info = env.step(RIGHT)
+        assert info['steps'] == env.steps == 4
+    finally:
+        env.close()
+        pygame.quit()
+
+
+def test_vector_env_stacks_pixel_observations():
+    venv = VectorEnv(2, max_steps=3, observation='pixels', grayscale=True,
+                     resize=(84, 84))
+    try:
+        obs = venv.reset(seed=0)
+        assert obs.shape == (2, 84, 84) and obs.dtype == np.uint8
+        assert venv.envs[0]._star_layers is venv.envs[1]._star_layers
+        for _ in range(3):
+            obs, _rewards, dones, infos = venv.step([NOOP, NOOP])
+        assert dones.all()
+        assert infos[0]['final_observation'].shape == (84, 84)
+    finally:
+        venv.close()
+        pygame.quit()
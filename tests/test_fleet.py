@@ -0,0 +1,62 @@
+"""Tests for the array-backed alien fleet."""
+
+import pytest
+
+from helpers import start_game
+
+
+def test_fleet_moves_as_one(game):
+    start_game(game)
+    before = [alien.x for alien in game.aliens]
+    game._update_aliens()
+    speed = game.settings.alien_speed * game.settings.fleet_direction
+    assert [alien.x for alien in game.aliens] == pytest.approx(
+        [x + speed for x in before])
+
+
+def test_rects_only_sync_when_needed(game):
+    start_game(game)
+    alien = game.aliens.sprites()[0]
+    rect_x = alien.rect.x
+    game._update_aliens()
+    assert alien.rect.x == rect_x  # nothing drew yet
+    game._update_screen()
+    assert alien.rect.x == int(alien.x)
+
+
+def test_fleet_drops_and_reverses_at_an_edge(game):
+    start_game(game)
+    alien = game.aliens.sprites()[0]
+    y_before = alien.y
+    alien.x = game.settings.screen_width - alien.rect.width
+    game._update_aliens()
+    assert game.settings.fleet_direction == -1
+    assert alien.y == y_before + game.settings.fleet_drop_speed
+
+
+def test_bounds_shrink_when_an_edge_alien_dies(game):
+    start_game(game)
+    left, right, bottom = game.aliens.bounds()
+    rightmost = max(game.aliens, key=lambda a: a.x)
+    for alien in [a for a in game.aliens if a.x == rightmost.x]:
+        alien.kill()
+    assert game.aliens.bounds()[1] < right
+    assert game.aliens.bounds()[0] == left
+
+
+def test_killed_alien_keeps_its_position(game):
+    start_game(game)
+    alien = game.aliens.sprites()[-1]
+    game._update_aliens()
+    x = alien.x
+    alien.kill()
+    assert alien.fleet is None
+    assert alien.rect.x == int(x)
+
+
+def test_empty_fleet_never_reaches_an_edge(game):
+    start_game(game)
+    game.aliens.empty()
+    game._update_aliens()
+    assert not game.aliens.at_edge()
+    assert not game.aliens.reached_bottom()
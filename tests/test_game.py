@@ -15,7 +15,7 @@ import pytest
 
 from alien_invasion import AlienInvasion
 from explosion import Explosion
-from bullet import Bullet
+from bullet import Bullet, bullet_image
 from helpers import start_game as _start_game
 
 
@@ -67,6 +67,7 @@ def test_missing_mixer_still_allows_play(game, monkeypatch):
     monkeypatch.setattr(pygame.mixer, "init",
                         lambda: (_ for _ in ()).throw(pygame.error("no audio")))
     ai = AlienInvasion()
+    ai._run_one_frame()  # audio starts after the first frame
     assert ai.sounds_enabled is False
     _start_game(ai)
     ai._fire_bullet()
@@ -77,7 +78,7 @@ def test_missing_mixer_still_allows_play(game, monkeypatch):
 
 def test_explosion_completes_while_game_inactive(game):
     _start_game(game)
-    game.explosions.add(Explosion((100, 100)))
+    game.explosions.add(Explosion(game, (100, 100)))
     game.stats.game_active = False
     start = time.time()
     while len(game.explosions) and time.time() - start < 5:
@@ -150,7 +151,7 @@ def test_new_game_resets_pause_autofire_and_effects(game):
     _start_game(game)
     game.game_paused = True
     game.autofire_active = True
-    game.explosions.add(Explosion((50, 50)))
+    game.explosions.add(Explosion(game, (50, 50)))
     game.stats.game_active = False
     _start_game(game)
     assert game.game_paused is False
@@ -166,22 +167,23 @@ def test_bullet_uses_settings(game):
     b = Bullet(game)
     assert b.width == game.settings.bullet_width
     assert b.height == game.settings.bullet_height
-    assert b.glow_width == game.settings.bullet_glow_width
-    assert b.core_color == game.settings.bullet_core_color
+    image, (dx, _dy) = bullet_image(game)
+    assert image.get_width() >= game.settings.bullet_glow_width
+    core = image.get_at((b.width // 2 - dx, b.height // 2))
+    assert tuple(core)[:3] == game.settings.bullet_core_color
 
 
 def test_star_count_stable_across_updates(game):
-    assert len(game.stars) == game.settings.star_count
+    assert game.stars.star_count == game.settings.star_count
     for _ in range(10):
         game._update_stars()
-    assert len(game.stars) == game.settings.star_count
+    assert game.stars.star_count == game.settings.star_count
 
 
-def test_star_recycles_to_top_when_off_screen(game):
-    star = game.stars.sprites()[0]
-    star.rect.y = game.settings.screen_height + 10
+def test_star_layers_wrap_to_top_when_off_screen(game):
+    game.stars.offsets[0] = game.settings.screen_height - 0.1
     game._update_stars()
-    assert star.rect.top <= 0
+    assert 0 <= game.stars.offsets[0] < 1
 
 
 # --- Full loop: drive run_game frames with injected events ---------------
@@ -255,10 +257,9 @@ def test_alien_touching_ship_costs_a_ship(game):
     _start_game(game)
     ships_before = game.stats.ships_left
     alien = game.aliens.sprites()[0]
-    # Alien.update rewrites rect.x from alien.x, so move both.
+    # The fleet owns alien positions; move the alien through it.
     alien.x = float(game.ship.rect.centerx)
-    alien.rect.x = game.ship.rect.centerx
-    alien.rect.y = game.ship.rect.y
+    alien.y = float(game.ship.rect.y)
     game._update_aliens()
     assert game.stats.ships_left == ships_before - 1
 
@@ -277,7 +278,8 @@ def test_check_events_dispatches_key_events(game):
 def test_alien_reaching_bottom_costs_a_ship(game):
     _start_game(game)
     ships_before = game.stats.ships_left
-    game.aliens.sprites()[0].rect.bottom = game.screen.get_rect().bottom
+    alien = game.aliens.sprites()[0]
+    alien.y = game.screen.get_rect().bottom - alien.rect.height
     game._check_aliens_bottom()
     assert game.stats.ships_left == ships_before - 1
 
@@ -315,7 +317,7 @@ def test_mouse_click_is_handled(game):
 
 def test_explosions_are_drawn(game):
     _start_game(game)
-    game.explosions.add(Explosion((100, 100), explosion_type='ship'))
+    game.explosions.add(Explosion(game, (100, 100), explosion_type='ship'))
     game._update_screen()
     assert len(game.explosions) == 1
 
@@ -374,6 +376,7 @@ def test_unloadable_sounds_disable_audio(monkeypatch):
                             pygame.error("bad file")))
     ai = AlienInvasion()
     try:
+        ai._run_one_frame()
         assert ai.sounds_enabled is False
         ai._fire_bullet()  # firing must still work silently
     finally:
@@ -0,0 +1,81 @@
+"""Tests for the simulation clocks and games driven by stepped time."""
+
+import time
+
+import pygame
+import pytest
+
+from alien_invasion import AlienInvasion
+from explosion import Explosion
+from game_clock import RealTimeClock, SteppedClock
+from helpers import start_game
+
+
+@pytest.fixture
+def sim_game():
+    ai = AlienInvasion(clock=SteppedClock(fps=60))
+    yield ai
+    pygame.quit()
+
+
+def test_stepped_clock_advances_a_fixed_step_without_sleeping():
+    clock = SteppedClock(fps=50)
+    assert clock.ticks() == 20
+    start = time.time()
+    for _ in range(1000):
+        clock.tick(50)
+    assert time.time() - start < 0.5
+    assert clock.ticks() == 20 + 1000 * 20
+    assert clock.frames == 1000
+    assert clock.get_fps() == 50
+
+
+def test_real_time_is_the_default(game):
+    assert isinstance(game.clock, RealTimeClock)
+    first = game.clock.ticks()
+    assert first >= 1   # 0 would mean "no timer pending"
+    time.sleep(0.02)
+    assert game.clock.ticks() >= first + 20
+
+
+def test_simulated_frames_run_faster_than_real_time(sim_game):
+    start_game(sim_game)
+    start = time.time()
+    for _ in range(120):  # two simulated seconds
+        sim_game._run_one_frame()
+    assert time.time() - start < 2
+    assert sim_game.clock.ticks() == round(121 * 1000 / 60)
+
+
+def test_respawn_waits_for_simulated_time(sim_game):
+    start_game(sim_game)
+    sim_game.stats.ships_left = 2
+    sim_game._ship_hit()
+    for _ in range(59):
+        sim_game.clock.tick()
+        sim_game._check_ship_respawn()
+    assert len(sim_game.aliens) == 0  # 983 ms: still waiting
+    sim_game.clock.tick()
+    sim_game._check_ship_respawn()
+    assert len(sim_game.aliens) > 0
+
+
+def test_autofire_cooldown_uses_simulated_time(sim_game):
+    start_game(sim_game)
+    sim_game.aliens.empty()
+    sim_game.autofire_active = True
+    sim_game._fire_bullet()  # what pressing SPACE does, at 17 ms
+    for _ in range(60):
+        sim_game._auto_fire_bullets()
+        sim_game.clock.tick()
+    # one second at a 500 ms cooldown: shots at 17 and 533 ms, the next
+    # one would be at 1050 ms.
+    assert len(sim_game.bullets) == 2
+
+
+def test_explosions_animate_on_simulated_time(sim_game):
+    sim_game.explosions.add(Explosion(sim_game, (100, 100)))
+    for _ in range(120):
+        sim_game._update_explosions()
+        sim_game.clock.tick()
+    assert len(sim_game.explosions) == 0
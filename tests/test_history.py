@@ -0,0 +1,143 @@
+"""Tests for the per-game history log and its streaming reports."""
+
+import numpy as np
+import pytest
+
+import history
+import storage
+from alien_invasion import main
+from history import (MAGIC, RECORD_DTYPE, GameHistory, difficulty_scores,
+                     games_per_day, player_scores, read_chunks)
+from helpers import start_game
+
+DAY = history.SECONDS_PER_DAY
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "history.bin")
+
+
+def _fill(path, games, batch=16):
+    """games: (player, difficulty, score, when) tuples."""
+    log = GameHistory(path, batch=batch)
+    for player, difficulty, score, when in games:
+        log.record(player, difficulty, score, level=score // 100 + 1,
+                   duration_ms=1000, frames=60, when=when)
+    log.close()
+    return log
+
+
+def test_games_are_buffered_and_appended_in_batches(path):
+    log = GameHistory(path, batch=3)
+    for score in (10, 20):
+        log.record("Ace", "normal", score, 1, 500, 30)
+    assert log.writes == 0
+    log.record("Ace", "hard", 30, 2, 500, 30)   # fills the batch
+    log.record("Bo", "easy", 40, 3, 500, 30)
+    assert log.writes == 1
+    log.close()
+    assert log.writes == 2
+
+    with open(path, 'rb') as f:
+        assert f.read(len(MAGIC)) == MAGIC
+    records = np.concatenate(list(read_chunks(path)))
+    assert records['score'].tolist() == [10, 20, 30, 40]
+    assert records['player'].tolist() == [b"Ace", b"Ace", b"Ace", b"Bo"]
+    assert records['difficulty'].tolist() == [1, 1, 2, 0]
+
+
+def test_reading_is_chunked_and_ignores_a_torn_record(path):
+    _fill(path, [("Ace", "normal", score, 0) for score in range(10)])
+    with open(path, 'ab') as f:
+        f.write(b"\x01" * (RECORD_DTYPE.itemsize - 1))
+    chunks = list(read_chunks(path, chunk=4))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert np.concatenate(chunks)['score'].tolist() == list(range(10))
+
+
+def test_a_torn_record_is_cut_off_before_the_next_batch(path):
+    _fill(path, [("Ace", "normal", 10, 0)])
+    with open(path, 'ab') as f:
+        f.write(b"\xb5\xda\x41")   # torn by a crash
+    _fill(path, [("Ace", "hard", 20, 0)])
+    records = np.concatenate(list(read_chunks(path)))
+    assert records['player'].tolist() == [b"Ace", b"Ace"]
+    assert records['score'].tolist() == [10, 20]
+    assert player_scores(path)["Ace"]["games"] == 2
+
+
+def test_missing_history_is_empty_and_foreign_file_rejected(path, tmp_path):
+    assert list(read_chunks(path)) == []
+    assert games_per_day(path) == {}
+    other = tmp_path / "profiles.json"
+    other.write_text('{"players": {}}')
+    with pytest.raises(ValueError):
+        list(read_chunks(str(other)))
+
+
+def test_player_and_difficulty_reports(path, monkeypatch):
+    monkeypatch.setattr(history, "CHUNK_RECORDS", 7)
+    games = [("Ace", "normal", score, 0) for score in range(0, 100, 10)]
+    games += [("bo", "hard", 50, 0), ("bo", "hard", 70, 0)]
+    _fill(path, games, batch=5)
+
+    players = player_scores(path)
+    assert list(players) == ["Ace", "bo"]
+    assert players["Ace"] == {'games': 10, 'mean': 45.0, 'p10': 0,
+                              'p50': 40, 'p90': 80, 'min': 0, 'max': 90}
+    assert players["bo"]["games"] == 2
+    assert players["bo"]["max"] == 70
+
+    difficulties = difficulty_scores(path)
+    assert difficulties["easy"] == {'games': 0, 'buckets': []}
+    assert difficulties["hard"]["buckets"] == [(50, 1), (70, 1)]
+    assert difficulties["normal"]["games"] == 10
+
+
+def test_large_scores_fall_in_close_buckets(path):
+    _fill(path, [("Ace", "normal", 1_000_003, 0)] * 3)
+    summary = player_scores(path)["Ace"]
+    assert summary["max"] == 1_000_003
+    assert 1_000_003 * 63 / 64 <= summary["p50"] <= 1_000_003
+
+
+def test_games_per_day(path):
+    _fill(path, [("Ace", "normal", 0, 0.5 * DAY), ("Ace", "normal", 0, 10),
+                 ("Ace", "normal", 0, 2.2 * DAY)])
+    assert games_per_day(path) == {"1970-01-01": 2, "1970-01-03": 1}
+
+
+def test_finished_game_is_logged_with_its_length(game):
+    start_game(game)
+    for _ in range(5):
+        game._update_game()
+        game.clock.tick(game.settings.fps)
+    game.stats.score = 300
+    game.stats.ships_left = 0
+    game._ship_hit()
+    game.history.close()
+
+    (records,) = read_chunks(storage.history_path())
+    (record,) = records.tolist()
+    _time, player, difficulty, score, level, duration_ms, frames = record
+    assert (player, difficulty, score, level) == (b"Player 1", 1, 300, 1)
+    assert frames == 5
+    assert duration_ms >= 0
+
+
+def test_main_history_reports(capsys):
+    _fill(storage.history_path(),
+          [("Ace", "easy", 1200, 3 * DAY), ("Ace", "easy", 800, 3 * DAY)])
+    assert main(["--history", "players"]) == 0
+    assert main(["--history", "difficulties"]) == 0
+    assert main(["--history", "days"]) == 0
+    out = capsys.readouterr().out
+    assert "Ace" in out and "1,200" in out
+    assert "easy" in out and "hard" not in out
+    assert "1970-01-04" in out
+
+
+def test_main_history_without_games(capsys):
+    assert main(["--history", "days"]) == 0
+    assert "No games recorded yet." in capsys.readouterr().out
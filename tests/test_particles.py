@@ -0,0 +1,89 @@
+"""Tests for the particle system behind a game's explosions."""
+
+import pytest
+
+from alien_invasion import AlienInvasion
+from explosion import Explosion
+from particles import ParticleSystem
+
+COLORS = [(255, 0, 0), (0, 255, 0)]
+
+
+def test_emit_adds_a_burst_with_its_own_owner():
+    system = ParticleSystem(capacity=4)
+    first = system.emit((10, 20), 3, 5, (2, 4), COLORS, 0.9, 0.3)
+    second = system.emit((50, 50), 5, 5, (2, 4), COLORS, 0.9, 0.3)
+    assert first != second
+    assert system.count == 8  # grew past the initial capacity
+    assert system.live_count(first) == 3
+    assert system.live_count(second) == 5
+    assert (system.pos[:3] == (10, 20)).all()
+    assert set(system.size[:8]) <= {2, 3, 4}
+
+
+def test_step_moves_damps_and_shrinks_everything_at_once():
+    system = ParticleSystem()
+    system.emit((0, 0), 10, 5, (3, 3), COLORS, 0.5, 1.0)
+    vel = system.vel[:10].copy()
+    system.step()
+    assert system.pos[:10] == pytest.approx(vel)
+    assert system.vel[:10] == pytest.approx(vel * 0.5)
+    assert (system.size[:10] == 2).all()
+
+
+def test_dead_particles_are_compacted_in_bulk():
+    system = ParticleSystem()
+    short = system.emit((0, 0), 4, 1, (1, 1), COLORS, 0.9, 1.0)
+    long = system.emit((0, 0), 6, 1, (5, 5), COLORS, 0.9, 1.0)
+    system.step()
+    assert system.count == 6
+    assert system.live_count(short) == 0
+    assert system.live_count(long) == 6
+    assert (system.owner[:6] == long).all()
+
+
+def test_update_steps_once_per_tick():
+    system = ParticleSystem(tick_ms=50)
+    system.emit((0, 0), 1, 1, (5, 5), COLORS, 0.9, 1.0)
+    system.update(1000)
+    system.update(1030)
+    assert system.size[0] == 5
+    system.update(1051)
+    assert system.size[0] == 4
+
+
+def test_explosion_removes_itself_when_its_particles_fade(game):
+    explosion = Explosion(game, (100, 100), explosion_type='ship')
+    game.explosions.add(explosion)
+    assert game.particles.live_count(explosion.owner) == 50
+    for _ in range(20):
+        game.particles.step()
+        game.explosions.update()
+    assert len(game.explosions) == 0
+
+
+def test_many_explosions_share_one_system_and_draw(game):
+    game.particles.clear()
+    for x in range(0, 600, 50):
+        game.explosions.add(Explosion(game, (x, 200)))
+    assert game.particles.count == 12 * 30
+    game.particles.draw(game.screen)
+    game.explosions.sprites()[0].draw(game.screen)
+
+
+def test_new_game_clears_leftover_particles(game):
+    game.explosions.add(Explosion(game, (100, 100)))
+    game._check_play_button(game.play_button.rect.center)
+    assert game.particles.count == 0
+
+
+def test_each_game_has_its_own_particle_system(game):
+    game.explosions.add(Explosion(game, (100, 100)))
+    other = AlienInvasion()
+    assert other.particles is not game.particles
+    assert game.particles.count == 30   # not wiped by the other game
+    other._check_play_button(other.play_button.rect.center)
+    other.particles.step()
+    assert game.particles.count == 30
+    assert (game.particles.size[:30] ==
+            game.particles.size[:30].round()).all()   # never stepped
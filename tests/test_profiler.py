@@ -0,0 +1,122 @@
+"""Tests for the in-game frame profiler overlay."""
+
+import argparse
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from cli import parse_args
+from game_clock import SteppedClock
+from helpers import press, start_game
+from profiler import PHASES, TIMED, FrameProfiler
+
+
+def run_frames(ai, count):
+    for _ in range(count):
+        ai._run_one_frame()
+
+
+def test_disabled_profiler_leaves_the_game_methods_alone(game):
+    assert not game.profiler.enabled
+    assert '_run_one_frame' not in vars(game)
+    assert '_update_screen' not in vars(game)
+    assert 'draw' not in vars(game.stars)
+    run_frames(game, 3)
+    assert game.profiler.frames == 0
+
+
+def test_enabled_profiler_times_every_phase(game):
+    start_game(game)
+    game.profiler.enable()
+    run_frames(game, 5)
+
+    assert game.profiler.frames == 5
+    means = game.profiler.means()
+    assert set(means) == set(PHASES)
+    for phase in ('frame', 'events', 'bullets', 'collisions', 'aliens',
+                  'explosions', 'screen', 'draw stars', 'flip'):
+        assert means[phase] > 0, phase
+    # phases run inside the frame, so none can take longer.
+    assert means['screen'] < means['frame']
+    assert means['collisions'] <= means['bullets']
+
+
+def test_disable_restores_the_game_methods(game):
+    game.profiler.enable()
+    run_frames(game, 2)
+    game.profiler.disable()
+    assert '_run_one_frame' not in vars(game)
+    for _phase, owner, method in TIMED:
+        target = game if owner is None else getattr(game, owner)
+        assert method not in vars(target), method
+    run_frames(game, 2)
+    assert game.profiler.frames == 2
+
+
+def test_ring_buffer_keeps_the_latest_window(game):
+    profiler = FrameProfiler(game, window=4)
+    game.profiler = profiler
+    profiler.enable()
+    run_frames(game, 10)
+    assert profiler.frames == 10
+    rows = profiler.recorded()
+    assert len(rows) == 4
+    profiler.samples[:, 0] = [9, 6, 7, 8]   # rows for frames 8, 9, 6, 7
+    profiler.frames = 10
+    assert profiler.recorded()[:, 0].tolist() == [7, 8, 9, 6]
+    profiler.disable()
+
+
+def test_f3_toggles_the_profiler(game):
+    press(game, pygame.K_F3)
+    assert game.profiler.enabled
+    press(game, pygame.K_F3)
+    assert not game.profiler.enabled
+
+
+def test_profile_overlay_option_starts_with_profiler_on():
+    options = parse_args(["--windowed", "800x600", "--profile-overlay"])
+    ai = AlienInvasion(options)
+    try:
+        assert ai.profiler.enabled
+    finally:
+        pygame.quit()
+
+
+def test_overlay_draws_counts_in_the_bottom_left(game):
+    start_game(game)
+    game.profiler.enable()
+    run_frames(game, 3)
+    rect = game.profiler.draw()
+    assert rect.left == 10
+    assert rect.bottom == game.settings.screen_height - 10
+    counts = game.profiler.counts()
+    assert counts['aliens'] == len(game.aliens)
+    assert counts['stars'] == game.settings.star_count
+
+
+def test_overlay_is_rendered_once_per_refresh(game):
+    profiler = game.profiler
+    profiler.enable()
+    profiler.draw()
+    panel = profiler._panel
+    profiler.frames += profiler.refresh - 1
+    profiler.draw()
+    assert profiler._panel is panel
+    profiler.frames += 1
+    profiler.draw()
+    assert profiler._panel is not panel
+    profiler.disable()
+
+
+def test_dirty_renderer_repaints_the_overlay():
+    options = argparse.Namespace(windowed=(800, 600), render='dirty',
+                                 profile_overlay=True)
+    ai = AlienInvasion(options, clock=SteppedClock())
+    try:
+        run_frames(ai, 3)
+        assert ai.profiler.frames == 3
+        assert ai.profiler.means()['screen'] > 0
+        assert ai.dirty_renderer.dirty_area < 800 * 600
+    finally:
+        pygame.quit()
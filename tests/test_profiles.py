@@ -1,9 +1,13 @@
 """Unit tests for the player profile store (no pygame needed)."""
 
 import json
+import multiprocessing
+import os
+import random
 
 import pytest
 
+import profiles
 from profiles import ProfileError, ProfileStore, normalize_name
 
 
@@ -203,7 +207,9 @@ def test_save_leaves_no_temp_file(tmp_path):
     store = ProfileStore(path)
     store.create("Ace")
     store.save()
-    assert [p.name for p in tmp_path.iterdir()] == ["profiles.json"]
+    # the lock file stays: removing it would race with other processes.
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "profiles.json", "profiles.json.lock"]
 
 
 def test_corrupt_file_falls_back_to_empty_store(tmp_path):
@@ -312,3 +318,342 @@ def test_ensure_default_keeps_existing_players(tmp_path):
     reloaded.ensure_default(None)
     assert reloaded.names() == ["Ace"]
     assert reloaded.active == "Ace"
+
+
+def test_leaderboard_top_k_is_kept_up_to_date(store, monkeypatch):
+    monkeypatch.setattr(profiles, "TOP_K", 3)
+    rng = random.Random(3)
+    names = [f"P{i}" for i in range(8)]
+
+    def ranked(limit):
+        everyone = sorted(store._players.values(),
+                          key=lambda r: (-r["high_score"], r["name"].lower()))
+        return [(r["name"], r["high_score"]) for r in everyone[:limit]]
+
+    for _ in range(300):
+        name = rng.choice(names)
+        try:
+            action = rng.choice(["create", "game", "delete"])
+            if action == "create":
+                store.create(name)
+            elif action == "game":
+                store.select(name)
+                store.record_game(rng.randrange(0, 1000, 50), 1)
+            else:
+                store.delete(name)
+        except ProfileError:
+            pass
+        assert store.leaderboard(limit=3) == ranked(3)
+        assert store.leaderboard(limit=6) == ranked(6)
+
+
+def test_every_change_bumps_the_version(store):
+    versions = [store.version]
+    store.create("Ace")
+    versions.append(store.version)
+    store.record_game(100, 1)
+    versions.append(store.version)
+    store.cycle_difficulty()
+    versions.append(store.version)
+    assert versions == sorted(set(versions))
+    store.leaderboard()
+    store.stats_for("Ace")
+    assert store.version == versions[-1]
+
+
+# --- write-behind ----------------------------------------------------------
+
+def _read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_write_behind_coalesces_a_burst_into_one_write(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    store = ProfileStore(path, write_behind=True, delay=0.05)
+    try:
+        for name in ("Ace", "Bo", "Cid"):
+            store.create(name)
+        for _ in range(10):
+            store.select_next()
+            store.cycle_difficulty()
+        assert store.writes == 0   # nothing waits on the disk
+
+        store._thread.join(0.05)
+        for _ in range(100):
+            if store.writes:
+                break
+            store._thread.join(0.01)
+        assert store.writes == 1
+        data = _read(path)
+        assert data.pop("journal") == 1   # the snapshot's generation
+        assert data == store.snapshot()
+    finally:
+        store.close()
+
+
+def test_close_flushes_pending_changes_at_once(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    store = ProfileStore(path, write_behind=True, delay=60)
+    store.create("Ace")
+    store.record_game(score=300, level=2)
+    store.close()
+    assert store.writes == 1
+    assert ProfileStore(path).stats_for("Ace")["high_score"] == 300
+    assert not (tmp_path / "profiles.json.tmp").exists()
+
+    # the store keeps working after a close.
+    store.select("Ace")
+    store.close()
+    assert store.writes == 2
+
+
+def test_synchronous_saves_stay_the_default(store):
+    store.create("Ace")
+    assert store.writes == 1
+    assert _read(store.path)["active"] == "Ace"
+
+
+# --- journal ---------------------------------------------------------------
+
+def _journal(tmp_path, **options):
+    return ProfileStore(str(tmp_path / "profiles.json"), journal=True,
+                        delay=60, **options)
+
+
+def test_journal_appends_changes_after_the_first_snapshot(tmp_path):
+    store = _journal(tmp_path)
+    store.create("Ace")
+    store.flush()
+    assert _read(store.path)["active"] == "Ace"   # first run: a snapshot
+    assert not os.path.exists(store.journal_path)
+
+    store.create("Bo")
+    store.record_game(score=500, level=3)
+    store.delete("Ace")
+    store.close()
+    with open(store.journal_path) as f:
+        lines = [json.loads(line) for line in f]
+    # the snapshot it extends, then one line per changed player, however
+    # often it changed.
+    assert lines == [{"journal": 1}, {"del": "ace"},
+                     {"put": store.stats_for("Bo")}, {"active": "Bo"}]
+    assert list(_read(store.path)["players"]) == ["ace"]
+
+    reloaded = ProfileStore(store.path)
+    assert reloaded.snapshot() == store.snapshot()
+    assert reloaded.leaderboard() == [("Bo", 500)]
+
+
+def test_journal_skips_torn_and_invalid_lines(tmp_path):
+    store = _journal(tmp_path)
+    store.create("Ace")
+    store.flush()
+    store.record_game(score=100, level=1)
+    store.close()
+    with open(store.journal_path, 'a') as f:
+        f.write('{"put": {"name": "", "high_score": 9}}\n')
+        f.write('{"put": {"name": "Bo", "high_score": -4, "difficulty": 1}}\n')
+        f.write('["not", "an", "entry"]\n')
+        f.write('{"put": {"name": "Cid", "high_sc')   # torn by a crash
+
+    reloaded = ProfileStore(store.path)
+    assert reloaded.names() == ["Ace", "Bo"]
+    assert reloaded.stats_for("Ace")["high_score"] == 100
+    assert reloaded.stats_for("Bo")["high_score"] == 0
+    assert reloaded.stats_for("Bo")["difficulty"] == "normal"
+
+
+def test_torn_journal_tail_does_not_swallow_the_next_batch(tmp_path):
+    store = _journal(tmp_path)
+    store.create("Ace")
+    store.flush()
+    store.record_game(score=100, level=1)
+    store.close()
+    with open(store.journal_path, 'a') as f:
+        f.write('{"put": {"name": "Ace", "high_sc')   # torn by a crash
+
+    reopened = _journal(tmp_path)
+    reopened.record_game(score=500, level=3)
+    reopened.close()
+    stats = ProfileStore(store.path).stats_for("Ace")
+    assert stats["high_score"] == 500
+    assert stats["games_played"] == 2
+
+
+def _fail_journal(journal_path, real_open=open):
+    def fake_open(path, *args, **kwargs):
+        if path == journal_path and args[:1] == ('a',):
+            raise OSError("disk full")
+        return real_open(path, *args, **kwargs)
+    return fake_open
+
+
+def test_failed_write_keeps_the_changes_pending(tmp_path, monkeypatch):
+    store = _journal(tmp_path)
+    store.create("Ace")
+    store.flush()
+    store.record_game(score=300, level=2)
+    monkeypatch.setattr("builtins.open", _fail_journal(store.journal_path))
+    store.flush()
+    assert not os.path.exists(store.journal_path)
+    monkeypatch.undo()
+
+    store.create("Bo")   # the next batch re-sends Ace with Bo
+    store.close()
+    reloaded = ProfileStore(store.path)
+    assert reloaded.names() == ["Ace", "Bo"]
+    assert reloaded.stats_for("Ace")["high_score"] == 300
+
+
+class _Crash(Exception):
+    pass
+
+
+def test_journal_left_by_a_crash_during_compaction_is_not_replayed(
+        tmp_path, monkeypatch):
+    store = _journal(tmp_path)
+    store.create("Ace")
+    store.create("Bo")
+    store.flush()
+    store.record_game(score=100, level=1)
+    store.delete("Bo")
+    store.flush()                      # journaled: games 1, Bo deleted
+    store.create("Bo")
+    store.record_game(score=200, level=2)
+    store.journal_limit = 0            # the next flush compacts
+
+    real_remove = os.remove
+
+    def crash(path):
+        if path == store.journal_path:
+            raise _Crash()             # killed between the two steps
+        real_remove(path)
+    monkeypatch.setattr(os, "remove", crash)
+    with pytest.raises(_Crash):
+        store.flush()
+    monkeypatch.undo()
+    assert os.path.exists(store.journal_path)
+
+    reloaded = ProfileStore(store.path)
+    assert reloaded.names() == ["Ace", "Bo"]
+    assert reloaded.stats_for("Bo")["games_played"] == 1
+    assert not os.path.exists(store.journal_path)
+
+    # journaling starts over cleanly on the new snapshot.
+    later = _journal(tmp_path)
+    later.record_game(score=300, level=3)
+    later.close()
+    assert ProfileStore(store.path).stats_for("Bo")["games_played"] == 2
+
+
+def test_journal_is_compacted_past_its_limit(tmp_path):
+    store = _journal(tmp_path, journal_limit=400)
+    store.create("Ace")
+    store.flush()
+    snapshots = store.writes
+    for score in range(20):
+        store.record_game(score=score, level=1)
+        store.flush()
+        assert store._journal_size <= 400
+    assert store.writes == snapshots + 20
+    assert _read(store.path)["players"]["ace"]["games_played"] > 1
+    store.close()
+    assert ProfileStore(store.path).stats_for("Ace")["games_played"] == 20
+
+
+def test_synchronous_save_folds_the_journal_in(tmp_path):
+    store = _journal(tmp_path)
+    store.create("Ace")
+    store.flush()
+    store.record_game(score=700, level=4)
+    store.close()
+    assert os.path.exists(store.journal_path)
+
+    admin = ProfileStore(store.path)
+    admin.create("Bo")
+    assert not os.path.exists(store.journal_path)
+    assert ProfileStore(store.path).stats_for("Ace")["high_score"] == 700
+
+
+# --- several processes -----------------------------------------------------
+
+def test_saves_merge_instead_of_clobbering(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    setup = ProfileStore(path)
+    setup.create("Bo")
+    setup.create("Ace")
+    game, admin = ProfileStore(path), ProfileStore(path)
+
+    game.record_game(score=900, level=5)
+    admin.record_game(score=300, level=7)
+    admin.create("Cid")
+    admin.delete("Bo")
+    game.record_game(score=100, level=1)
+
+    for store in (game, ProfileStore(path)):
+        ace = store.stats_for("Ace")
+        assert (ace["high_score"], ace["best_level"]) == (900, 7)
+        assert (ace["games_played"], ace["total_score"]) == (3, 1300)
+        assert store.names() == ["Ace", "Cid"]
+        # game keeps its player; the file names the last saver's.
+        assert store.active == "Ace"
+    assert game.leaderboard() == [("Ace", 900), ("Cid", 0)]
+
+
+def test_journal_saves_merge_too(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    game = ProfileStore(path, journal=True, delay=60)
+    game.create("Ace")
+    game.flush()
+    game.record_game(score=400, level=2)
+    game.flush()
+
+    admin = ProfileStore(path)
+    admin.record_game(score=50, level=1)
+    admin.create("Bo")
+    game.set_difficulty("hard")
+    game.record_game(score=10, level=1)
+    game.close()
+
+    ace = ProfileStore(path).stats_for("Ace")
+    assert ace["games_played"] == 3
+    assert ace["total_score"] == 460
+    assert ace["difficulty"] == "hard"
+    assert ProfileStore(path).names() == ["Ace", "Bo"]
+    assert ProfileStore(path).active == "Ace"   # the game saved last
+
+
+def _hammer(path, name, games, journal):
+    store = ProfileStore(path, journal=journal, delay=0.001)
+    if name not in store.names():
+        store.create(name)
+    for score in range(1, games + 1):
+        store.select("Shared")
+        store.record_game(score=score, level=1)
+        store.select(name)
+        store.record_game(score=score, level=2)
+    store.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_many_processes_lose_no_games(tmp_path):
+    path = str(tmp_path / "profiles.json")
+    ProfileStore(path).create("Shared")
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_hammer,
+                               args=(path, f"P{i}", 25, i % 2 == 1))
+               for i in range(8)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    store = ProfileStore(path)
+    shared = store.stats_for("Shared")
+    assert shared["games_played"] == 8 * 25
+    assert shared["total_score"] == 8 * sum(range(1, 26))
+    assert shared["high_score"] == 25
+    for i in range(8):
+        assert store.stats_for(f"P{i}")["games_played"] == 25
@@ -0,0 +1,93 @@
+"""Tests for the opt-in dirty-rectangle renderer."""
+
+import pygame
+import pytest
+
+from alien_invasion import AlienInvasion
+from cli import parse_args
+from helpers import start_game
+
+
+@pytest.fixture
+def dirty_game():
+    ai = AlienInvasion(parse_args(["--windowed", "800x600",
+                                   "--render", "dirty"]))
+    yield ai
+    pygame.quit()
+
+
+def test_full_render_is_the_default(game):
+    assert parse_args([]).render == "full"
+    assert game.dirty_renderer is None
+    game._update_screen()
+    assert game.dirty_area == game.settings.screen_width * game.settings.screen_height
+
+
+def test_first_dirty_frame_covers_the_screen(dirty_game):
+    dirty_game._update_screen()
+    assert dirty_game.dirty_area >= 800 * 600
+
+
+def test_quiet_frames_update_a_small_area(dirty_game):
+    start_game(dirty_game)
+    dirty_game.aliens.empty()
+    dirty_game._update_screen()
+    dirty_game._update_screen()
+    # only the ship is repainted; the unchanged HUD is left alone.
+    assert 0 < dirty_game.dirty_area < 800 * 600 // 20
+
+
+def test_changed_hud_text_is_repainted(dirty_game):
+    start_game(dirty_game)
+    dirty_game.aliens.empty()
+    dirty_game._update_screen()
+    dirty_game._update_screen()
+    quiet = dirty_game.dirty_area
+    dirty_game.stats.score = 1000
+    dirty_game.sb.prep_score()
+    dirty_game._update_screen()
+    assert dirty_game.dirty_area > quiet
+
+
+def test_moved_sprites_leave_no_trail(dirty_game):
+    start_game(dirty_game)
+    dirty_game.aliens.empty()
+    dirty_game._update_screen()
+    old_rect = dirty_game.ship.rect.copy()
+    dirty_game.ship.x += 200
+    dirty_game.ship.rect.x = dirty_game.ship.x
+    dirty_game._update_screen()
+    background = dirty_game.dirty_renderer.background
+    assert (dirty_game.screen.get_at(old_rect.center) ==
+            background.get_at(old_rect.center))
+
+
+def test_dirty_mode_runs_full_gameplay_frames(dirty_game):
+    start_game(dirty_game)
+    dirty_game.autofire_active = True
+    for _ in range(30):
+        dirty_game._run_one_frame()
+    dirty_game.game_paused = True
+    dirty_game._run_one_frame()
+    dirty_game.stats.game_active = False
+    dirty_game._run_one_frame()
+    assert dirty_game.dirty_area > 0
+
+
+def test_idle_panel_is_only_repainted_when_it_changes(dirty_game):
+    panel = dirty_game.profile_panel
+    renders = []
+    render_panel = panel._render_panel
+    panel._render_panel = lambda: renders.append(1) or render_panel()
+
+    for _ in range(3):
+        dirty_game._update_screen()
+    quiet = dirty_game.dirty_area
+    assert len(renders) == 1
+
+    dirty_game.profiles.create("Ace")   # the leaderboard changes
+    dirty_game._update_screen()
+    assert len(renders) == 2
+    assert dirty_game.dirty_area > quiet
+    dirty_game._update_screen()
+    assert dirty_game.dirty_area == quiet
@@ -0,0 +1,181 @@
+"""Tests for seeded randomness, session recording and headless replay."""
+
+import argparse
+import gzip
+import json
+
+import numpy as np
+import pygame
+import pytest
+
+from alien_invasion import AlienInvasion, main
+from cli import parse_args
+from game_clock import SteppedClock
+from random_streams import RandomStreams
+from replay import (Recorder, Replay, decode_event, encode_event,
+                    load_replay, run_replay)
+
+
+def post(event_type, **attrs):
+    pygame.event.post(pygame.event.Event(event_type, **attrs))
+
+
+def record_session(path, frames=1500, seed=None):
+    """Play a scripted session with --record, ending with Q."""
+    options = argparse.Namespace(windowed=(800, 600), record=str(path),
+                                 seed=seed)
+    ai = AlienInvasion(options, clock=SteppedClock())
+    script = {
+        5: (pygame.KEYDOWN, dict(key=pygame.K_RETURN, unicode="\r")),
+        30: (pygame.KEYDOWN, dict(key=pygame.K_SPACE, unicode=" ")),
+        40: (pygame.KEYDOWN, dict(key=pygame.K_RIGHT, unicode="")),
+        200: (pygame.KEYUP, dict(key=pygame.K_RIGHT)),
+        frames - 1: (pygame.KEYDOWN, dict(key=pygame.K_q, unicode="q")),
+    }
+    try:
+        for frame in range(frames):
+            if frame in script:
+                event_type, attrs = script[frame]
+                post(event_type, **attrs)
+            ai._run_one_frame()
+    except SystemExit:
+        pass
+    stats = ai.stats
+    pygame.quit()
+    return stats
+
+
+# --- random streams -------------------------------------------------------
+
+def test_streams_repeat_for_the_same_seed():
+    a, b = RandomStreams(7), RandomStreams(7)
+    assert a.python('stars').random() == b.python('stars').random()
+    assert (a.numpy('particles').random(3) ==
+            b.numpy('particles').random(3)).all()
+    assert a.python('stars').random() != a.python('other').random()
+    assert RandomStreams(8).python('stars').random() != \
+        a.python('stars').random()
+
+
+def test_unseeded_streams_still_have_a_seed():
+    assert isinstance(RandomStreams().seed, int)
+
+
+def test_seed_option_reproduces_the_starfield():
+    layers = []
+    for _ in range(2):
+        ai = AlienInvasion(argparse.Namespace(windowed=(800, 600), seed=42))
+        layers.append([pygame.image.tobytes(layer, "RGB")
+                       for layer in ai.stars.layers])
+        pygame.quit()
+    assert layers[0] == layers[1]
+
+
+def test_seed_option_reproduces_explosions():
+    positions = []
+    for _ in range(2):
+        ai = AlienInvasion(argparse.Namespace(windowed=(800, 600), seed=3))
+        ai.particles.emit((100, 100), 10, 5, (2, 4), [(255, 0, 0)], 0.9, 0.3)
+        positions.append(ai.particles.vel[:10].copy())
+        pygame.quit()
+    assert np.array_equal(positions[0], positions[1])
+
+
+def test_seed_and_replay_options_parse():
+    options = parse_args(["--seed", "5", "--record", "a.replay"])
+    assert options.seed == 5
+    assert options.record == "a.replay"
+    assert parse_args(["--replay", "a.replay"]).replay == "a.replay"
+    assert parse_args([]).seed is None
+
+
+# --- recording and replaying ----------------------------------------------
+
+@pytest.mark.parametrize("event", [
+    pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a"),
+    pygame.event.Event(pygame.KEYUP, key=pygame.K_LEFT),
+    pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=(12, 34)),
+    pygame.event.Event(pygame.QUIT),
+])
+def test_events_survive_encoding(event):
+    decoded = decode_event(json.loads(json.dumps(encode_event(event))))
+    assert decoded.type == event.type
+    for attr in ('key', 'unicode', 'pos'):
+        assert getattr(decoded, attr, None) == getattr(event, attr, None)
+
+
+def test_unhandled_events_are_not_recorded():
+    assert encode_event(pygame.event.Event(pygame.MOUSEMOTION,
+                                           pos=(1, 1))) is None
+
+
+def test_recorder_latches_time_for_the_whole_frame(game, tmp_path):
+    recorder = Recorder(game, str(tmp_path / "session.replay"))
+    assert game.clock is recorder
+    first = recorder.ticks()
+    assert recorder.ticks() == first
+    game._run_one_frame()
+    assert recorder.ticks() > first
+    recorder.close()
+
+
+def test_replay_reproduces_the_recorded_session(tmp_path):
+    path = tmp_path / "session.replay"
+    stats = record_session(path)
+    assert stats.score > 0 and stats.level > 1
+
+    header, frames, result = load_replay(str(path))
+    assert header['size'] == [800, 600]
+    assert len(frames) == 1500
+    assert result['score'] == stats.score
+
+    recorded, replayed = run_replay(str(path))
+    assert replayed == recorded
+
+
+def test_replay_file_is_compact(tmp_path):
+    path = tmp_path / "session.replay"
+    record_session(path)
+    # 1500 frames: mostly a repeated time step, gzipped.
+    assert path.stat().st_size < 2000
+
+
+def test_replay_clock_follows_the_recorded_steps():
+    replay = Replay({'start': 100}, [[0], [17, ['q']], [16]])
+    assert replay.ticks() == 100
+    assert replay.get() == []
+    replay.tick()
+    assert replay.ticks() == 117
+    assert [e.type for e in replay.get()] == [pygame.QUIT]
+    replay.tick()
+    replay.tick()
+    assert replay.done and replay.get() == []
+
+
+def test_replay_command_reports_a_match(tmp_path, capsys):
+    path = tmp_path / "session.replay"
+    record_session(path, frames=300)
+    assert main(["--replay", str(path)]) == 0
+    assert "Matches the recording." in capsys.readouterr().out
+
+
+def test_replay_command_reports_a_mismatch(tmp_path, capsys):
+    path = tmp_path / "session.replay"
+    record_session(path, frames=300)
+    with gzip.open(path, 'rt') as f:
+        lines = f.readlines()
+    result = json.loads(lines[-1])
+    result['result']['score'] += 10
+    lines[-1] = json.dumps(result) + "\n"
+    with gzip.open(path, 'wt') as f:
+        f.writelines(lines)
+
+    assert main(["--replay", str(path)]) == 1
+    assert "mismatch: score" in capsys.readouterr().out
+
+
+def test_unreadable_replay_is_an_error(tmp_path, capsys):
+    path = tmp_path / "junk.replay"
+    path.write_text("not a replay")
+    assert main(["--replay", str(path)]) == 1
+    assert "error:" in capsys.readouterr().out
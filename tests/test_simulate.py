@@ -0,0 +1,72 @@
+"""Tests for the self-play tournament runner."""
+
+import json
+
+import numpy as np
+import pygame
+import pytest
+
+import simulate
+from env import FIRE, LEFT_FIRE, RIGHT_FIRE
+from simulate import POLICIES, autopilot, resolve_policy, run, summarize
+
+
+@pytest.fixture(autouse=True)
+def quit_pygame():
+    yield
+    pygame.quit()
+
+
+def test_autopilot_heads_for_the_bottom_row(game):
+    game._check_play_button(game.play_button.rect.center)
+    rng = np.random.default_rng(0)
+    game.ship.rect.centerx = 0
+    assert autopilot(game, rng, epsilon=0) == RIGHT_FIRE
+    game.ship.rect.centerx = game.settings.screen_width
+    assert autopilot(game, rng, epsilon=0) == LEFT_FIRE
+
+    game.aliens.empty()
+    assert autopilot(game, rng, epsilon=0) == FIRE
+
+
+def test_policies_resolve_by_name_or_import_path():
+    assert resolve_policy('random') is POLICIES['random']
+    assert resolve_policy('simulate:idle') is simulate.idle
+    with pytest.raises(ValueError):
+        resolve_policy('nobody')
+
+
+def test_summarize_reports_distributions():
+    results = [{'score': s, 'level': level, 'frames': 60 * s,
+                'truncated': s > 2}
+               for s, level in ((1, 1), (2, 1), (3, 2))]
+    summary = summarize(results)
+    assert summary['games'] == 3
+    assert summary['truncated'] == 1
+    assert summary['score']['p50'] == 2
+    assert summary['levels_reached'] == {'1': 2, '2': 1}
+    assert summary['survival_s']['max'] == 3
+
+
+def test_run_plays_every_difficulty_with_the_same_seeds():
+    report = run(games=2, difficulties=['easy', 'hard'], policy='random',
+                 workers=1, max_frames=120, seed=3)
+    assert set(report['difficulties']) == {'easy', 'hard'}
+    for summary in report['difficulties'].values():
+        assert summary['games'] == 2
+        assert summary['truncated'] == 2
+        assert summary['survival_s']['mean'] == 2.0
+    json.dumps(report)
+
+
+def test_worker_processes_give_the_same_results():
+    args = dict(games=2, difficulties=['normal'], policy='autopilot',
+                max_frames=300, seed=0)
+    inline = run(workers=1, **args)['difficulties']
+    pooled = run(workers=2, **args)['difficulties']
+    assert inline == pooled
+
+
+def test_main_reports_unknown_policies(capsys):
+    assert simulate.main(['--policy', 'nobody', '--games', '1']) == 1
+    assert 'unknown policy' in capsys.readouterr().err
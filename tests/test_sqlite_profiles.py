@@ -0,0 +1,180 @@
+"""Tests for the SQLite profile store (no pygame needed)."""
+
+import random
+
+import pytest
+
+import alien_invasion
+import storage
+from profiles import ProfileError, ProfileStore
+from sqlite_profiles import SQLiteProfileStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    yield s
+    s.close()
+
+
+def test_create_select_and_cycle(store):
+    for name in ("Cid", "ace", "Bob"):
+        store.create(name)
+    assert store.active == "Bob"
+    assert store.names() == ["ace", "Bob", "Cid"]
+    with pytest.raises(ProfileError):
+        store.create("BOB")
+    assert store.select("ACE") == "ace"
+    assert [store.select_next() for _ in range(3)] == ["Bob", "Cid", "ace"]
+
+
+def test_delete_falls_back_to_the_first_player(store):
+    assert store.select_next() is None
+    store.create("Ace")
+    store.create("Bob")
+    store.delete("bob")
+    assert store.active == "Ace"
+    store.delete("Ace")
+    assert store.active is None
+    assert store.high_score == 0
+    with pytest.raises(ProfileError):
+        store.delete("ghost")
+
+
+def test_record_game_and_difficulty(store):
+    store.record_game(100, 2)   # no active player: nothing happens
+    store.create("Ace")
+    store.record_game(300, 2)
+    store.record_game(100, 4)
+    store.cycle_difficulty()
+    assert store.stats_for("ace") == {
+        "name": "Ace", "high_score": 300, "best_level": 4,
+        "games_played": 2, "total_score": 400, "difficulty": "hard"}
+    with pytest.raises(ProfileError):
+        store.set_difficulty("nightmare")
+
+
+def test_leaderboard_uses_the_high_score_index(store):
+    for name, score in (("Ace", 900), ("bob", 500), ("Cid", 900)):
+        store.create(name)
+        store.record_game(score, 1)
+    assert store.leaderboard(limit=2) == [("Ace", 900), ("Cid", 900)]
+    plan = store._db.execute(
+        "EXPLAIN QUERY PLAN SELECT name, high_score FROM players "
+        "ORDER BY high_score DESC, key LIMIT 5").fetchall()
+    assert any("players_by_high_score" in row[-1] for row in plan)
+    assert not any("TEMP B-TREE" in row[-1] for row in plan)
+
+
+def test_changes_persist_without_an_explicit_save(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    store = SQLiteProfileStore(path)
+    store.create("Ace")
+    store.record_game(700, 3)
+    store.set_difficulty("easy")
+    store.close()
+
+    reopened = SQLiteProfileStore(path)
+    try:
+        assert reopened.active == "Ace"
+        assert reopened.high_score == 700
+        assert reopened.difficulty == "easy"
+    finally:
+        reopened.close()
+
+
+def test_json_players_are_imported_once(tmp_path):
+    json_path = str(tmp_path / "profiles.json")
+    legacy = ProfileStore(json_path)
+    legacy.create("Ace")
+    legacy.record_game(500, 3)
+    legacy.create("Bob")
+    db_path = str(tmp_path / "profiles.db")
+
+    store = SQLiteProfileStore(db_path, import_from=json_path)
+    assert store.snapshot() == legacy.snapshot()
+    store.delete("Ace")
+    store.close()
+
+    # a second open does not bring the deleted player back.
+    store = SQLiteProfileStore(db_path, import_from=json_path)
+    try:
+        assert store.names() == ["Bob"]
+    finally:
+        store.close()
+
+
+def test_ensure_default_imports_a_legacy_high_score(store, tmp_path):
+    legacy = tmp_path / "high_score.txt"
+    legacy.write_text("1234")
+    store.ensure_default(str(legacy))
+    assert store.active == "Player 1"
+    assert store.high_score == 1234
+    store.ensure_default(str(legacy))
+    assert store.names() == ["Player 1"]
+
+
+def test_behaves_like_the_json_store(tmp_path):
+    json_store = ProfileStore(str(tmp_path / "profiles.json"))
+    db_store = SQLiteProfileStore(str(tmp_path / "profiles.db"))
+    rng = random.Random(7)
+    names = ["Ace", "bob", "Cid", "dee", "Eve"]
+    operations = {
+        "create": lambda store, name: store.create(name),
+        "select": lambda store, name: store.select(name),
+        "next": lambda store, name: store.select_next(),
+        "delete": lambda store, name: store.delete(name),
+        "game": lambda store, name: store.record_game(len(name) * 100, 2),
+        "difficulty": lambda store, name: store.cycle_difficulty(),
+    }
+    try:
+        for _ in range(300):
+            operation = operations[rng.choice(list(operations))]
+            name = rng.choice(names)
+            results = []
+            for store in (json_store, db_store):
+                try:
+                    results.append(operation(store, name))
+                except ProfileError:
+                    results.append("error")
+            assert results[0] == results[1]
+            assert json_store.snapshot() == db_store.snapshot()
+            assert json_store.leaderboard() == db_store.leaderboard()
+    finally:
+        db_store.close()
+
+
+def test_profile_db_option_moves_the_game_to_sqlite(isolated_data_files,
+                                                    capsys):
+    ProfileStore(storage.PROFILES_FILE).create("Ace")
+    assert alien_invasion.main(["--profile-db", "--list-players"]) == 0
+    assert "Ace" in capsys.readouterr().out
+    assert alien_invasion.main(["--profile-db", "--delete-player", "Ace"]) == 0
+
+    store = SQLiteProfileStore(str(isolated_data_files / "profiles.db"))
+    try:
+        assert store.names() == []
+    finally:
+        store.close()
+    # the JSON file is only read, never changed.
+    assert ProfileStore(storage.PROFILES_FILE).names() == ["Ace"]
+
+
+def test_import_and_export_match_the_json_store(tmp_path):
+    records = [{"name": "Ace", "high_score": 90, "games_played": 2},
+               {"name": "ace", "high_score": 40, "games_played": 1,
+                "total_score": 40, "best_level": 3},
+               {"name": ""}, None,
+               {"name": "Bo", "difficulty": "hard", "total_score": 7}]
+    stores = [ProfileStore(str(tmp_path / "profiles.json")),
+              SQLiteProfileStore(str(tmp_path / "profiles.db"))]
+    for s in stores:
+        s.create("Bo")
+        s.record_game(score=10, level=1)
+    results = [s.import_records(iter(records)) for s in stores]
+    assert results[0] == results[1] == (1, 2, 2)
+    exported = [list(s.export_records()) for s in stores]
+    assert exported[0] == exported[1]
+    assert exported[0][0] == {"name": "Ace", "high_score": 90,
+                              "best_level": 3, "games_played": 3,
+                              "total_score": 40, "difficulty": "normal"}
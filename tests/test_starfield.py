@@ -0,0 +1,46 @@
+"""Tests for the pre-baked parallax starfield."""
+
+from starfield import COLORKEY, LAYER_SPEEDS, Starfield
+
+
+class _BlitCounter:
+    """Stands in for the screen and counts blits."""
+
+    def __init__(self):
+        self.blits = 0
+
+    def blit(self, source, dest):
+        self.blits += 1
+
+
+def test_one_layer_per_speed_band(game):
+    assert len(game.stars.layers) == len(LAYER_SPEEDS)
+    for layer in game.stars.layers:
+        assert layer.get_size() == game.screen.get_size()
+        assert layer.get_colorkey()[:3] == COLORKEY
+
+
+def test_stars_are_baked_into_the_layers(game):
+    lit = 0
+    for layer in game.stars.layers:
+        width, height = layer.get_size()
+        for x in range(0, width, 2):
+            for y in range(0, height, 50):
+                if layer.get_at((x, y))[:3] != COLORKEY:
+                    lit += 1
+    assert lit > 0
+
+
+def test_draw_cost_does_not_depend_on_star_count(game):
+    game.settings.star_count = 5000
+    dense = Starfield(game)
+    for field in (game.stars, dense):
+        field.update()
+        screen = _BlitCounter()
+        field.draw(screen)
+        assert screen.blits <= 2 * len(LAYER_SPEEDS)
+
+
+def test_layers_scroll_at_their_own_speeds(game):
+    game.stars.update()
+    assert game.stars.offsets == list(LAYER_SPEEDS)
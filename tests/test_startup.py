@@ -0,0 +1,94 @@
+"""Tests for the fast startup: lazy imports, deferred work and the trace."""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pygame
+
+import alien_invasion
+from alien_invasion import AlienInvasion, main
+from cli import parse_args
+from startup import StartupTrace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_trace_times_each_step_from_the_one_before():
+    trace = StartupTrace(started=0.0)
+    trace.mark("first")
+    trace.mark("second")
+    names = [name for name, _seconds in trace.steps]
+    assert names == ["first", "second"]
+    assert all(seconds >= 0 for _name, seconds in trace.steps)
+
+    lines = trace.report().splitlines()
+    assert lines[0] == "Startup trace:"
+    assert lines[1].endswith("ms  first")
+    assert lines[-1].endswith("ms  total")
+
+
+def test_admin_commands_do_not_import_pygame(tmp_path):
+    script = textwrap.dedent(f"""
+        import sys
+        import alien_invasion
+        import storage
+        storage.PROFILES_FILE = {str(tmp_path / "profiles.json")!r}
+        storage.HIGH_SCORE_FILE = {str(tmp_path / "high_score.txt")!r}
+        code = alien_invasion.main(["--list-players"])
+        loaded = [name for name in ("pygame", "numpy", "game")
+                  if name in sys.modules]
+        print("loaded:", loaded)
+        sys.exit(code)
+    """)
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert "loaded: []" in result.stdout
+
+
+def test_the_game_does_not_import_the_launcher():
+    # run as a script, the launcher is __main__; importing it again from
+    # the game would execute it a second time.
+    script = "import sys, game; print('alien_invasion' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT,
+                            capture_output=True, text=True, timeout=60,
+                            env=dict(os.environ,
+                                     PYGAME_HIDE_SUPPORT_PROMPT="1"))
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+
+def test_sounds_and_fleet_wait_for_the_first_frame(game):
+    assert len(game.aliens) == 0
+    assert game.shoot_sound is None
+    game._run_one_frame()
+    assert len(game.aliens) > 0
+    assert game._startup_pending is False
+
+    aliens = len(game.aliens)
+    game._run_one_frame()  # the deferred work runs only once
+    assert len(game.aliens) == aliens
+
+
+def test_startup_trace_is_printed_after_the_first_frame(capsys):
+    trace = StartupTrace()
+    ai = AlienInvasion(parse_args(["--startup-trace"]), startup=trace)
+    try:
+        assert "Startup trace:" not in capsys.readouterr().out
+        ai._run_one_frame()
+        out = capsys.readouterr().out
+    finally:
+        pygame.quit()
+    for step in ("display mode", "first frame", "audio and sounds", "fleet",
+                 "total"):
+        assert step in out
+
+
+def test_startup_trace_for_an_admin_command(capsys):
+    assert main(["--list-players", "--startup-trace"]) == 0
+    out = capsys.readouterr().out
+    assert "launcher imports" in out
+    assert "admin command" in out
+    assert alien_invasion.AlienInvasion is AlienInvasion
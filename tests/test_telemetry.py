@@ -0,0 +1,105 @@
+"""Tests for frame telemetry buffers, histograms and the JSONL writer."""
+
+import argparse
+import json
+
+import numpy as np
+import pygame
+import pytest
+
+from alien_invasion import AlienInvasion
+from game_clock import SteppedClock
+from helpers import start_game
+from telemetry import FRAME_DTYPE, Telemetry, histogram, summarize
+
+
+@pytest.fixture
+def telemetry_game():
+    options = argparse.Namespace(windowed=(800, 600), telemetry=True)
+    ai = AlienInvasion(options, clock=SteppedClock())
+    yield ai
+    ai.telemetry.close()
+    pygame.quit()
+
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_histogram_buckets_keep_two_significant_digits():
+    assert histogram([0, 1, 1, 127]) == [[0, 1], [1, 2], [127, 1]]
+    # 16667 us has 15 bits, so buckets are 256 us wide there.
+    [[lower, count]] = histogram([16_667, 16_700, 16_800])
+    assert (lower, count) == (16_640, 3)
+    for value in (200, 5_000, 1_000_000):
+        [[lower, _count]] = histogram([value])
+        assert value - lower <= value / 64
+
+
+def test_summarize_reports_percentiles_counts_and_states():
+    frames = np.zeros(100, dtype=FRAME_DTYPE)
+    frames['interval_ns'] = np.arange(1, 101) * 1_000_000
+    frames['work_ns'] = 2_000_000
+    frames['fps'] = 60
+    frames['aliens'] = 30
+    frames['level'][50:] = 2
+    frames['state'][:10] = 0
+    frames['state'][10:] = 1
+    summary = summarize(frames)
+    assert summary['frames'] == 100
+    assert summary['frame_ms']['p50'] == 50.5
+    assert summary['frame_ms']['max'] == 100
+    assert set(summary['frame_ms']) >= {'p90', 'p95', 'p99', 'p999'}
+    assert summary['work_ms']['histogram_us'] == [[2000, 100]]
+    assert summary['sprites']['aliens'] == {'mean': 30.0, 'max': 30}
+    assert summary['level'] == {'min': 0, 'max': 2}
+    assert summary['states'] == {'idle': 10, 'playing': 90, 'paused': 0}
+
+
+def test_telemetry_is_off_by_default(game):
+    assert game.telemetry is None
+    game._run_one_frame()
+
+
+def test_full_buffers_are_written_next_to_the_profiles(telemetry_game,
+                                                        isolated_data_files):
+    telemetry = Telemetry(telemetry_game, telemetry_game.telemetry.path,
+                          capacity=10)
+    telemetry_game.telemetry = telemetry
+    start_game(telemetry_game)
+    for _ in range(25):
+        telemetry_game._run_one_frame()
+    telemetry.close()
+
+    assert telemetry.path == str(isolated_data_files / "telemetry.jsonl")
+    lines = read_lines(telemetry.path)
+    assert [line['frames'] for line in lines] == [10, 10, 5]
+    assert [line['batch'] for line in lines] == [0, 1, 2]
+    assert lines[0]['states']['playing'] == 10
+    assert lines[0]['sprites']['aliens']['max'] > 0
+    assert lines[0]['level']['max'] == 1
+    assert lines[0]['work_ms']['mean'] > 0
+
+
+def test_writer_backlog_drops_frames_instead_of_blocking(telemetry_game):
+    telemetry = telemetry_game.telemetry
+    # take every spare buffer, as if the writer were stuck on them.
+    spares = []
+    while not telemetry._free.empty():
+        spares.append(telemetry._free.get())
+    for _ in range(3):
+        telemetry_game._run_one_frame()
+    telemetry.flush()
+    assert telemetry.dropped == 3
+    assert telemetry._count == 0
+
+
+def test_quitting_flushes_telemetry(telemetry_game):
+    for _ in range(5):
+        telemetry_game._run_one_frame()
+    with pytest.raises(SystemExit):
+        telemetry_game._quit_game()
+    [line] = read_lines(telemetry_game.telemetry.path)
+    assert line['frames'] == 5
+    assert line['states']['idle'] == 5
@@ -0,0 +1,76 @@
+"""Tests for the difficulty tuner."""
+
+import argparse
+
+import pygame
+import pytest
+
+import tune
+from settings import DIFFICULTY_PRESETS
+from tune import (PARAMETERS, EvaluationCache, format_presets, loss,
+                  preset_vector, snap, target)
+
+
+@pytest.fixture(autouse=True)
+def quit_pygame():
+    yield
+    pygame.quit()
+
+
+def test_snap_clamps_and_rounds_to_the_grid():
+    assert snap('alien_speed', 2.04) == 2.0
+    assert snap('alien_speed', 99) == PARAMETERS['alien_speed'][1]
+    assert snap('autofire_cooldown', 503) == 500
+    assert isinstance(snap('autofire_cooldown', 503.0), int)
+    assert preset_vector('normal') == (3.5, 5.0, 2.0, 500)
+
+
+def test_neighbours_step_along_each_parameter():
+    candidates = tune._neighbours((3.5, 5.0, 2.0, 500), [1, 1, 1, 100])
+    assert candidates[0] == (3.5, 5.0, 2.0, 500)
+    assert (4.5, 5.0, 2.0, 500) in candidates
+    assert (3.5, 5.0, 2.0, 400) in candidates
+    assert len(candidates) == 1 + 2 * len(PARAMETERS)
+
+
+def test_loss_prefers_the_median_on_target():
+    on_target = {'level': {'p50': 5, 'mean': 5.5}}
+    off_target = {'level': {'p50': 4, 'mean': 5}}
+    assert loss(on_target, 5) < loss(off_target, 5)
+
+
+def test_target_option_parsing():
+    assert target('hard=6') == ('hard', 6.0)
+    with pytest.raises(argparse.ArgumentTypeError):
+        target('nightmare=3')
+    with pytest.raises(argparse.ArgumentTypeError):
+        target('easy=lots')
+
+
+def test_format_presets_is_valid_settings_source():
+    namespace = {}
+    exec(format_presets(DIFFICULTY_PRESETS), namespace)
+    assert namespace['DIFFICULTY_PRESETS'] == DIFFICULTY_PRESETS
+
+
+def test_tune_proposes_presets_and_reuses_its_cache(tmp_path):
+    path = str(tmp_path / "cache.json")
+    args = dict(targets={'normal': 1}, games=1, rounds=2, workers=1,
+                max_frames=120)
+    report = tune.tune(cache=EvaluationCache(path), **args)
+    assert report['meta']['games_played'] > 0
+    proposed = report['presets']['normal']
+    assert set(proposed) == set(DIFFICULTY_PRESETS['normal'])
+    assert proposed['ship_limit'] == DIFFICULTY_PRESETS['normal']['ship_limit']
+    assert report['difficulties']['normal']['level']['p50'] == 1
+
+    again = tune.tune(cache=EvaluationCache(path), **args)
+    assert again['meta']['games_played'] == 0
+    assert again['presets'] == report['presets']
+
+
+def test_tune_needs_at_least_one_round(capsys):
+    with pytest.raises(ValueError):
+        tune.tune(rounds=0, workers=1)
+    assert tune.main(["--rounds", "0", "--workers", "1"]) == 1
+    assert "rounds must be at least 1" in capsys.readouterr().err
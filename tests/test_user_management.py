@@ -3,7 +3,7 @@
 import pygame
 import pytest
 
-import alien_invasion
+import storage
 from alien_invasion import AlienInvasion
 from profiles import MAX_NAME_LENGTH, ProfileStore
 from helpers import press, start_game, type_name
@@ -24,7 +24,7 @@ def test_first_run_creates_default_player(game):
 
 
 def test_first_run_migrates_legacy_high_score(isolated_data_files):
-    with open(alien_invasion.HIGH_SCORE_FILE, "w") as f:
+    with open(storage.HIGH_SCORE_FILE, "w") as f:
         f.write("4321")
     ai = AlienInvasion()
     try:
@@ -193,6 +193,7 @@ def test_profiles_persist_to_disk_across_instances(game):
     game.stats.score = 500
     game.stats.ships_left = 0
     game._ship_hit()
+    game.profiles.close()  # as on quit or process exit
     pygame.quit()
 
     reborn = AlienInvasion()
@@ -206,11 +207,20 @@ def test_profiles_persist_to_disk_across_instances(game):
 
 def test_profile_file_written_where_configured(game, isolated_data_files):
     _new_player(game, "Ace")
+    game.profiles.flush()
     path = isolated_data_files / "profiles.json"
     assert path.exists()
     assert ProfileStore(str(path)).active == "Ace"
 
 
+def test_quitting_writes_pending_profile_changes(game, isolated_data_files):
+    _new_player(game, "Ace")
+    with pytest.raises(SystemExit):
+        game._quit_game()
+    path = isolated_data_files / "profiles.json"
+    assert ProfileStore(str(path)).active == "Ace"
+
+
 # --- rendering ------------------------------------------------------------
 
 def test_idle_screen_renders_panel_in_every_state(game):
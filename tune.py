@@ -0,0 +1,275 @@
+"""Difficulty tuner: search preset values against target survival curves.
+
+Usage:
+    python -m tune                                  # default targets
+    python -m tune --target easy=12 normal=9 hard=6 --games 40
+    python -m tune --cache tune_cache.json --output presets.json
+
+For each difficulty the tuner looks for the ship_speed, bullet_speed,
+alien_speed and autofire_cooldown that bring a reference bot (simulate's
+autopilot unless --policy says otherwise) closest to a target median
+level reached within the game length cap. The search is a compass search
+started from the current preset: every round tries a step up and down
+along each parameter, keeps the best vector, and halves the steps when
+nothing improves. The candidates of all difficulties are played as one
+batch of seeded headless games on simulate's worker pool.
+
+Every candidate is played on the same seeds, and parameter values are
+snapped to a grid, so a vector met again (later in the search, or in an
+earlier run with the same --cache file) costs nothing.
+
+The result is a proposed DIFFICULTY_PRESETS table, printed ready to paste
+into settings.py; ship_limit and alien_points are kept as they are.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+
+from settings import DIFFICULTY_PRESETS
+from simulate import (DEFAULT_MAX_FRAMES, game_runner, resolve_policy,
+                      summarize)
+
+# name: (lowest, highest, grid step) of each tuned setting.
+PARAMETERS = {
+    'ship_speed': (1.0, 8.0, 0.1),
+    'bullet_speed': (2.0, 12.0, 0.1),
+    'alien_speed': (0.5, 6.0, 0.1),
+    'autofire_cooldown': (100, 1000, 10),
+}
+
+# median level the reference bot should reach on each difficulty.
+DEFAULT_TARGETS = {'easy': 10, 'normal': 8, 'hard': 6}
+DEFAULT_GAMES = 20
+DEFAULT_ROUNDS = 8
+
+
+def snap(name, value):
+    """Clamp value to the parameter's range and round it to its grid."""
+    low, high, step = PARAMETERS[name]
+    value = min(max(value, low), high)
+    value = round(round(value / step) * step, 6)
+    return int(value) if isinstance(step, int) else value
+
+
+def preset_vector(difficulty):
+    """The current preset's tuned values, snapped to the grid."""
+    preset = DIFFICULTY_PRESETS[difficulty]
+    return tuple(snap(name, preset[name]) for name in PARAMETERS)
+
+
+def loss(summary, target):
+    """Distance from the target: median level, tie-broken by the mean."""
+    level = summary['level']
+    return abs(level['p50'] - target) + 0.25 * abs(level['mean'] - target)
+
+
+class EvaluationCache:
+    """Batch summaries keyed by everything that decides them."""
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring tuner cache {path} ({e}).")
+
+    @staticmethod
+    def key(difficulty, vector, setup):
+        return json.dumps([difficulty, list(vector), setup])
+
+    def get(self, key):
+        summary = self.entries.get(key)
+        if summary is not None:
+            self.hits += 1
+        return summary
+
+    def put(self, key, summary):
+        self.entries[key] = summary
+
+    def save(self):
+        """Write the cache atomically, if it has a file."""
+        if not self.path:
+            return
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Warning: could not save tuner cache ({e}).")
+
+
+def _neighbours(vector, steps):
+    """The vector itself plus one step up and down along each parameter."""
+    candidates = [vector]
+    for i, name in enumerate(PARAMETERS):
+        for sign in (-1, 1):
+            moved = list(vector)
+            moved[i] = snap(name, vector[i] + sign * steps[i])
+            moved = tuple(moved)
+            if moved not in candidates:
+                candidates.append(moved)
+    return candidates
+
+
+def tune(targets=None, games=DEFAULT_GAMES, rounds=DEFAULT_ROUNDS,
+         policy='autopilot', workers=None, max_frames=DEFAULT_MAX_FRAMES,
+         seed=0, cache=None):
+    """Search each difficulty's parameters; return the tuning report."""
+    if rounds < 1:
+        raise ValueError("rounds must be at least 1")
+    targets = dict(targets or DEFAULT_TARGETS)
+    resolve_policy(policy)
+    cache = cache if cache is not None else EvaluationCache()
+    setup = [games, seed, policy, max_frames]
+    seeds = range(seed, seed + games)
+
+    searches = {}
+    for difficulty in targets:
+        # start a quarter of each range away, so early rounds move freely.
+        searches[difficulty] = {
+            'best': preset_vector(difficulty),
+            'steps': [(high - low) / 4 for low, high, _s in
+                      PARAMETERS.values()],
+        }
+
+    played = 0
+    with game_runner(policy, workers, max_frames) as play:
+        for _round in range(rounds):
+            # every difficulty's uncached candidates, as one batch.
+            wanted = {}
+            for difficulty, search in searches.items():
+                for vector in _neighbours(search['best'], search['steps']):
+                    key = cache.key(difficulty, vector, setup)
+                    if cache.get(key) is None:
+                        wanted[key] = (difficulty, vector)
+            tasks = [(difficulty, s, dict(zip(PARAMETERS, vector)))
+                     for difficulty, vector in wanted.values()
+                     for s in seeds]
+            results = play(tasks) if tasks else []
+            played += len(results)
+            for i, key in enumerate(wanted):
+                cache.put(key, summarize(results[i * games:(i + 1) * games]))
+
+            for difficulty, search in searches.items():
+                candidates = _neighbours(search['best'], search['steps'])
+                scored = [(loss(cache.entries[cache.key(difficulty, v, setup)],
+                                targets[difficulty]), v) for v in candidates]
+                best_loss, best = min(scored, key=lambda item: item[0])
+                if best == search['best']:
+                    search['steps'] = [step / 2 for step in search['steps']]
+                search['best'] = best
+                search['loss'] = best_loss
+    cache.save()
+
+    proposed = {}
+    report = {}
+    for difficulty, search in searches.items():
+        values = dict(zip(PARAMETERS, search['best']))
+        proposed[difficulty] = dict(DIFFICULTY_PRESETS[difficulty], **values)
+        summary = cache.entries[cache.key(difficulty, search['best'], setup)]
+        report[difficulty] = {
+            'target_level': targets[difficulty],
+            'loss': round(search['loss'], 3),
+            'current': dict(zip(PARAMETERS, preset_vector(difficulty))),
+            'proposed': values,
+            'level': summary['level'],
+            'survival_s': summary['survival_s'],
+        }
+    return {
+        'meta': {'policy': policy, 'games': games, 'rounds': rounds,
+                 'max_frames': max_frames, 'seed': seed,
+                 'games_played': played, 'cache_hits': cache.hits},
+        'difficulties': report,
+        'presets': proposed,
+    }
+
+
+def format_presets(presets):
+    """Render a preset table as the DIFFICULTY_PRESETS source code."""
+    lines = ["DIFFICULTY_PRESETS = {"]
+    for difficulty, preset in presets.items():
+        lines.append(f"    '{difficulty}': {{")
+        for name, value in preset.items():
+            lines.append(f"        '{name}': {value!r},")
+        lines.append("    },")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def target(text):
+    """Parse a 'difficulty=level' option value."""
+    difficulty, _sep, level = text.partition('=')
+    if difficulty not in DIFFICULTY_PRESETS:
+        raise argparse.ArgumentTypeError(f"unknown difficulty '{difficulty}'")
+    try:
+        return difficulty, float(level)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"expected difficulty=level, got '{text}'") from None
+
+
+def build_parser():
+    """Build the argument parser for the tuner."""
+    parser = argparse.ArgumentParser(
+        prog="tune.py", description="Alien Invasion difficulty tuner")
+    parser.add_argument(
+        '--target', nargs='+', type=target, metavar='DIFFICULTY=LEVEL',
+        help="median level to aim for per difficulty (default: " +
+             " ".join(f"{d}={level}" for d, level in DEFAULT_TARGETS.items())
+             + ")")
+    parser.add_argument(
+        '--games', type=int, default=DEFAULT_GAMES,
+        help=f"games per candidate (default {DEFAULT_GAMES})")
+    parser.add_argument(
+        '--rounds', type=int, default=DEFAULT_ROUNDS,
+        help=f"search rounds (default {DEFAULT_ROUNDS})")
+    parser.add_argument(
+        '--policy', default='autopilot',
+        help="reference bot, as for simulate (default autopilot)")
+    parser.add_argument(
+        '--workers', type=int, help="worker processes (default: one per core)")
+    parser.add_argument(
+        '--max-frames', type=int, default=DEFAULT_MAX_FRAMES,
+        help=f"game length cap in frames (default {DEFAULT_MAX_FRAMES})")
+    parser.add_argument(
+        '--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument(
+        '--cache', metavar='FILE',
+        help="reuse and extend the evaluations saved in FILE")
+    parser.add_argument(
+        '--output', metavar='FILE', help="also write the JSON report to FILE")
+    return parser
+
+
+def main(argv=None):
+    """Tune the presets and print the proposed table."""
+    options = build_parser().parse_args(argv)
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            report = tune(dict(options.target) if options.target else None,
+                          options.games, options.rounds, options.policy,
+                          options.workers, options.max_frames, options.seed,
+                          EvaluationCache(options.cache))
+        except (ValueError, ImportError, AttributeError) as e:
+            print(f"error: {e}")
+            return 1
+    for difficulty, result in report['difficulties'].items():
+        print(f"# {difficulty}: median level {result['level']['p50']:g} "
+              f"(target {result['target_level']:g})")
+    print(format_presets(report['presets']))
+    if options.output:
+        with open(options.output, 'w') as f:
+            f.write(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())